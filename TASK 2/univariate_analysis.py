@@ -3,23 +3,26 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from datetime import datetime
+import os
+import sys
 import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from crop_analytics import load_crop_data
+from crop_analytics.density import plot_kde
+from crop_analytics.loader import iter_crop_chunks
+from crop_analytics.figcache import cached_savefig, report as figure_cache_report
+from crop_analytics.swarm import plot_strip, plot_swarm
+from crop_analytics.streaming import RowSample, stream_summary
+
 warnings.filterwarnings('ignore')
 
 # Set style for better-looking plots
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
-# Load the dataset
-df = pd.read_csv('agriculture_crop_yield.csv')
-
-print("Dataset Shape:", df.shape)
-print("\nDataset Columns:")
-print(df.columns.tolist())
-print("\nDataset Info:")
-print(df.info())
-print("\nFirst few rows:")
-print(df.head())
+DATA_PATH = 'agriculture_crop_yield.csv'
 
 # Separate categorical and continuous columns
 categorical_cols = ['State', 'Crop_Type', 'Season', 'Climate_Zone', 'Soil_Type', 
@@ -29,15 +32,32 @@ continuous_cols = ['Area_Hectares', 'Yield_Tonnes', 'Yield_per_Hectare',
                   'Fertilizer_Usage_kg', 'Precipitation_mm', 'Temperature_Celsius',
                   'Storage_Loss_Percentage', 'Market_Price_per_Tonne', 'Total_Revenue']
 
-print(f"\nCategorical columns: {categorical_cols}")
-print(f"Continuous columns: {continuous_cols}")
+# Columns the continuous charts draw from
+chart_cols = ['Year', 'Crop_Type', 'Area_Hectares', 'Yield_Tonnes', 'Yield_per_Hectare',
+              'Precipitation_mm', 'Temperature_Celsius', 'Market_Price_per_Tonne']
+
+# Rows the continuous charts draw when streaming (CHART_SAMPLE_ROWS overrides)
+CHART_SAMPLE_ROWS = int(os.getenv("CHART_SAMPLE_ROWS", "0")) or 50_000
+
+# Load the dataset
+def load_data():
+    """Load the full dataset and print its overview"""
+    df = load_crop_data(DATA_PATH)
+
+    print("Dataset Shape:", df.shape)
+    print("\nDataset Columns:")
+    print(df.columns.tolist())
+    print("\nDataset Info:")
+    print(df.info())
+    print("\nFirst few rows:")
+    print(df.head())
+    return df
 
 # Create visualizations for categorical data
-def create_categorical_visualizations():
+def create_categorical_visualizations(crop_counts, season_counts):
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     
     # 1. Bar Chart - Crop Type Distribution
-    crop_counts = df['Crop_Type'].value_counts()
     axes[0, 0].bar(crop_counts.index, crop_counts.values, color='skyblue', edgecolor='black')
     axes[0, 0].set_title('Crop Type Distribution (Bar Chart)', fontsize=14, fontweight='bold')
     axes[0, 0].set_xlabel('Crop Type')
@@ -49,7 +69,6 @@ def create_categorical_visualizations():
     axes[0, 1].set_title('Crop Type Distribution (Pie Chart)', fontsize=14, fontweight='bold')
     
     # 3. Bar Chart - Season Distribution
-    season_counts = df['Season'].value_counts()
     axes[1, 0].bar(season_counts.index, season_counts.values, color='lightgreen', edgecolor='black')
     axes[1, 0].set_title('Season Distribution (Bar Chart)', fontsize=14, fontweight='bold')
     axes[1, 0].set_xlabel('Season')
@@ -60,11 +79,46 @@ def create_categorical_visualizations():
     axes[1, 1].set_title('Season Distribution (Pie Chart)', fontsize=14, fontweight='bold')
     
     plt.tight_layout()
-    plt.savefig('categorical_analysis.png', dpi=300, bbox_inches='tight')
+    cached_savefig('categorical_analysis.png', inputs=(crop_counts, season_counts), dpi=300, bbox_inches='tight')
     plt.show()
 
+# Stream the chart columns into a row sample and exact line-plot means
+def sample_chart_data(chunksize, sample_rows=CHART_SAMPLE_ROWS, seed=0):
+    """Read chart_cols chunk by chunk, never holding more than one chunk and the sample.
+
+    Returns (sample, temp_by_crop, price_by_year, row_weight): a uniform
+    sample of at most sample_rows rows, the two line-plot means over every
+    row, and the number of file rows each sampled row stands for.
+    """
+    sample = RowSample(sample_rows, seed=seed)
+    temp_sums, price_sums = [], []
+    for chunk in iter_crop_chunks(DATA_PATH, chart_cols, chunksize):
+        sample.update(chunk)
+        temp_sums.append(chunk.groupby(chunk['Crop_Type'].astype(object))['Temperature_Celsius'].agg(['sum', 'count']))
+        price_sums.append(chunk.groupby('Year')['Market_Price_per_Tonne'].agg(['sum', 'count']))
+
+    def means(parts):
+        totals = pd.concat(parts).groupby(level=0).sum()
+        return totals['sum'] / totals['count']
+
+    df = sample.frame()
+    temp_by_crop = means(temp_sums).sort_values(ascending=False)
+    price_by_year = means(price_sums).sort_index()
+    return df, temp_by_crop, price_by_year, sample.n / max(len(df), 1)
+
 # Create visualizations for continuous data
-def create_continuous_visualizations():
+def create_continuous_visualizations(df, temp_by_crop=None, price_by_year=None, row_weight=1.0):
+    """Draw the continuous panels from df.
+
+    When df is a sample, pass the line-plot means computed over the full file
+    and row_weight (file rows per sampled row) so the histograms show
+    full-file frequencies.
+    """
+    if temp_by_crop is None:
+        temp_by_crop = df.groupby('Crop_Type', observed=True)['Temperature_Celsius'].mean().sort_values(ascending=False)
+    if price_by_year is None:
+        price_by_year = df.groupby('Year')['Market_Price_per_Tonne'].mean()
+    weights = np.full(len(df), row_weight) if row_weight != 1.0 else None
     fig, axes = plt.subplots(3, 3, figsize=(18, 15))
     
     # 1. Scatter Plot - Area vs Yield
@@ -74,7 +128,6 @@ def create_continuous_visualizations():
     axes[0, 0].set_ylabel('Yield (Tonnes)')
     
     # 2. Line Plot - Temperature by Crop Type
-    temp_by_crop = df.groupby('Crop_Type')['Temperature_Celsius'].mean().sort_values(ascending=False)
     axes[0, 1].plot(temp_by_crop.index, temp_by_crop.values, marker='o', linewidth=2, markersize=8)
     axes[0, 1].set_title('Temperature by Crop Type (Line Plot)', fontsize=12, fontweight='bold')
     axes[0, 1].set_xlabel('Crop Type')
@@ -82,33 +135,33 @@ def create_continuous_visualizations():
     axes[0, 1].tick_params(axis='x', rotation=45)
     
     # 3. Strip Plot - Yield per Hectare by Crop Type
-    sns.stripplot(data=df, x='Crop_Type', y='Yield_per_Hectare', jitter=0.3, alpha=0.6, ax=axes[0, 2])
+    plot_strip(axes[0, 2], df, x='Crop_Type', y='Yield_per_Hectare', jitter=0.3, alpha=0.6)
     axes[0, 2].set_title('Yield per Hectare by Crop Type (Strip Plot)', fontsize=12, fontweight='bold')
     axes[0, 2].set_xlabel('Crop Type')
     axes[0, 2].set_ylabel('Yield per Hectare (Tonnes)')
     axes[0, 2].tick_params(axis='x', rotation=45)
     
     # 4. Swarm Plot - Market Price by Crop Type
-    sns.swarmplot(data=df, x='Crop_Type', y='Market_Price_per_Tonne', size=3, ax=axes[1, 0])
+    plot_swarm(axes[1, 0], df, x='Crop_Type', y='Market_Price_per_Tonne', size=3)
     axes[1, 0].set_title('Market Price by Crop Type (Swarm Plot)', fontsize=12, fontweight='bold')
     axes[1, 0].set_xlabel('Crop Type')
     axes[1, 0].set_ylabel('Market Price per Tonne ($)')
     axes[1, 0].tick_params(axis='x', rotation=45)
     
     # 5. Histogram - Yield per Hectare
-    axes[1, 1].hist(df['Yield_per_Hectare'], bins=20, color='lightcoral', edgecolor='black', alpha=0.7)
+    axes[1, 1].hist(df['Yield_per_Hectare'], bins=20, weights=weights, color='lightcoral', edgecolor='black', alpha=0.7)
     axes[1, 1].set_title('Yield per Hectare Distribution (Histogram)', fontsize=12, fontweight='bold')
     axes[1, 1].set_xlabel('Yield per Hectare (Tonnes)')
     axes[1, 1].set_ylabel('Frequency')
     
     # 6. Density Plot - Temperature
-    df['Temperature_Celsius'].plot.kde(ax=axes[1, 2], color='purple', linewidth=2)
+    plot_kde(axes[1, 2], df['Temperature_Celsius'], color='purple', linewidth=2)
     axes[1, 2].set_title('Temperature Distribution (Density Plot)', fontsize=12, fontweight='bold')
     axes[1, 2].set_xlabel('Temperature (°C)')
     axes[1, 2].set_ylabel('Density')
     
     # 7. Histogram with Rug Plot - Precipitation
-    axes[2, 0].hist(df['Precipitation_mm'], bins=15, color='lightblue', edgecolor='black', alpha=0.7)
+    axes[2, 0].hist(df['Precipitation_mm'], bins=15, weights=weights, color='lightblue', edgecolor='black', alpha=0.7)
     axes[2, 0].axhline(y=0, color='black', linewidth=0.5)
     axes[2, 0].plot(df['Precipitation_mm'], np.zeros_like(df['Precipitation_mm']), '|', color='red', markersize=10)
     axes[2, 0].set_title('Precipitation Distribution with Rug Plot', fontsize=12, fontweight='bold')
@@ -122,47 +175,78 @@ def create_continuous_visualizations():
     axes[2, 1].set_ylabel('Yield per Hectare (Tonnes)')
     
     # 9. Line Plot - Market Price Trends by Year
-    price_by_year = df.groupby('Year')['Market_Price_per_Tonne'].mean()
     axes[2, 2].plot(price_by_year.index, price_by_year.values, marker='s', linewidth=2, markersize=8)
     axes[2, 2].set_title('Market Price Trends by Year (Line Plot)', fontsize=12, fontweight='bold')
     axes[2, 2].set_xlabel('Year')
     axes[2, 2].set_ylabel('Average Market Price per Tonne ($)')
     
     plt.tight_layout()
-    plt.savefig('continuous_analysis.png', dpi=300, bbox_inches='tight')
+    cached_savefig('continuous_analysis.png', inputs=(df[chart_cols], temp_by_crop, price_by_year, row_weight), dpi=300, bbox_inches='tight')
     plt.show()
 
 # Generate summary statistics
-def generate_summary_statistics():
+def generate_summary_statistics(df=None, chunksize=None):
+    """Print value counts and describe() of df; with chunksize, stream the CSV in chunks instead.
+
+    The streaming mode keeps memory constant and needs no df: moments are
+    merged per chunk and quartiles come from a KLL sketch (exact until it
+    first compacts, then within about 1.65% rank error). Returns the
+    streamed summary, or None.
+    """
     print("\n" + "="*60)
     print("SUMMARY STATISTICS")
     print("="*60)
     
+    summary = None
+    if chunksize:
+        summary = stream_summary(categorical_cols, continuous_cols, DATA_PATH, chunksize=chunksize)
+    
     print("\nCATEGORICAL VARIABLES SUMMARY:")
     print("-" * 40)
     for col in categorical_cols:
         print(f"\n{col}:")
-        print(df[col].value_counts())
-        print(f"Unique values: {df[col].nunique()}")
+        if summary is not None:
+            print(summary.value_counts(col))
+            print(f"Unique values: {summary.nunique(col)}")
+        else:
+            print(df[col].value_counts())
+            print(f"Unique values: {df[col].nunique()}")
     
     print("\n\nCONTINUOUS VARIABLES SUMMARY:")
     print("-" * 40)
-    print(df[continuous_cols].describe())
+    if summary is not None:
+        print(summary.describe())
+    else:
+        print(df[continuous_cols].describe())
+    return summary
 
 # Execute the analysis
 if __name__ == "__main__":
     print("Starting Univariate Analysis...")
     print("="*60)
-    
-    # Generate summary statistics
-    generate_summary_statistics()
+    print(f"\nCategorical columns: {categorical_cols}")
+    print(f"Continuous columns: {continuous_cols}")
+    
+    # Generate summary statistics (set SUMMARY_CHUNKSIZE to stream files larger than RAM;
+    # the continuous charts then draw a chunked row sample, so no full frame is loaded)
+    chunksize = int(os.getenv("SUMMARY_CHUNKSIZE", "0"))
+    if chunksize:
+        summary = generate_summary_statistics(chunksize=chunksize)
+        crop_counts, season_counts = summary.value_counts('Crop_Type'), summary.value_counts('Season')
+        df, temp_by_crop, price_by_year, row_weight = sample_chart_data(chunksize)
+    else:
+        df = load_data()
+        generate_summary_statistics(df)
+        crop_counts, season_counts = df['Crop_Type'].value_counts(), df['Season'].value_counts()
+        temp_by_crop, price_by_year, row_weight = None, None, 1.0
     
     # Create categorical visualizations
     print("\nCreating categorical data visualizations...")
-    create_categorical_visualizations()
+    create_categorical_visualizations(crop_counts, season_counts)
     
     # Create continuous visualizations
     print("\nCreating continuous data visualizations...")
-    create_continuous_visualizations()
+    create_continuous_visualizations(df, temp_by_crop, price_by_year, row_weight)
     
     print("\nAnalysis complete! Check the generated PNG files for visualizations.")
+    print(figure_cache_report())
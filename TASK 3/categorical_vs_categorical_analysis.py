@@ -1,89 +1,104 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from crop_analytics import add_derived, load_crop_data
+from crop_analytics.contingency import ContingencyTables
+from crop_analytics.figcache import cached_savefig, report as figure_cache_report
 
 # Set style
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
+# Yield, revenue and area buckets; bins are registered in crop_analytics.features
+CATEGORY_COLUMNS = ['Yield_Category', 'Revenue_Category', 'Area_Category']
+
 def load_data():
-    """Load and prepare data"""
-    df = pd.read_csv('agriculture_crop_yield.csv')
-    
-    # Create categorical variables
-    df['Yield_Category'] = pd.cut(df['Yield_per_Hectare'], bins=[0, 3, 5, 8], labels=['Low', 'Medium', 'High'])
-    df['Revenue_Category'] = pd.cut(df['Total_Revenue'], bins=[0, 50000000, 150000000, 500000000], labels=['Low', 'Medium', 'High'])
-    df['Area_Category'] = pd.cut(df['Area_Hectares'], bins=[0, 100000, 200000, 400000], labels=['Small', 'Medium', 'Large'])
-    
-    return df
+    """Load and prepare data (the buckets are served from the feature cache)"""
+    return load_crop_data('agriculture_crop_yield.csv', columns=[
+        'State', 'Crop_Type', 'Season', 'Climate_Zone', 'Soil_Type', 'Irrigation_Type',
+        'Pest_Infestation_Level', 'Disease_Incidence',
+        'Area_Hectares', 'Yield_per_Hectare', 'Total_Revenue'], derived=CATEGORY_COLUMNS)
+
+def add_categories(df, path='agriculture_crop_yield.csv'):
+    """Bucket yield, revenue and area of a frame loaded from ``path`` (served from the feature cache)"""
+    return add_derived(df, CATEGORY_COLUMNS, path)
+
+def _show_or_close(show):
+    if show:
+        plt.show()
+    else:
+        plt.close('all')
 
-def create_task_3a_charts(df):
+def create_task_3a_charts(df, show=True):
     """Task 3a: Create Categorical vs. Categorical charts"""
+    tables = ContingencyTables(df)
     
     # 1. Stacked Bar Chart
     plt.figure(figsize=(12, 8))
-    pivot1 = df.groupby(['Crop_Type', 'Season'])['Yield_Category'].value_counts().unstack(fill_value=0)
+    pivot1 = tables.table(['Crop_Type', 'Season'], 'Yield_Category')
     pivot1.plot(kind='bar', stacked=True)
     plt.title('Task 3a.1: Stacked Bar Chart - Crop Type vs Season with Yield Categories')
     plt.xlabel('Crop Type and Season')
     plt.ylabel('Count')
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig('task_3a_1_stacked_bar_chart.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    cached_savefig('task_3a_1_stacked_bar_chart.png', inputs=(pivot1,), dpi=300, bbox_inches='tight')
+    _show_or_close(show)
     
     # 2. Grouped Bar Chart
     plt.figure(figsize=(14, 8))
-    pivot2 = df.groupby(['Climate_Zone', 'Crop_Type'])['Revenue_Category'].value_counts().unstack(fill_value=0)
+    pivot2 = tables.table(['Climate_Zone', 'Crop_Type'], 'Revenue_Category')
     pivot2.plot(kind='bar')
     plt.title('Task 3a.2: Grouped Bar Chart - Climate Zone vs Crop Type with Revenue Categories')
     plt.xlabel('Climate Zone and Crop Type')
     plt.ylabel('Count')
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig('task_3a_2_grouped_bar_chart.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    cached_savefig('task_3a_2_grouped_bar_chart.png', inputs=(pivot2,), dpi=300, bbox_inches='tight')
+    _show_or_close(show)
     
     # 3. Segmented Bar Chart
     plt.figure(figsize=(16, 10))
-    top_states = df.groupby('State')['Area_Hectares'].sum().nlargest(15).index
-    df_filtered = df[df['State'].isin(top_states)]
-    pivot3 = df_filtered.groupby(['State', 'Crop_Type'])['Area_Category'].value_counts().unstack(fill_value=0)
+    top_states = df.groupby('State', observed=True)['Area_Hectares'].sum().nlargest(15).index
+    pivot3 = tables.table(['State', 'Crop_Type'], 'Area_Category', mask=df['State'].isin(top_states))
     pivot3.plot(kind='bar', stacked=True)
     plt.title('Task 3a.3: Segmented Bar Chart - State vs Crop Type with Area Categories (Top 15 States)')
     plt.xlabel('State and Crop Type')
     plt.ylabel('Count')
     plt.xticks(rotation=45, ha='right')
     plt.tight_layout()
-    plt.savefig('task_3a_3_segmented_bar_chart.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    cached_savefig('task_3a_3_segmented_bar_chart.png', inputs=(pivot3,), dpi=300, bbox_inches='tight')
+    _show_or_close(show)
     
     # 4. Mosaic Plot (4 panels)
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
     
     # Panel 1: Crop Type vs Season
-    pd.crosstab(df['Crop_Type'], df['Season']).plot(kind='bar', ax=ax1, stacked=True)
+    tables.table('Crop_Type', 'Season').plot(kind='bar', ax=ax1, stacked=True)
     ax1.set_title('Task 3a.4.1: Crop Type vs Season')
     ax1.tick_params(axis='x', rotation=45)
     
     # Panel 2: Climate Zone vs Soil Type
-    pd.crosstab(df['Climate_Zone'], df['Soil_Type']).plot(kind='bar', ax=ax2, stacked=True)
+    tables.table('Climate_Zone', 'Soil_Type').plot(kind='bar', ax=ax2, stacked=True)
     ax2.set_title('Task 3a.4.2: Climate Zone vs Soil Type')
     ax2.tick_params(axis='x', rotation=45)
     
     # Panel 3: Irrigation Type vs Pest Level
-    pd.crosstab(df['Irrigation_Type'], df['Pest_Infestation_Level']).plot(kind='bar', ax=ax3, stacked=True)
+    tables.table('Irrigation_Type', 'Pest_Infestation_Level').plot(kind='bar', ax=ax3, stacked=True)
     ax3.set_title('Task 3a.4.3: Irrigation Type vs Pest Level')
     ax3.tick_params(axis='x', rotation=45)
     
     # Panel 4: Disease vs Yield
-    pd.crosstab(df['Disease_Incidence'], df['Yield_Category']).plot(kind='bar', ax=ax4, stacked=True)
+    tables.table('Disease_Incidence', 'Yield_Category').plot(kind='bar', ax=ax4, stacked=True)
     ax4.set_title('Task 3a.4.4: Disease vs Yield Category')
     ax4.tick_params(axis='x', rotation=45)
     
     plt.tight_layout()
-    plt.savefig('task_3a_4_mosaic_plot.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    cached_savefig('task_3a_4_mosaic_plot.png', inputs=(df,), dpi=300, bbox_inches='tight')
+    _show_or_close(show)
 
 def main():
     """Main function for Task 3a: Categorical vs. Categorical Analysis"""
@@ -106,6 +121,7 @@ def main():
     print("- task_3a_2_grouped_bar_chart.png")
     print("- task_3a_3_segmented_bar_chart.png")
     print("- task_3a_4_mosaic_plot.png")
+    print(figure_cache_report())
 
 if __name__ == "__main__":
     main()
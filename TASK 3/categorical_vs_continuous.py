@@ -1,87 +1,126 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy import stats
-
-# Load dataset
-df = pd.read_csv('agriculture_crop_yield.csv')
-
-# Create visualizations for Task 3c: Categorical vs. Continuous analysis
-fig, axes = plt.subplots(3, 2, figsize=(15, 18))
-
-# 1. Bar Chart (Summary Statistics)
-crop_yield_stats = df.groupby('Crop_Type')['Yield_per_Hectare'].mean().sort_values(ascending=False)
-crop_yield_stats.plot(kind='bar', ax=axes[0,0], color='skyblue')
-axes[0,0].set_title('Task 3c.1: Bar Chart - Average Yield by Crop Type')
-axes[0,0].set_xlabel('Crop Type')
-axes[0,0].set_ylabel('Average Yield per Hectare')
-axes[0,0].tick_params(axis='x', rotation=45)
-
-# Add value labels
-for i, v in enumerate(crop_yield_stats.values):
-    axes[0,0].text(i, v + 0.1, f'{v:.1f}', ha='center', va='bottom')
-
-# 2. Grouped Kernel Density Plots
-for climate in df['Climate_Zone'].unique():
-    subset = df[df['Climate_Zone'] == climate]
-    axes[0,1].hist(subset['Yield_per_Hectare'], alpha=0.6, label=climate, density=True, bins=15)
-axes[0,1].set_title('Task 3c.2: Grouped Kernel Density - Yield per Hectare by Climate Zone')
-axes[0,1].set_xlabel('Yield per Hectare')
-axes[0,1].set_ylabel('Density')
-axes[0,1].legend()
-
-# 3. Box Plot
-df.boxplot(column='Yield_per_Hectare', by='Crop_Type', ax=axes[1,0])
-axes[1,0].set_title('Task 3c.3: Box Plot - Yield per Hectare by Crop Type')
-axes[1,0].set_xlabel('Crop Type')
-axes[1,0].set_ylabel('Yield per Hectare')
-axes[1,0].tick_params(axis='x', rotation=45)
-
-# 4. Violin Plot
-sns.violinplot(data=df, x='Climate_Zone', y='Total_Revenue', ax=axes[1,1])
-axes[1,1].set_title('Task 3c.4: Violin Plot - Total Revenue by Climate Zone')
-axes[1,1].set_xlabel('Climate Zone')
-axes[1,1].set_ylabel('Total Revenue')
-axes[1,1].tick_params(axis='x', rotation=45)
-
-# 5. Ridgeline Plot (using overlapping histograms)
-for crop in df['Crop_Type'].unique():
-    subset = df[df['Crop_Type'] == crop]
-    axes[2,0].hist(subset['Yield_per_Hectare'], alpha=0.7, label=crop, density=True, bins=10)
-axes[2,0].set_title('Task 3c.5: Ridgeline Plot - Yield per Hectare by Crop Type')
-axes[2,0].set_xlabel('Yield per Hectare')
-axes[2,0].set_ylabel('Density')
-axes[2,0].legend()
-
-# 6. Beeswarm Plot
-sns.boxplot(data=df, x='Irrigation_Type', y='Fertilizer_Usage_kg', ax=axes[2,1])
-sns.swarmplot(data=df, x='Irrigation_Type', y='Fertilizer_Usage_kg', color='red', alpha=0.6, size=3, ax=axes[2,1])
-axes[2,1].set_title('Task 3c.6: Beeswarm Plot - Fertilizer Usage by Irrigation Type')
-axes[2,1].set_xlabel('Irrigation Type')
-axes[2,1].set_ylabel('Fertilizer Usage (kg)')
-axes[2,1].tick_params(axis='x', rotation=45)
-
-plt.tight_layout()
-plt.savefig('task_3c_categorical_vs_continuous.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# Statistical Tests for Task 3c
-print("=== TASK 3c: CATEGORICAL vs CONTINUOUS ANALYSIS ===")
-
-# ANOVA test
-crop_groups = [group['Yield_per_Hectare'].values for name, group in df.groupby('Crop_Type')]
-f_stat, p_value = stats.f_oneway(*crop_groups)
-print(f"Task 3c.3 ANOVA (Yield by Crop Type): F = {f_stat:.4f}, p = {p_value:.4f}")
-
-# Kruskal-Wallis test
-climate_groups = [group['Total_Revenue'].values for name, group in df.groupby('Climate_Zone')]
-h_stat, p_value = stats.kruskal(*climate_groups)
-print(f"Task 3c.4 Kruskal-Wallis (Revenue by Climate): H = {h_stat:.4f}, p = {p_value:.4f}")
-
-# Summary for Task 3c
-print("\n=== TASK 3c SUMMARY ===")
-print("Average Yield by Crop Type:")
-for crop, mean_yield in crop_yield_stats.items():
-    print(f"  {crop}: {mean_yield:.2f}")
-
-print("\nGenerated: task_3c_categorical_vs_continuous.png") 
\ No newline at end of file
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from crop_analytics import load_crop_data
+from crop_analytics.density import plot_grouped_kde, plot_ridgeline, plot_violins
+from crop_analytics.figcache import cached_savefig, report as figure_cache_report
+from crop_analytics.groupstats import group_tests
+from crop_analytics.resampling import anova_test, format_result, kruskal_test
+from crop_analytics.swarm import plot_swarm
+
+def load_data():
+    """Load only the columns used in Task 3c"""
+    return load_crop_data('agriculture_crop_yield.csv', columns=[
+        'Crop_Type', 'Climate_Zone', 'Irrigation_Type',
+        'Yield_per_Hectare', 'Total_Revenue', 'Fertilizer_Usage_kg'])
+
+def create_task_3c_charts(df, show=True):
+    """Task 3c: Categorical vs. Continuous charts; returns the average yield by crop"""
+    fig, axes = plt.subplots(3, 2, figsize=(15, 18))
+
+    # 1. Bar Chart (Summary Statistics)
+    crop_yield_stats = df.groupby('Crop_Type', observed=True)['Yield_per_Hectare'].mean().sort_values(ascending=False)
+    crop_yield_stats.plot(kind='bar', ax=axes[0,0], color='skyblue')
+    axes[0,0].set_title('Task 3c.1: Bar Chart - Average Yield by Crop Type')
+    axes[0,0].set_xlabel('Crop Type')
+    axes[0,0].set_ylabel('Average Yield per Hectare')
+    axes[0,0].tick_params(axis='x', rotation=45)
+
+    # Add value labels
+    for i, v in enumerate(crop_yield_stats.values):
+        axes[0,0].text(i, v + 0.1, f'{v:.1f}', ha='center', va='bottom')
+
+    # 2. Grouped Kernel Density Plots (one FFT-binned pass over all climate zones)
+    plot_grouped_kde(axes[0,1], df, 'Yield_per_Hectare', 'Climate_Zone')
+    axes[0,1].set_title('Task 3c.2: Grouped Kernel Density - Yield per Hectare by Climate Zone')
+    axes[0,1].set_xlabel('Yield per Hectare')
+    axes[0,1].set_ylabel('Density')
+    axes[0,1].legend()
+
+    # 3. Box Plot
+    df.boxplot(column='Yield_per_Hectare', by='Crop_Type', ax=axes[1,0])
+    axes[1,0].set_title('Task 3c.3: Box Plot - Yield per Hectare by Crop Type')
+    axes[1,0].set_xlabel('Crop Type')
+    axes[1,0].set_ylabel('Yield per Hectare')
+    axes[1,0].tick_params(axis='x', rotation=45)
+
+    # 4. Violin Plot
+    plot_violins(axes[1,1], df, x='Climate_Zone', y='Total_Revenue')
+    axes[1,1].set_title('Task 3c.4: Violin Plot - Total Revenue by Climate Zone')
+    axes[1,1].set_xlabel('Climate Zone')
+    axes[1,1].set_ylabel('Total Revenue')
+    axes[1,1].tick_params(axis='x', rotation=45)
+
+    # 5. Ridgeline Plot (stacked kernel densities)
+    plot_ridgeline(axes[2,0], df, 'Yield_per_Hectare', 'Crop_Type')
+    axes[2,0].set_title('Task 3c.5: Ridgeline Plot - Yield per Hectare by Crop Type')
+    axes[2,0].set_xlabel('Yield per Hectare')
+    axes[2,0].set_ylabel('Crop Type')
+
+    # 6. Beeswarm Plot
+    sns.boxplot(data=df, x='Irrigation_Type', y='Fertilizer_Usage_kg', ax=axes[2,1])
+    plot_swarm(axes[2,1], df, x='Irrigation_Type', y='Fertilizer_Usage_kg', color='red', alpha=0.6, size=3)
+    axes[2,1].set_title('Task 3c.6: Beeswarm Plot - Fertilizer Usage by Irrigation Type')
+    axes[2,1].set_xlabel('Irrigation Type')
+    axes[2,1].set_ylabel('Fertilizer Usage (kg)')
+    axes[2,1].tick_params(axis='x', rotation=45)
+
+    plt.tight_layout()
+    cached_savefig('task_3c_categorical_vs_continuous.png', inputs=(df,), dpi=300, bbox_inches='tight')
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+    return crop_yield_stats
+
+def run_task_3c_tests(df, n_resamples=None, max_workers=None):
+    """Statistical tests for Task 3c; with n_resamples, also permutation p-values and bootstrap CIs on max_workers processes"""
+    print("=== TASK 3c: CATEGORICAL vs CONTINUOUS ANALYSIS ===")
+
+    # ANOVA and Kruskal-Wallis for every categorical x continuous pair at once
+    tests = group_tests(df)
+
+    # ANOVA test
+    anova = tests.loc[('Crop_Type', 'Yield_per_Hectare')]
+    print(f"Task 3c.3 ANOVA (Yield by Crop Type): F = {anova['f']:.4f}, p = {anova['f_p']:.4f}")
+    if n_resamples:
+        print("  " + format_result(anova_test(df['Crop_Type'], df['Yield_per_Hectare'], n_resamples, max_workers=max_workers)))
+
+    # Kruskal-Wallis test
+    kruskal = tests.loc[('Climate_Zone', 'Total_Revenue')]
+    print(f"Task 3c.4 Kruskal-Wallis (Revenue by Climate): H = {kruskal['h']:.4f}, p = {kruskal['h_p']:.4f}")
+    if n_resamples:
+        print("  " + format_result(kruskal_test(df['Climate_Zone'], df['Total_Revenue'], n_resamples, max_workers=max_workers)))
+
+    print("\nStrongest group effects (ANOVA eta squared):")
+    for (by, column), row in tests.sort_values('eta_squared', ascending=False).head(5).iterrows():
+        print(f"  {column} by {by}: F = {row['f']:.2f}, eta^2 = {row['eta_squared']:.3f}, p = {row['f_p']:.4f}")
+
+def print_task_3c_summary(crop_yield_stats):
+    """Summary for Task 3c"""
+    print("\n=== TASK 3c SUMMARY ===")
+    print("Average Yield by Crop Type:")
+    for crop, mean_yield in crop_yield_stats.items():
+        print(f"  {crop}: {mean_yield:.2f}")
+
+    print("\nGenerated: task_3c_categorical_vs_continuous.png")
+
+def run_task_3c(df, show=True, n_resamples=None, max_workers=None):
+    """Charts, tests and summary for Task 3c on an already loaded frame"""
+    crop_yield_stats = create_task_3c_charts(df, show=show)
+    run_task_3c_tests(df, n_resamples, max_workers)
+    print_task_3c_summary(crop_yield_stats)
+
+def main():
+    """Main function for Task 3c: Categorical vs. Continuous Analysis"""
+    # Set RESAMPLES (e.g. 10000) for permutation p-values and bootstrap CIs
+    run_task_3c(load_data(), n_resamples=int(os.getenv("RESAMPLES", "0")))
+    print(figure_cache_report())
+
+if __name__ == "__main__":
+    main()
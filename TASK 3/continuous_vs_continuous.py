@@ -1,13 +1,14 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
-from scipy import stats
+import os
+import sys
+from pathlib import Path
 
-# Load dataset
-df = pd.read_csv('agriculture_crop_yield.csv')
-
-# Create scatterplots with fit lines
-fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from crop_analytics import load_crop_data
+from crop_analytics.correlation import correlate
+from crop_analytics.figcache import cached_savefig, report as figure_cache_report
+from crop_analytics.interactive import HAS_PLOTLY, scatter_traces, write_html
+from crop_analytics.regression import fit_pairs, plot_fit_line
 
 # Variable pairs for Task 3b: Continuous vs. Continuous analysis
 pairs = [
@@ -19,38 +20,82 @@ pairs = [
 
 colors = ['blue', 'green', 'orange', 'purple']
 
-# Create all plots for Task 3b
-for i, ((x_col, y_col, title, x_label, y_label), color) in enumerate(zip(pairs, colors)):
-    row, col = i // 2, i % 2
-    ax = axes[row, col]
-    
-    # Scatter plot
-    ax.scatter(df[x_col], df[y_col], alpha=0.6, color=color)
-    
-    # Fit line
-    z = np.polyfit(df[x_col], df[y_col], 1)
-    p = np.poly1d(z)
-    ax.plot(df[x_col], p(df[x_col]), "r--", linewidth=2)
-    
-    # Labels
-    ax.set_title(title)
-    ax.set_xlabel(x_label)
-    ax.set_ylabel(y_label)
-    
-    # Correlation
-    corr_coef, p_value = stats.pearsonr(df[x_col], df[y_col])
-    ax.text(0.05, 0.95, f'r = {corr_coef:.3f}\np = {p_value:.4f}', 
-           transform=ax.transAxes, bbox=dict(boxstyle="round", facecolor='white', alpha=0.8))
-
-plt.tight_layout()
-plt.savefig('task_3b_scatterplot_fit_lines.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# Print Task 3b summary
-print("=== TASK 3b: CONTINUOUS vs CONTINUOUS ANALYSIS ===")
-print("Scatterplot Fit Lines created for:")
-for x_col, y_col, title, _, _ in pairs:
-    corr_coef, p_value = stats.pearsonr(df[x_col], df[y_col])
-    print(f"{title}: r = {corr_coef:.3f}, p = {p_value:.4f}")
-
-print("\nGenerated: task_3b_scatterplot_fit_lines.png") 
\ No newline at end of file
+def pair_columns():
+    """Every column used by the Task 3b pairs"""
+    return sorted({col for x_col, y_col, _, _, _ in pairs for col in (x_col, y_col)})
+
+def load_data():
+    """Load only the columns plotted in Task 3b"""
+    return load_crop_data('agriculture_crop_yield.csv', columns=pair_columns())
+
+def create_task_3b_charts(df, corr, show=True):
+    """Task 3b: Scatterplots with fit lines, annotated from the precomputed correlations"""
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    fits = fit_pairs(df, [(x_col, y_col) for x_col, y_col, _, _, _ in pairs])
+
+    for i, ((x_col, y_col, title, x_label, y_label), color) in enumerate(zip(pairs, colors)):
+        row, col = i // 2, i % 2
+        ax = axes[row, col]
+
+        # Scatter plot
+        ax.scatter(df[x_col], df[y_col], alpha=0.6, color=color)
+
+        # Fit line
+        plot_fit_line(ax, fits.fit(x_col, y_col), "r--", linewidth=2)
+
+        # Labels
+        ax.set_title(title)
+        ax.set_xlabel(x_label)
+        ax.set_ylabel(y_label)
+
+        # Correlation
+        corr_coef, p_value = corr.pair(x_col, y_col)
+        ax.text(0.05, 0.95, f'r = {corr_coef:.3f}\np = {p_value:.4f}',
+               transform=ax.transAxes, bbox=dict(boxstyle="round", facecolor='white', alpha=0.8))
+
+    plt.tight_layout()
+    cached_savefig('task_3b_scatterplot_fit_lines.png', inputs=(df, corr), dpi=300, bbox_inches='tight')
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+def export_task_3b_html(df, max_points):
+    """Task 3b scatterplots as WebGL traces, binned above max_points rows"""
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=2, cols=2, subplot_titles=[title for _, _, title, _, _ in pairs])
+    for i, ((x_col, y_col, _, x_label, y_label), color) in enumerate(zip(pairs, colors)):
+        row, col = i // 2 + 1, i % 2 + 1
+        for trace in scatter_traces(df, x_col, y_col, max_points=max_points, color=color):
+            fig.add_trace(trace, row=row, col=col)
+        fig.update_xaxes(title_text=x_label, row=row, col=col)
+        fig.update_yaxes(title_text=y_label, row=row, col=col)
+    fig.update_layout(showlegend=False, height=900)
+    write_html(fig, 'task_3b_scatterplot_fit_lines.html')
+
+def print_task_3b_summary(corr):
+    """Print the correlation for every Task 3b pair"""
+    print("=== TASK 3b: CONTINUOUS vs CONTINUOUS ANALYSIS ===")
+    print("Scatterplot Fit Lines created for:")
+    for x_col, y_col, title, _, _ in pairs:
+        corr_coef, p_value = corr.pair(x_col, y_col)
+        print(f"{title}: r = {corr_coef:.3f}, p = {p_value:.4f}")
+
+    print("\nGenerated: task_3b_scatterplot_fit_lines.png")
+
+def run_task_3b(df, show=True, interactive_points=0):
+    """Charts and summary for Task 3b on an already loaded frame"""
+    corr = correlate(df, pair_columns(), spearman=False)
+    create_task_3b_charts(df, corr, show=show)
+    if interactive_points and HAS_PLOTLY:
+        export_task_3b_html(df, interactive_points)
+    print_task_3b_summary(corr)
+
+def main():
+    """Main function for Task 3b: Continuous vs. Continuous Analysis"""
+    run_task_3b(load_data(), interactive_points=int(os.getenv("INTERACTIVE_POINTS", "0")))
+    print(figure_cache_report())
+
+if __name__ == "__main__":
+    main()
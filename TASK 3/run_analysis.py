@@ -1,30 +1,102 @@
-import subprocess
+import os
 import sys
+import time
+from collections import Counter
+from pathlib import Path
 
-print("=== AGRICULTURE CROP YIELD BIVARIATE ANALYSIS ===")
-print("Running separate analyses for different data types...\n")
-
-# Run Continuous vs Continuous Analysis
-print("1. Running Continuous vs Continuous Analysis...")
-try:
-    subprocess.run([sys.executable, 'continuous_vs_continuous.py'], check=True)
-    print("✅ Continuous vs Continuous analysis completed successfully!")
-except subprocess.CalledProcessError as e:
-    print(f"❌ Error in continuous vs continuous analysis: {e}")
-
-print("\n" + "="*50 + "\n")
-
-# Run Categorical vs Continuous Analysis
-print("2. Running Categorical vs Continuous Analysis...")
-try:
-    subprocess.run([sys.executable, 'categorical_vs_continuous.py'], check=True)
-    print("✅ Categorical vs Continuous analysis completed successfully!")
-except subprocess.CalledProcessError as e:
-    print(f"❌ Error in categorical vs continuous analysis: {e}")
-
-print("\n" + "="*50)
-print("=== ANALYSIS COMPLETE ===")
-print("Generated files:")
-print("- continuous_vs_continuous.png")
-print("- categorical_vs_continuous.png")
-print("\nCheck the generated PNG files for visualizations!") 
\ No newline at end of file
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from crop_analytics import load_crop_data
+from crop_analytics.dag import Node, run_dag, timing_report
+from crop_analytics.figcache import report as figure_cache_report
+
+import bivariate_analysis
+import categorical_vs_categorical_analysis
+import categorical_vs_continuous
+import continuous_vs_continuous
+
+# Every node runs in a pool worker on the frame loaded once below and
+# receives the results of the nodes it depends on as extra arguments.
+
+# Permutation/bootstrap resamples for the statistical tests (0 = asymptotic only)
+RESAMPLES = int(os.getenv("RESAMPLES", "0"))
+# Nodes already run one per pool worker, so each runs its resamples in-process
+NODE_WORKERS = 1
+# Points per trace for the optional interactive Task 3b export (0 = PNG only)
+INTERACTIVE_POINTS = int(os.getenv("INTERACTIVE_POINTS", "0"))
+
+def task_3a(df):
+    categorical_vs_categorical_analysis.create_task_3a_charts(
+        categorical_vs_categorical_analysis.add_categories(df), show=False)
+    print("✅ Task 3a: categorical vs categorical charts created")
+
+def task_3b(df):
+    continuous_vs_continuous.run_task_3b(df, show=False, interactive_points=INTERACTIVE_POINTS)
+
+def task_3c(df):
+    categorical_vs_continuous.run_task_3c(df, show=False, n_resamples=RESAMPLES, max_workers=NODE_WORKERS)
+
+def bivariate_overview(df):
+    bivariate_analysis.print_dataset_info(df)
+    bivariate_analysis.create_bivariate_overview(df, show=False)
+
+def correlation_matrix(df):
+    return bivariate_analysis.compute_correlation_matrix(df)
+
+def correlation_heatmap(df, corr):
+    bivariate_analysis.plot_correlation_matrix(corr, show=False)
+
+def statistical_tests(df, corr):
+    bivariate_analysis.run_statistical_tests(df, corr, n_resamples=RESAMPLES, max_workers=NODE_WORKERS)
+    bivariate_analysis.print_top_correlations(corr)
+
+NODES = [
+    Node('3a_categorical_vs_categorical', task_3a),
+    Node('3b_continuous_vs_continuous', task_3b),
+    Node('3c_categorical_vs_continuous', task_3c),
+    Node('bivariate_overview', bivariate_overview),
+    Node('correlation_matrix', correlation_matrix),
+    Node('correlation_heatmap', correlation_heatmap, deps=['correlation_matrix']),
+    Node('statistical_tests', statistical_tests, deps=['correlation_matrix']),
+]
+
+def report(result):
+    print("\n" + "="*50)
+    if result.ok:
+        print(f"✅ {result.name} completed in {result.seconds:.2f}s")
+    else:
+        print(f"❌ {result.name} failed: {result.error}")
+    if result.output:
+        print(result.output.rstrip())
+
+def main():
+    print("=== AGRICULTURE CROP YIELD BIVARIATE ANALYSIS ===")
+    print("Loading data once and running all analyses as a dependency graph...\n")
+
+    start = time.perf_counter()
+    df = load_crop_data('agriculture_crop_yield.csv')
+    print(f"Loaded {len(df)} rows in {time.perf_counter() - start:.2f}s")
+
+    workers = int(os.getenv("ANALYSIS_WORKERS", "0")) or None
+    results = run_dag(NODES, df, max_workers=workers, on_complete=report)
+
+    print("\n" + "="*50)
+    print("=== ANALYSIS COMPLETE ===")
+    print(f"Total wall time: {time.perf_counter() - start:.2f}s")
+    print(timing_report(results).to_string())
+    print(figure_cache_report(sum((r.figures for r in results.values()), Counter())))
+    print("\nGenerated files:")
+    print("- task_3a_1_stacked_bar_chart.png")
+    print("- task_3a_2_grouped_bar_chart.png")
+    print("- task_3a_3_segmented_bar_chart.png")
+    print("- task_3a_4_mosaic_plot.png")
+    print("- task_3b_scatterplot_fit_lines.png")
+    print("- task_3c_categorical_vs_continuous.png")
+    print("- bivariate_analysis.png")
+    print("- correlation_matrix.png")
+    print("\nCheck the generated PNG files for visualizations!")
+
+    if not all(r.ok for r in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,48 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
-from pandas.plotting import parallel_coordinates
-
-# Load data
-df = pd.read_csv('agriculture_crop_yield.csv')
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from crop_analytics import load_crop_data
+from crop_analytics.contingency import ContingencyTables
+from crop_analytics.cube import load_cube
+from crop_analytics.figcache import cached_savefig, report as figure_cache_report
+from crop_analytics.parallel import plot_parallel_density
+from crop_analytics.splom import plot_splom
+
+# Load data (only the columns used below)
+df = load_crop_data('agriculture_crop_yield.csv', columns=[
+    'State', 'Crop_Type', 'Area_Hectares', 'Yield_Tonnes', 'Yield_per_Hectare',
+    'Fertilizer_Usage_kg', 'Precipitation_mm', 'Temperature_Celsius', 'Total_Revenue'])
 
 # 1. SCATTERPLOT MATRIX
 numerical_vars = ['Area_Hectares', 'Yield_Tonnes', 'Yield_per_Hectare', 'Fertilizer_Usage_kg', 'Precipitation_mm', 'Temperature_Celsius']
-sns.pairplot(df[numerical_vars])
+plot_splom(df, numerical_vars)
 plt.suptitle('Scatterplot Matrix: Agriculture Variables', y=1.02)
-plt.savefig('scatterplot_matrix.png', dpi=300, bbox_inches='tight')
+cached_savefig('scatterplot_matrix.png', inputs=(df[numerical_vars],), dpi=300, bbox_inches='tight')
 plt.show()
 
 # 2. PARALLEL COORDINATES
-df_normalized = df.copy()
-for col in numerical_vars:
-    df_normalized[col] = (df_normalized[col] - df_normalized[col].min()) / (df_normalized[col].max() - df_normalized[col].min())
-
-top_states = df.groupby('State')['Total_Revenue'].sum().nlargest(5).index
-df_parallel = df_normalized[df_normalized['State'].isin(top_states)]
-
-plt.figure(figsize=(12, 8))
-parallel_coordinates(df_parallel[numerical_vars + ['State']], 'State', colormap=plt.cm.Set2)
+fig, ax = plt.subplots(figsize=(12, 8))
+plot_parallel_density(ax, df, numerical_vars, by='State')
 plt.title('Parallel Coordinates: Agriculture Variables by State')
 plt.xticks(rotation=45)
 plt.tight_layout()
-plt.savefig('parallel_coordinates.png', dpi=300, bbox_inches='tight')
+cached_savefig('parallel_coordinates.png', inputs=(df[numerical_vars + ['State']],), dpi=300, bbox_inches='tight')
 plt.show()
 
 # 3. LINE GRAPH
-yield_by_crop_year = df.groupby(['Year', 'Crop_Type'])['Yield_Tonnes'].sum().unstack()
+yield_by_crop_year = load_cube('agriculture_crop_yield.csv').sum(['Year', 'Crop_Type'], 'Yield_Tonnes').unstack()
 yield_by_crop_year.plot(kind='line', marker='o', figsize=(10, 6))
 plt.title('Line Graph: Yield by Crop Type Over Years')
 plt.ylabel('Yield (Tonnes)')
 plt.grid(True, alpha=0.3)
 plt.tight_layout()
-plt.savefig('line_graph.png', dpi=300, bbox_inches='tight')
+cached_savefig('line_graph.png', inputs=(yield_by_crop_year,), dpi=300, bbox_inches='tight')
 plt.show()
 
 # 4. STACKED BAR CHART
-yield_crop_state = df.groupby(['State', 'Crop_Type'])['Yield_Tonnes'].sum().unstack(fill_value=0)
+yield_crop_state = ContingencyTables(df, ['State', 'Crop_Type']).table('State', 'Crop_Type', values='Yield_Tonnes')
 top_states_yield = yield_crop_state.sum(axis=1).nlargest(8).index
 yield_crop_state.loc[top_states_yield].plot(kind='bar', stacked=True, figsize=(12, 8))
 plt.title('Stacked Bar Chart: Yield by Crop Type and State')
@@ -48,7 +50,7 @@ plt.ylabel('Yield (Tonnes)')
 plt.xticks(rotation=45)
 plt.legend(title='Crop Type', bbox_to_anchor=(1.05, 1))
 plt.tight_layout()
-plt.savefig('stacked_bar_chart.png', dpi=300, bbox_inches='tight')
+cached_savefig('stacked_bar_chart.png', inputs=(yield_crop_state.loc[top_states_yield],), dpi=300, bbox_inches='tight')
 plt.show()
 
 print("Analysis complete! Files created:")
@@ -56,3 +58,4 @@ print("- scatterplot_matrix.png")
 print("- parallel_coordinates.png")
 print("- line_graph.png")
 print("- stacked_bar_chart.png")
+print(figure_cache_report())
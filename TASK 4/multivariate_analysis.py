@@ -2,19 +2,35 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from pandas.plotting import parallel_coordinates
-import plotly.express as px
-import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import os
+import sys
 import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from crop_analytics import load_crop_data
+from crop_analytics.contingency import ContingencyTables
+from crop_analytics.correlation import correlate
+from crop_analytics.cube import load_cube
+from crop_analytics.figcache import cached_savefig, report as figure_cache_report
+from crop_analytics.interactive import line_traces, splom_figure, write_html
+from crop_analytics.parallel import plot_parallel_density
+from crop_analytics.splom import plot_splom
+
 warnings.filterwarnings('ignore')
 
+# Points per trace for the optional interactive HTML exports (0 = PNG only)
+INTERACTIVE_POINTS = int(os.getenv("INTERACTIVE_POINTS", "0"))
+
 # Set style for better visualizations
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
 # Load the dataset
-df = pd.read_csv('agriculture_crop_yield.csv')
+df = load_crop_data('agriculture_crop_yield.csv')
+# Group-by sums and means below are rolled up from the persisted cube
+cube = load_cube('agriculture_crop_yield.csv')
 
 # Display basic information about the dataset
 print("Dataset Shape:", df.shape)
@@ -37,54 +53,29 @@ numerical_vars = ['Area_Hectares', 'Yield_Tonnes', 'Yield_per_Hectare',
                   'Fertilizer_Usage_kg', 'Precipitation_mm', 'Temperature_Celsius',
                   'Storage_Loss_Percentage', 'Market_Price_per_Tonne', 'Total_Revenue']
 
-# Create scatterplot matrix
-fig, axes = plt.subplots(3, 3, figsize=(20, 20))
-fig.suptitle('Scatterplot Matrix: Multivariate Analysis of Agriculture Variables', 
-             fontsize=16, fontweight='bold', y=0.95)
+# One correlation pass shared by the scatterplot annotations and the heatmap
+correlations = correlate(df, numerical_vars, spearman=False)
 
-# Flatten axes for easier iteration
-axes_flat = axes.flatten()
-
-# Create scatterplots for each pair of variables
-for i, var1 in enumerate(numerical_vars):
-    for j, var2 in enumerate(numerical_vars):
-        if i != j:
-            idx = i * len(numerical_vars) + j
-            if idx < len(axes_flat):
-                ax = axes_flat[idx]
-                ax.scatter(df[var1], df[var2], alpha=0.6, s=30)
-                ax.set_xlabel(var1.replace('_', ' '))
-                ax.set_ylabel(var2.replace('_', ' '))
-                ax.tick_params(axis='both', which='major', labelsize=8)
-                
-                # Add correlation coefficient
-                corr = df[var1].corr(df[var2])
-                ax.text(0.05, 0.95, f'ρ = {corr:.2f}', transform=ax.transAxes, 
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
-
-# Remove empty subplots
-for i in range(len(numerical_vars)**2, len(axes_flat)):
-    fig.delaxes(axes_flat[i])
+# Create the full 9x9 scatterplot matrix: point scatters for small frames,
+# one 2D-histogram image per panel once the row count would swamp them
+fig = plot_splom(df, numerical_vars, correlations=correlations.pearson, figsize=(20, 20))
+fig.suptitle('Scatterplot Matrix: Multivariate Analysis of Agriculture Variables', 
+             fontsize=16, fontweight='bold', y=0.995)
 
 plt.tight_layout()
-plt.savefig('scatterplot_matrix.png', dpi=300, bbox_inches='tight')
+cached_savefig('scatterplot_matrix.png', inputs=(df[numerical_vars], correlations.pearson), dpi=300, bbox_inches='tight')
 plt.show()
 
+if INTERACTIVE_POINTS:
+    write_html(splom_figure(df, numerical_vars, INTERACTIVE_POINTS,
+                            title='Scatterplot Matrix: Multivariate Analysis of Agriculture Variables'),
+               'scatterplot_matrix.html')
+
 # 2. PARALLEL COORDINATES PLOT
 print("\n" + "="*50)
 print("2. PARALLEL COORDINATES PLOT")
 print("="*50)
 
-# Prepare data for parallel coordinates
-# Normalize numerical variables for better visualization
-df_normalized = df.copy()
-for col in numerical_vars:
-    df_normalized[col] = (df_normalized[col] - df_normalized[col].min()) / (df_normalized[col].max() - df_normalized[col].min())
-
-# Select subset of data for clearer visualization (top states by total revenue)
-top_states = df.groupby('State')['Total_Revenue'].sum().nlargest(8).index
-df_parallel = df_normalized[df_normalized['State'].isin(top_states)]
-
 # Create parallel coordinates plot
 fig, ax = plt.subplots(figsize=(16, 10))
 
@@ -92,16 +83,16 @@ fig, ax = plt.subplots(figsize=(16, 10))
 parallel_vars = ['Area_Hectares', 'Yield_Tonnes', 'Yield_per_Hectare', 
                 'Fertilizer_Usage_kg', 'Precipitation_mm', 'Temperature_Celsius']
 
-# Create parallel coordinates plot
-parallel_coordinates(df_parallel[parallel_vars + ['State']], 'State', 
-                    colormap=plt.cm.Set2, ax=ax)
+# Every row and every state, normalized in one step and drawn as one
+# alpha-blended line-density image per state
+plot_parallel_density(ax, df, parallel_vars, by='State')
 
 ax.set_title('Parallel Coordinates Plot: Agriculture Variables by State', 
              fontsize=16, fontweight='bold', pad=20)
 ax.grid(True, alpha=0.3)
 plt.xticks(rotation=45)
 plt.tight_layout()
-plt.savefig('parallel_coordinates.png', dpi=300, bbox_inches='tight')
+cached_savefig('parallel_coordinates.png', inputs=(df[parallel_vars + ['State']],), dpi=300, bbox_inches='tight')
 plt.show()
 
 # 3. LINE GRAPH - Time Series Analysis
@@ -115,7 +106,7 @@ fig.suptitle('Line Graphs: Agricultural Trends Over Time (2020-2021)',
              fontsize=16, fontweight='bold', y=0.95)
 
 # 3.1 Total Yield by Crop Type over Years
-yield_by_crop_year = df.groupby(['Year', 'Crop_Type'])['Yield_Tonnes'].sum().unstack()
+yield_by_crop_year = cube.sum(['Year', 'Crop_Type'], 'Yield_Tonnes').unstack()
 yield_by_crop_year.plot(kind='line', marker='o', ax=axes[0,0], linewidth=3, markersize=8)
 axes[0,0].set_title('Total Yield by Crop Type Over Years', fontweight='bold')
 axes[0,0].set_ylabel('Yield (Tonnes)')
@@ -123,7 +114,7 @@ axes[0,0].legend(title='Crop Type')
 axes[0,0].grid(True, alpha=0.3)
 
 # 3.2 Average Yield per Hectare by State over Years
-avg_yield_by_state = df.groupby(['Year', 'State'])['Yield_per_Hectare'].mean().unstack()
+avg_yield_by_state = cube.mean(['Year', 'State'], 'Yield_per_Hectare').unstack()
 # Select top 5 states for clarity
 top_states_yield = avg_yield_by_state.mean().nlargest(5).index
 avg_yield_by_state[top_states_yield].plot(kind='line', marker='s', ax=axes[0,1], linewidth=3, markersize=8)
@@ -133,7 +124,7 @@ axes[0,1].legend(title='State')
 axes[0,1].grid(True, alpha=0.3)
 
 # 3.3 Total Revenue by Climate Zone over Years
-revenue_by_climate = df.groupby(['Year', 'Climate_Zone'])['Total_Revenue'].sum().unstack()
+revenue_by_climate = cube.sum(['Year', 'Climate_Zone'], 'Total_Revenue').unstack()
 revenue_by_climate.plot(kind='line', marker='^', ax=axes[1,0], linewidth=3, markersize=8)
 axes[1,0].set_title('Total Revenue by Climate Zone Over Years', fontweight='bold')
 axes[1,0].set_ylabel('Total Revenue ($)')
@@ -141,7 +132,7 @@ axes[1,0].legend(title='Climate Zone')
 axes[1,0].grid(True, alpha=0.3)
 
 # 3.4 Average Temperature and Precipitation by Year
-weather_by_year = df.groupby('Year')[['Temperature_Celsius', 'Precipitation_mm']].mean()
+weather_by_year = cube.agg('Year', {'Temperature_Celsius': 'mean', 'Precipitation_mm': 'mean'})
 weather_by_year.plot(kind='line', marker='D', ax=axes[1,1], linewidth=3, markersize=8)
 axes[1,1].set_title('Average Weather Conditions Over Years', fontweight='bold')
 axes[1,1].set_ylabel('Temperature (°C) / Precipitation (mm)')
@@ -149,9 +140,21 @@ axes[1,1].legend(['Temperature (°C)', 'Precipitation (mm)'])
 axes[1,1].grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.savefig('line_graphs.png', dpi=300, bbox_inches='tight')
+cached_savefig('line_graphs.png', inputs=(yield_by_crop_year, avg_yield_by_state[top_states_yield], revenue_by_climate, weather_by_year), dpi=300, bbox_inches='tight')
 plt.show()
 
+if INTERACTIVE_POINTS:
+    line_fig = make_subplots(rows=2, cols=2, subplot_titles=[
+        'Total Yield by Crop Type Over Years', 'Average Yield per Hectare by Top States',
+        'Total Revenue by Climate Zone Over Years', 'Average Weather Conditions Over Years'])
+    for (row, col), frame in zip([(1, 1), (1, 2), (2, 1), (2, 2)],
+                                 [yield_by_crop_year, avg_yield_by_state[top_states_yield],
+                                  revenue_by_climate, weather_by_year]):
+        for trace in line_traces(frame, INTERACTIVE_POINTS):
+            line_fig.add_trace(trace, row=row, col=col)
+    line_fig.update_layout(title='Line Graphs: Agricultural Trends Over Time', height=900)
+    write_html(line_fig, 'line_graphs.html')
+
 # 4. STACKED BAR CHART
 print("\n" + "="*50)
 print("4. STACKED BAR CHART")
@@ -162,8 +165,11 @@ fig, axes = plt.subplots(2, 2, figsize=(20, 12))
 fig.suptitle('Stacked Bar Charts: Multivariate Analysis of Agriculture Data', 
              fontsize=16, fontweight='bold', y=0.95)
 
+# Every panel sums a value over one pair of integer-coded categorical columns
+tables = ContingencyTables(df)
+
 # 4.1 Stacked Bar: Yield by Crop Type and State
-yield_crop_state = df.groupby(['State', 'Crop_Type'])['Yield_Tonnes'].sum().unstack(fill_value=0)
+yield_crop_state = tables.table('State', 'Crop_Type', values='Yield_Tonnes')
 # Select top 10 states by total yield
 top_states_yield_total = yield_crop_state.sum(axis=1).nlargest(10).index
 yield_crop_state.loc[top_states_yield_total].plot(kind='bar', stacked=True, ax=axes[0,0])
@@ -173,7 +179,7 @@ axes[0,0].legend(title='Crop Type', bbox_to_anchor=(1.05, 1), loc='upper left')
 axes[0,0].tick_params(axis='x', rotation=45)
 
 # 4.2 Stacked Bar: Revenue by Climate Zone and Season
-revenue_climate_season = df.groupby(['Climate_Zone', 'Season'])['Total_Revenue'].sum().unstack(fill_value=0)
+revenue_climate_season = tables.table('Climate_Zone', 'Season', values='Total_Revenue')
 revenue_climate_season.plot(kind='bar', stacked=True, ax=axes[0,1])
 axes[0,1].set_title('Revenue by Climate Zone and Season', fontweight='bold')
 axes[0,1].set_ylabel('Total Revenue ($)')
@@ -181,7 +187,7 @@ axes[0,1].legend(title='Season', bbox_to_anchor=(1.05, 1), loc='upper left')
 axes[0,1].tick_params(axis='x', rotation=45)
 
 # 4.3 Stacked Bar: Area by Soil Type and Irrigation Type
-area_soil_irrigation = df.groupby(['Soil_Type', 'Irrigation_Type'])['Area_Hectares'].sum().unstack(fill_value=0)
+area_soil_irrigation = tables.table('Soil_Type', 'Irrigation_Type', values='Area_Hectares')
 area_soil_irrigation.plot(kind='bar', stacked=True, ax=axes[1,0])
 axes[1,0].set_title('Area by Soil Type and Irrigation Type', fontweight='bold')
 axes[1,0].set_ylabel('Area (Hectares)')
@@ -189,7 +195,7 @@ axes[1,0].legend(title='Irrigation Type', bbox_to_anchor=(1.05, 1), loc='upper l
 axes[1,0].tick_params(axis='x', rotation=45)
 
 # 4.4 Stacked Bar: Fertilizer Usage by Pest Level and Disease Incidence
-fertilizer_pest_disease = df.groupby(['Pest_Infestation_Level', 'Disease_Incidence'])['Fertilizer_Usage_kg'].sum().unstack(fill_value=0)
+fertilizer_pest_disease = tables.table('Pest_Infestation_Level', 'Disease_Incidence', values='Fertilizer_Usage_kg')
 fertilizer_pest_disease.plot(kind='bar', stacked=True, ax=axes[1,1])
 axes[1,1].set_title('Fertilizer Usage by Pest Level and Disease Incidence', fontweight='bold')
 axes[1,1].set_ylabel('Fertilizer Usage (kg)')
@@ -197,7 +203,7 @@ axes[1,1].legend(title='Disease Incidence', bbox_to_anchor=(1.05, 1), loc='upper
 axes[1,1].tick_params(axis='x', rotation=45)
 
 plt.tight_layout()
-plt.savefig('stacked_bar_charts.png', dpi=300, bbox_inches='tight')
+cached_savefig('stacked_bar_charts.png', inputs=(yield_crop_state.loc[top_states_yield_total], revenue_climate_season, area_soil_irrigation, fertilizer_pest_disease), dpi=300, bbox_inches='tight')
 plt.show()
 
 # 5. ADDITIONAL ANALYSIS: Correlation Heatmap
@@ -207,13 +213,13 @@ print("="*50)
 
 # Create correlation heatmap
 plt.figure(figsize=(12, 10))
-correlation_matrix = df[numerical_vars].corr()
+correlation_matrix = correlations.pearson
 mask = np.triu(np.ones_like(correlation_matrix, dtype=bool))
 sns.heatmap(correlation_matrix, mask=mask, annot=True, cmap='coolwarm', center=0,
             square=True, linewidths=0.5, cbar_kws={"shrink": .8})
 plt.title('Correlation Heatmap: Agriculture Variables', fontsize=16, fontweight='bold', pad=20)
 plt.tight_layout()
-plt.savefig('correlation_heatmap.png', dpi=300, bbox_inches='tight')
+cached_savefig('correlation_heatmap.png', inputs=(correlation_matrix,), dpi=300, bbox_inches='tight')
 plt.show()
 
 # 6. SUMMARY STATISTICS BY CATEGORIES
@@ -223,7 +229,7 @@ print("="*50)
 
 # Summary by Crop Type
 print("\nSummary by Crop Type:")
-crop_summary = df.groupby('Crop_Type').agg({
+crop_summary = cube.agg('Crop_Type', {
     'Area_Hectares': ['mean', 'sum'],
     'Yield_Tonnes': ['mean', 'sum'],
     'Yield_per_Hectare': 'mean',
@@ -233,7 +239,7 @@ print(crop_summary)
 
 # Summary by Climate Zone
 print("\nSummary by Climate Zone:")
-climate_summary = df.groupby('Climate_Zone').agg({
+climate_summary = cube.agg('Climate_Zone', {
     'Temperature_Celsius': 'mean',
     'Precipitation_mm': 'mean',
     'Yield_per_Hectare': 'mean',
@@ -243,7 +249,7 @@ print(climate_summary)
 
 # Summary by State
 print("\nTop 10 States by Total Revenue:")
-state_revenue = df.groupby('State')['Total_Revenue'].sum().sort_values(ascending=False).head(10)
+state_revenue = cube.sum('State', 'Total_Revenue').sort_values(ascending=False).head(10)
 print(state_revenue)
 
 print("\nAnalysis Complete! All visualizations have been saved as PNG files.")
@@ -253,3 +259,7 @@ print("- parallel_coordinates.png")
 print("- line_graphs.png")
 print("- stacked_bar_charts.png")
 print("- correlation_heatmap.png")
+if INTERACTIVE_POINTS:
+    print("- scatterplot_matrix.html")
+    print("- line_graphs.html")
+print(figure_cache_report())
@@ -1,18 +1,22 @@
 import os
-import re
+import sys
 from collections import defaultdict, Counter
-from typing import List, Dict, Tuple
+from typing import Iterable, List, Dict, Tuple
 
 import matplotlib.pyplot as plt
 import networkx as nx
 import pandas as pd
 from wordcloud import WordCloud
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crop_analytics import load_crop_data
+from crop_analytics.text import cloud_frequencies, corpus_parts, iter_clean_chunks, iter_token_chunks, iter_windows
 
-def load_dataset(csv_path: str) -> pd.DataFrame:
+
+def load_dataset(csv_path: str, columns: List[str] | None = None) -> pd.DataFrame:
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"Dataset not found at: {csv_path}")
-    df = pd.read_csv(csv_path)
+    df = load_crop_data(csv_path, columns=columns)
     return df
 
 
@@ -20,49 +24,36 @@ def build_corpus(
     df: pd.DataFrame,
     text_columns: List[str],
     personal_details: Dict[str, str] | None = None,
-) -> str:
-    parts: List[str] = []
-    for col in text_columns:
-        if col in df.columns:
-            values = df[col].astype(str).tolist()
-            parts.extend(values)
-
+) -> List[pd.Series]:
     # Add some high-signal numerical/context fields as tokens as well
-    for numeric_col in [
+    columns = list(text_columns) + [
         "Year",
         "Season",
         "Climate_Zone",
         "Soil_Type",
         "Irrigation_Type",
-    ]:
-        if numeric_col in df.columns:
-            parts.extend(df[numeric_col].astype(str).tolist())
+    ]
 
     # Inject personal details so the cloud contains them (Task 7a)
+    extra: List[str] = []
     if personal_details:
         for key, value in personal_details.items():
             if value:
-                parts.append(str(value))
-                parts.append(key)
+                extra.append(str(value))
+                extra.append(key)
 
-    corpus_text = "\n".join(parts)
-    return corpus_text
+    # The corpus stays as columns; text is produced from them chunk by chunk
+    return corpus_parts(df, columns, extra)
 
 
-def clean_text(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s\-]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def export_tagcrowd_input(text: str, out_path: str) -> None:
+def export_tagcrowd_input(chunks: Iterable[str], out_path: str) -> None:
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     with open(out_path, "w", encoding="utf-8") as f:
-        f.write(text)
+        for i, chunk in enumerate(chunks):
+            f.write(" " + chunk if i else chunk)
 
 
-def generate_wordcloud(text: str, out_path: str, width: int = 1200, height: int = 800) -> None:
+def generate_wordcloud(parts: List[pd.Series], out_path: str, width: int = 1200, height: int = 800) -> None:
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     wc = WordCloud(
         width=width,
@@ -70,7 +61,8 @@ def generate_wordcloud(text: str, out_path: str, width: int = 1200, height: int
         background_color="white",
         collocations=True,
         max_words=300,
-    ).generate(text)
+    )
+    wc.generate_from_frequencies(cloud_frequencies(parts, wc))
     plt.figure(figsize=(width / 100, height / 100))
     plt.imshow(wc, interpolation="bilinear")
     plt.axis("off")
@@ -79,29 +71,7 @@ def generate_wordcloud(text: str, out_path: str, width: int = 1200, height: int
     plt.close()
 
 
-def tokenize_sentences(text: str) -> List[List[str]]:
-    # Simple sentence split on punctuation and newlines
-    sentences = re.split(r"[\.!?\n]+", text)
-    tokenized = []
-    for s in sentences:
-        tokens = [t for t in re.findall(r"[a-z0-9\-]+", s.lower()) if t]
-        if tokens:
-            tokenized.append(tokens)
-    return tokenized
-
-
-def build_wordtree_sequences(tokenized_sentences: List[List[str]], root: str, max_len: int = 6) -> List[Tuple[str, ...]]:
-    sequences: List[Tuple[str, ...]] = []
-    for tokens in tokenized_sentences:
-        for i, tok in enumerate(tokens):
-            if tok == root:
-                window = tokens[i : i + max_len]
-                if window:
-                    sequences.append(tuple(window))
-    return sequences
-
-
-def sequences_to_graph(sequences: List[Tuple[str, ...]]) -> nx.DiGraph:
+def sequences_to_graph(sequences: Iterable[Tuple[str, ...]]) -> nx.DiGraph:
     g = nx.DiGraph()
     edge_weights: Dict[Tuple[str, str], int] = Counter()
     for seq in sequences:
@@ -177,8 +147,6 @@ def main():
     csv_path = os.path.join(base_dir, "agriculture_crop_yield.csv")
     outputs_dir = os.path.join(base_dir, "outputs")
 
-    df = load_dataset(csv_path)
-
     # Columns with categorical/textual content
     text_columns = [
         "State",
@@ -191,26 +159,26 @@ def main():
         "Disease_Incidence",
     ]
 
+    df = load_dataset(csv_path, columns=text_columns + ["Year"])
+
     # Put your details here to include them in TagCrowd/WordCloud
     personal_details = {
         # e.g., "name": "Karthik", "university": "XYZ University", "id": "12345"
     }
 
-    corpus = build_corpus(df, text_columns, personal_details)
-    corpus_clean = clean_text(corpus)
+    parts = build_corpus(df, text_columns, personal_details)
 
     # 7a) Export for TagCrowd
     tagcrowd_txt = os.path.join(outputs_dir, "tagcrowd_input.txt")
-    export_tagcrowd_input(corpus_clean, tagcrowd_txt)
+    export_tagcrowd_input(iter_clean_chunks(parts), tagcrowd_txt)
 
     # Also generate a WordCloud image locally
     wordcloud_img = os.path.join(outputs_dir, "wordcloud.png")
-    generate_wordcloud(corpus_clean, wordcloud_img)
+    generate_wordcloud(parts, wordcloud_img)
 
     # 7b) WordTree around root token (adjust as needed: "corn", "wheat", etc.)
     root_token = "corn"
-    tokenized = tokenize_sentences(corpus_clean)
-    sequences = build_wordtree_sequences(tokenized, root=root_token, max_len=6)
+    sequences = iter_windows(iter_token_chunks(parts), root=root_token, max_len=6)
     g = sequences_to_graph(sequences)
     wordtree_img = os.path.join(outputs_dir, f"wordtree_{root_token}.png")
     if root_token not in g.nodes:
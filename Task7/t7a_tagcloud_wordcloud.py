@@ -1,24 +1,18 @@
 import os
-import re
+import sys
 
-import pandas as pd
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crop_analytics import load_crop_data
+from crop_analytics.text import cloud_frequencies, corpus_parts, iter_clean_chunks
 
 CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "agriculture_crop_yield.csv")
 OUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "outputs")
 
 
-def clean_text(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s\-]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
 def main():
-    df = pd.read_csv(CSV_PATH)
     cols = [
         "State",
         "Crop_Type",
@@ -29,30 +23,24 @@ def main():
         "Pest_Infestation_Level",
         "Disease_Incidence",
     ]
-    parts = []
-    for c in cols:
-        if c in df.columns:
-            parts.extend(df[c].astype(str).tolist())
+    df = load_crop_data(CSV_PATH, columns=cols)
 
     # Optional: include your details so TagCrowd shows them
     # Edit these or set environment variables before running
     name = os.getenv("USER_NAME", "")
     college = os.getenv("USER_COLLEGE", "")
-    if name:
-        parts.append(name)
-    if college:
-        parts.append(college)
-
-    text = clean_text("\n".join(parts))
+    parts = corpus_parts(df, cols, [value for value in (name, college) if value])
     os.makedirs(OUT_DIR, exist_ok=True)
 
-    # 7a) TagCrowd input file
+    # 7a) TagCrowd input file, cleaned and written a chunk at a time
     tagcrowd_txt = os.path.join(OUT_DIR, "tagcrowd_input.txt")
     with open(tagcrowd_txt, "w", encoding="utf-8") as f:
-        f.write(text)
+        for i, chunk in enumerate(iter_clean_chunks(parts)):
+            f.write(" " + chunk if i else chunk)
 
     # Local WordCloud image
-    wc = WordCloud(width=1200, height=800, background_color="white", max_words=300).generate(text)
+    wc = WordCloud(width=1200, height=800, background_color="white", max_words=300)
+    wc.generate_from_frequencies(cloud_frequencies(parts, wc))
     plt.figure(figsize=(12, 8))
     plt.imshow(wc, interpolation="bilinear")
     plt.axis("off")
@@ -1,36 +1,19 @@
 import os
-import re
+import sys
 from collections import Counter
-from typing import List, Tuple
 
 import matplotlib.pyplot as plt
 import networkx as nx
-import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crop_analytics import load_crop_data
+from crop_analytics.text import corpus_parts, iter_token_chunks, iter_windows
 
 CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "agriculture_crop_yield.csv")
 OUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "outputs")
 
 
-def clean_text(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s\-]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def tokenize_sentences(text: str) -> List[List[str]]:
-    sentences = re.split(r"[\.!?\n]+", text)
-    tokenized = []
-    for s in sentences:
-        tokens = [t for t in re.findall(r"[a-z0-9\-]+", s) if t]
-        if tokens:
-            tokenized.append(tokens)
-    return tokenized
-
-
 def main():
-    df = pd.read_csv(CSV_PATH)
     cols = [
         "State",
         "Crop_Type",
@@ -41,23 +24,11 @@ def main():
         "Pest_Infestation_Level",
         "Disease_Incidence",
     ]
-    parts = []
-    for c in cols:
-        if c in df.columns:
-            parts.extend(df[c].astype(str).tolist())
-    text = clean_text("\n".join(parts))
-
-    tokenized = tokenize_sentences(text)
+    df = load_crop_data(CSV_PATH, columns=cols)
     root = os.getenv("WORDTREE_ROOT", "corn")
 
-    # Build sequences from root forward
-    sequences: List[Tuple[str, ...]] = []
-    for tokens in tokenized:
-        for i, tok in enumerate(tokens):
-            if tok == root:
-                window = tokens[i : i + 6]
-                if window:
-                    sequences.append(tuple(window))
+    # Sequences from root forward, streamed over the corpus tokens
+    sequences = iter_windows(iter_token_chunks(corpus_parts(df, cols)), root, max_len=6)
 
     # Build weighted directed graph
     edge_weights = Counter()
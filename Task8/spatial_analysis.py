@@ -4,25 +4,30 @@ Minimal Spatial Analysis of Agriculture Crop Data
 Task 8: CO4, S3 - Geographical Map, Map Projections
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from crop_analytics.cube import load_cube
 
 def analyze_crop_data():
     """Minimal spatial analysis of agriculture crop data"""
     
     # Step 1: Load and prepare data
     print("📊 Loading agriculture crop data...")
-    df = pd.read_csv('agriculture_crop_yield.csv')
+    # Every figure below is a roll-up of the persisted cube, not a row scan
+    cube = load_cube('agriculture_crop_yield.csv')
     
     # Create output directory
     os.makedirs('output', exist_ok=True)
     
     # Step 2: State-wise analysis
     print("🗺️ Creating state-wise visualizations...")
-    state_summary = df.groupby('State').agg({
+    state_summary = cube.agg('State', {
         'Yield_Tonnes': 'sum',
         'Yield_per_Hectare': 'mean',
         'Total_Revenue': 'sum'
@@ -56,14 +61,14 @@ def analyze_crop_data():
     
     # Step 5: Generate insights
     print("\n💡 Key Insights:")
-    print(f"Total Records: {len(df)}")
-    print(f"States: {df['State'].nunique()}")
-    print(f"Crop Types: {df['Crop_Type'].nunique()}")
+    print(f"Total Records: {cube.rows}")
+    print(f"States: {cube.nunique('State')}")
+    print(f"Crop Types: {cube.nunique('Crop_Type')}")
     
     top_state = state_summary.loc[state_summary['Yield_per_Hectare'].idxmax()]
     print(f"Best State: {top_state['State']} ({top_state['Yield_per_Hectare']:.2f} tonnes/hectare)")
     
-    climate_perf = df.groupby('Climate_Zone')['Yield_per_Hectare'].mean()
+    climate_perf = cube.mean('Climate_Zone', 'Yield_per_Hectare')
     best_climate = climate_perf.idxmax()
     print(f"Best Climate: {best_climate} ({climate_perf[best_climate]:.2f} tonnes/hectare)")
     
@@ -0,0 +1,35 @@
+"""Shared helpers for the agriculture crop yield task scripts."""
+
+from .cache import clear_cache, load_cached
+from .features import REGISTRY, add_derived, register, register_cut
+from .loader import (
+    CATEGORICAL_COLUMNS,
+    COLUMNS,
+    CONTINUOUS_COLUMNS,
+    DATE_COLUMNS,
+    FLOAT_COLUMNS,
+    INTEGER_COLUMNS,
+    SCHEMA,
+    apply_schema,
+    load_crop_data,
+    read_crop_csv,
+)
+
+__all__ = [
+    "CATEGORICAL_COLUMNS",
+    "COLUMNS",
+    "REGISTRY",
+    "CONTINUOUS_COLUMNS",
+    "DATE_COLUMNS",
+    "FLOAT_COLUMNS",
+    "INTEGER_COLUMNS",
+    "SCHEMA",
+    "add_derived",
+    "apply_schema",
+    "clear_cache",
+    "load_cached",
+    "load_crop_data",
+    "read_crop_csv",
+    "register",
+    "register_cut",
+]
@@ -0,0 +1,200 @@
+"""Columnar on-disk cache in front of the crop yield CSV.
+
+The first load of a CSV parses it with the declared schema and writes an
+uncompressed Feather (Arrow IPC) file; later loads are served from that file,
+memory-mapped and reading only the requested columns. The file is built a
+chunk of rows at a time. A first pass over the categorical and integer
+columns fixes every category set and integer width, so each chunk is
+written as a record batch of the same schema. Peak memory follows the
+chunk, not the file. Without pyarrow an entry is a directory of one pickle
+per column, so a load still reads only the columns it asks for. Entries are keyed by the
+SHA-256 of the CSV contents, so the six identical copies of the dataset share a
+single cache file and any edit to a CSV invalidates it. Size and mtime are kept
+in an index so an unchanged file is recognised without re-hashing it.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .loader import CATEGORICAL_COLUMNS, COLUMNS, INTEGER_COLUMNS, _select_columns, iter_crop_chunks, read_crop_csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    HAS_ARROW = True
+except Exception:
+    HAS_ARROW = False
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".crop_cache"
+INDEX_NAME = "index.json"
+CACHE_VERSION = 1
+# Feather files, or directories of per-column pickles without pyarrow
+FRAME_SUFFIX = ".feather" if HAS_ARROW else ".cols"
+# Rows parsed per chunk while a cache entry is built
+BUILD_CHUNKSIZE = 100_000
+
+
+def cache_dir() -> Path:
+    """Cache location, overridable with the CROP_CACHE_DIR environment variable."""
+    return Path(os.getenv("CROP_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def file_digest(path: str | os.PathLike, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _read_index(directory: Path) -> Dict[str, Dict]:
+    index_path = directory / INDEX_NAME
+    if not index_path.exists():
+        return {}
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if index.get("_version") == CACHE_VERSION else {}
+
+
+def _write_index(directory: Path, index: Dict[str, Dict]) -> None:
+    index["_version"] = CACHE_VERSION
+    _atomic_write_text(directory / INDEX_NAME, json.dumps(index, indent=1, sort_keys=True))
+
+
+def source_key(path: str | os.PathLike) -> str:
+    """Content hash of ``path``, reusing the indexed hash while size and mtime match."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    directory = cache_dir()
+    index = _read_index(directory)
+    entry = index.get(str(path))
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+    digest = file_digest(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    index[str(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    _write_index(directory, index)
+    return digest
+
+
+def cache_path(key: str) -> Path:
+    return cache_dir() / f"crop_yield-{key[:20]}{FRAME_SUFFIX}"
+
+
+def _write_frame(df: pd.DataFrame, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if HAS_ARROW:
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+        os.close(fd)
+        # Uncompressed so the file can be memory-mapped on read
+        feather.write_feather(df, tmp, compression="uncompressed")
+    else:
+        tmp = tempfile.mkdtemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+        for i, col in enumerate(df.columns):
+            df[[col]].to_pickle(os.path.join(tmp, f"{i}.pkl"))
+        _atomic_write_text(Path(tmp) / "columns.json", json.dumps([str(c) for c in df.columns]))
+    os.replace(tmp, target)
+
+
+def _read_frame(source: Path, columns: Sequence[str]) -> pd.DataFrame:
+    if HAS_ARROW:
+        table = feather.read_table(source, columns=list(columns), memory_map=True)
+        return table.to_pandas()
+    with open(source / "columns.json", encoding="utf-8") as f:
+        position = {col: i for i, col in enumerate(json.load(f))}
+    return pd.concat([pd.read_pickle(source / f"{position[col]}.pkl") for col in columns], axis=1)
+
+
+def _file_dtypes(path: str, chunksize: int) -> Dict[str, object]:
+    """Category sets and narrowest integer types of the whole CSV, from a chunked pass over those columns."""
+    levels = {col: set() for col in CATEGORICAL_COLUMNS}
+    lo = {col: 0 for col in INTEGER_COLUMNS}
+    hi = {col: 0 for col in INTEGER_COLUMNS}
+    for chunk in iter_crop_chunks(path, CATEGORICAL_COLUMNS + INTEGER_COLUMNS, chunksize):
+        if not len(chunk):
+            continue
+        for col in CATEGORICAL_COLUMNS:
+            levels[col].update(chunk[col].cat.categories)
+        for col in INTEGER_COLUMNS:
+            lo[col], hi[col] = min(lo[col], int(chunk[col].min())), max(hi[col], int(chunk[col].max()))
+    dtypes: Dict[str, object] = {col: pd.CategoricalDtype(sorted(levels[col])) for col in CATEGORICAL_COLUMNS}
+    for col in INTEGER_COLUMNS:
+        # As pd.to_numeric(downcast="integer") over the whole column
+        dtypes[col] = next(t for t in (np.int8, np.int16, np.int32, np.int64)
+                           if np.iinfo(t).min <= lo[col] and hi[col] <= np.iinfo(t).max)
+    return dtypes
+
+
+def _build_feather(path: str, target: Path, chunksize: int) -> None:
+    """Write the typed CSV to ``target`` one record batch per chunk."""
+    dtypes = _file_dtypes(path, chunksize)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    os.close(fd)
+    writer = schema = None
+    try:
+        for chunk in iter_crop_chunks(path, COLUMNS, chunksize):
+            batch = pa.Table.from_pandas(chunk.astype(dtypes), preserve_index=False)
+            if writer is None:
+                schema = batch.schema
+                writer = pa.ipc.new_file(tmp, schema)
+            writer.write_table(batch.cast(schema))
+        if writer is None:
+            # Header-only CSV: the typed empty frame
+            feather.write_feather(read_crop_csv(path, COLUMNS), tmp, compression="uncompressed")
+        else:
+            writer.close()
+        os.replace(tmp, target)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        os.unlink(tmp)
+        raise
+
+
+def load_cached(path: str | os.PathLike, columns: Sequence[str] | None = None,
+                chunksize: int = BUILD_CHUNKSIZE) -> pd.DataFrame:
+    """Load the CSV through the columnar cache, building the cache entry on a miss."""
+    usecols = _select_columns(columns)
+    target = cache_path(source_key(path))
+    if not target.exists():
+        if HAS_ARROW:
+            _build_feather(str(path), target, chunksize)
+        else:
+            _write_frame(read_crop_csv(str(path), COLUMNS), target)
+    return _read_frame(target, usecols)
+
+
+def clear_cache() -> int:
+    """Delete every cached frame and the index; returns the number of files removed."""
+    directory = cache_dir()
+    if not directory.exists():
+        return 0
+    removed = 0
+    for p in directory.iterdir():
+        if p.is_file():
+            p.unlink()
+            removed += 1
+        elif p.suffix == ".cols":
+            shutil.rmtree(p)
+            removed += 1
+    return removed
@@ -0,0 +1,187 @@
+"""Contingency tables and chi-square association for categorical columns.
+
+Every column is encoded to integer codes once. A table for any pair (or a
+multi-column row key against a column) is then a single ``bincount`` over the
+combined codes, optionally summing a value column instead of counting. All
+pairs at once come from one sparse one-hot product (the Burt matrix), whose
+blocks are every pairwise table; chi-square, p-value and Cramér's V follow
+for all of them together, matching ``scipy.stats.chi2_contingency``.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .encoding import group_codes
+
+
+class ChiSquare:
+    """Pearson chi-square test of independence for one contingency table."""
+
+    def __init__(self, chi2: float, p: float, dof: int, cramers_v: float, n: int, expected: pd.DataFrame):
+        self.chi2 = chi2
+        self.p = p
+        self.dof = dof
+        self.cramers_v = cramers_v
+        self.n = n
+        self.expected = expected
+
+
+def _chi_square(observed: np.ndarray, correction: bool = True) -> Tuple[float, int, float, np.ndarray]:
+    """``(chi2, dof, cramers_v, expected)`` with empty rows and columns ignored.
+
+    As in ``scipy.stats.chi2_contingency``, Yates' correction applies only
+    when ``dof == 1``; Cramér's V always uses the uncorrected statistic.
+    """
+    observed = np.asarray(observed, dtype=float)
+    observed = observed[observed.sum(axis=1) > 0][:, observed.sum(axis=0) > 0]
+    n = observed.sum()
+    if observed.size == 0 or n == 0:
+        return np.nan, 0, np.nan, observed
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / n
+    dof = (observed.shape[0] - 1) * (observed.shape[1] - 1)
+    diff = observed - expected
+    raw = float((diff ** 2 / expected).sum())
+    chi2 = raw
+    if correction and dof == 1:
+        adjusted = np.abs(diff) - np.minimum(0.5, np.abs(diff))
+        chi2 = float((adjusted ** 2 / expected).sum())
+    k = min(observed.shape) - 1
+    cramers_v = float(np.sqrt(raw / (n * k))) if k > 0 else np.nan
+    return chi2, dof, cramers_v, expected
+
+
+def _chi2_pvalue(chi2, dof):
+    from scipy import special
+
+    with np.errstate(invalid="ignore"):
+        return np.where(np.asarray(dof) > 0, special.chdtrc(dof, chi2), np.nan)
+
+
+class ContingencyTables:
+    """Integer-coded categorical columns of ``df`` and the tables built from them.
+
+    ``columns`` defaults to every ``category`` column. Count tables are
+    cached, so panels and tests that share a pair share one table.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] | None = None):
+        if columns is None:
+            columns = df.select_dtypes(include="category").columns
+        self.df = df
+        self.columns = list(columns)
+        self._codes: Dict[str, np.ndarray] = {}
+        self._labels: Dict[str, pd.Index] = {}
+        for col in self.columns:
+            self._encode(col)
+        self._tables: Dict[Tuple, pd.DataFrame] = {}
+
+    def _encode(self, col: str) -> Tuple[np.ndarray, pd.Index]:
+        if col not in self._codes:
+            self._codes[col], self._labels[col] = group_codes(self.df[col])
+        return self._codes[col], self._labels[col]
+
+    def _key(self, cols: str | Sequence[str]) -> Tuple[np.ndarray, pd.Index]:
+        """Codes and labels for one column, or for the observed combinations of several."""
+        if isinstance(cols, str):
+            return self._encode(cols)
+        encoded = [self._encode(c) for c in cols]
+        codes = np.stack([c for c, _ in encoded])
+        valid = (codes >= 0).all(axis=0)
+        flat = np.full(codes.shape[1], -1, dtype=np.intp)
+        flat[valid] = np.ravel_multi_index(codes[:, valid], [len(labels) for _, labels in encoded])
+        observed, inverse = np.unique(flat[valid], return_inverse=True)
+        combined = np.full(codes.shape[1], -1, dtype=np.intp)
+        combined[valid] = inverse
+        parts = np.unravel_index(observed, [len(labels) for _, labels in encoded])
+        index = pd.MultiIndex.from_arrays(
+            [labels[part] for (_, labels), part in zip(encoded, parts)], names=list(cols)
+        )
+        return combined, index
+
+    def table(
+        self,
+        rows: str | Sequence[str],
+        cols: str,
+        values: str | None = None,
+        mask: np.ndarray | pd.Series | None = None,
+    ) -> pd.DataFrame:
+        """Counts (or sums of ``values``) of ``rows`` x ``cols``.
+
+        ``rows`` may name several columns, giving the observed combinations as
+        a MultiIndex like ``groupby(rows)[cols].value_counts().unstack()``.
+        With ``mask``, only the selected rows are tabulated and labels that
+        never occur among them are dropped.
+        """
+        cacheable = values is None and mask is None
+        key = (tuple([rows] if isinstance(rows, str) else rows), cols)
+        if cacheable and key in self._tables:
+            return self._tables[key]
+        r_codes, r_index = self._key(rows)
+        c_codes, c_index = self._key(cols)
+        keep = (r_codes >= 0) & (c_codes >= 0)
+        if mask is not None:
+            keep &= np.asarray(mask, dtype=bool)
+        size = len(r_index) * len(c_index)
+        flat = r_codes[keep] * len(c_index) + c_codes[keep]
+        counts = np.bincount(flat, minlength=size).reshape(len(r_index), len(c_index))
+        if values is None:
+            data = counts
+        else:
+            column = self.df[values]
+            data = np.bincount(flat, column.to_numpy(dtype=float)[keep], minlength=size)
+            data = data.reshape(counts.shape)
+            if column.dtype.kind in "iu":
+                data = data.round().astype(np.int64)
+        table = pd.DataFrame(data, index=r_index, columns=c_index)
+        if mask is not None:
+            table = table.loc[counts.sum(axis=1) > 0, counts.sum(axis=0) > 0]
+        if cacheable:
+            self._tables[key] = table
+        return table
+
+    def chi_square(self, a: str, b: str, correction: bool = True) -> ChiSquare:
+        """Chi-square test of independence for ``a`` x ``b``."""
+        observed = self.table(a, b)
+        keep_rows = observed.sum(axis=1).to_numpy() > 0
+        keep_cols = observed.sum(axis=0).to_numpy() > 0
+        chi2, dof, cramers_v, expected = _chi_square(observed.to_numpy(), correction)
+        expected = pd.DataFrame(expected, index=observed.index[keep_rows], columns=observed.columns[keep_cols])
+        return ChiSquare(chi2, float(_chi2_pvalue(chi2, dof)), dof, cramers_v, int(observed.to_numpy().sum()), expected)
+
+    def all_pairs(self, columns: Sequence[str] | None = None, correction: bool = True) -> pd.DataFrame:
+        """Chi-square, p-value and Cramér's V for every pair of ``columns``.
+
+        Every pairwise table is a block of one sparse one-hot product, and is
+        cached for later ``table`` calls. Rows are ordered by decreasing V.
+        """
+        from scipy import sparse
+
+        columns = self.columns if columns is None else list(columns)
+        blocks = []
+        offsets: List[int] = [0]
+        for col in columns:
+            codes, labels = self._encode(col)
+            rows = np.flatnonzero(codes >= 0)
+            blocks.append(sparse.csr_matrix(
+                (np.ones(len(rows)), (rows, codes[rows])), shape=(len(codes), len(labels))
+            ))
+            offsets.append(offsets[-1] + len(labels))
+        onehot = sparse.hstack(blocks, format="csr")
+        burt = (onehot.T @ onehot).toarray()
+
+        records = []
+        for i, a in enumerate(columns):
+            for j in range(i + 1, len(columns)):
+                b = columns[j]
+                observed = burt[offsets[i]:offsets[i + 1], offsets[j]:offsets[j + 1]].astype(np.int64)
+                self._tables.setdefault(
+                    ((a,), b), pd.DataFrame(observed, index=self._labels[a], columns=self._labels[b])
+                )
+                chi2, dof, cramers_v, _ = _chi_square(observed, correction)
+                records.append({"a": a, "b": b, "n": int(observed.sum()), "chi2": chi2,
+                                "dof": dof, "cramers_v": cramers_v})
+        pairs = pd.DataFrame(records, columns=["a", "b", "n", "chi2", "dof", "cramers_v"])
+        pairs.insert(5, "p", _chi2_pvalue(pairs["chi2"].to_numpy(dtype=float), pairs["dof"].to_numpy()))
+        return pairs.sort_values("cramers_v", ascending=False, kind="stable").reset_index(drop=True)
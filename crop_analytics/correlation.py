@@ -0,0 +1,209 @@
+"""All-pairs Pearson/Spearman correlation with p-values from one matrix product.
+
+Columns are centred once and every pairwise sum is taken from a single
+``X.T @ X`` style product over the numeric block, with missing values handled
+pairwise (like ``DataFrame.corr``) through the matching mask products;
+Spearman re-ranks only the columns with gaps, within each pair's rows.
+P-values use the exact t-distribution test that ``scipy.stats.pearsonr``
+applies, vectorised over the whole matrix. Consumers (plot annotations,
+heatmaps, top-pair reports, correlation networks) read from one
+``CorrelationResult`` instead of recomputing.
+"""
+
+from itertools import combinations
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _pairwise_pearson(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairwise-complete correlation and pair counts for the columns of ``values``."""
+    mask = ~np.isnan(values)
+    # Centre on column means so the sums below do not cancel catastrophically
+    centred = np.where(mask, values - np.nanmean(values, axis=0), 0.0)
+    m = mask.astype(float)
+    if mask.all():
+        n = np.full((values.shape[1],) * 2, float(len(values)))
+        sxy = centred.T @ centred
+        sx = np.zeros_like(sxy)
+        sxx = np.broadcast_to(np.diag(sxy)[:, None], sxy.shape)
+    else:
+        n = m.T @ m
+        sxy = centred.T @ centred
+        sx = centred.T @ m
+        sxx = (centred ** 2).T @ m
+    sy, syy = sx.T, sxx.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx ** 2 / n
+        var_y = syy - sy ** 2 / n
+        r = cov / np.sqrt(var_x * var_y)
+    r = np.clip(r, -1.0, 1.0)
+    np.fill_diagonal(r, np.where(np.diag(var_x) > 0, 1.0, np.nan))
+    return r, n
+
+
+def correlation_pvalues(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-values for H0: rho = 0, as in ``scipy.stats.pearsonr``."""
+    from scipy import special
+
+    r = np.asarray(r, dtype=float)
+    df = np.asarray(n, dtype=float) - 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # pearsonr's beta-distribution form: p = I_{1 - r^2}(df/2, 1/2)
+        p = special.betainc(df / 2, 0.5, np.clip(1 - r * r, 0.0, 1.0))
+    return np.where(df > 0, p, np.nan)
+
+
+def _ranks(frame: pd.DataFrame) -> np.ndarray:
+    return frame.rank(method="average").to_numpy(dtype=float)
+
+
+def _pairwise_spearman(frame: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Spearman correlation ranking each pair within its complete rows, as ``DataFrame.corr`` does.
+
+    Complete columns share one ranking. A column with gaps is re-ranked
+    once over its own rows against every complete column, and pairs of
+    columns that both have gaps are ranked over their joint rows.
+    """
+    r, n = _pairwise_pearson(_ranks(frame))
+    mask = frame.notna().to_numpy()
+    gaps = np.flatnonzero(~mask.all(axis=0))
+    for j in gaps:
+        rj = _pairwise_pearson(_ranks(frame[mask[:, j]]))[0][j]
+        r[j, :] = rj
+        r[:, j] = rj
+    for a, b in combinations(gaps, 2):
+        rows = mask[:, a] & mask[:, b]
+        r[a, b] = r[b, a] = _pairwise_pearson(_ranks(frame.iloc[rows, [a, b]]))[0][0, 1]
+    return r, n
+
+
+class CorrelationResult:
+    """Correlation matrices, p-values and pair counts for one numeric block."""
+
+    def __init__(self, columns: Sequence[str], pearson: np.ndarray, pearson_n: np.ndarray,
+                 spearman: np.ndarray | None = None, spearman_n: np.ndarray | None = None):
+        self.columns = list(columns)
+        self._pearson = pearson
+        self._pearson_n = pearson_n
+        self._spearman = spearman
+        self._spearman_n = spearman_n
+        self._pvalues = {}
+
+    def _matrix(self, method: str) -> Tuple[np.ndarray, np.ndarray]:
+        if method == "pearson":
+            return self._pearson, self._pearson_n
+        if method == "spearman":
+            if self._spearman is None:
+                raise ValueError("Spearman correlations were not computed")
+            return self._spearman, self._spearman_n
+        raise ValueError(f"Unknown method: {method!r}")
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def matrix(self, method: str = "pearson") -> pd.DataFrame:
+        return self._frame(self._matrix(method)[0])
+
+    def pvalues(self, method: str = "pearson") -> pd.DataFrame:
+        if method not in self._pvalues:
+            r, n = self._matrix(method)
+            p = correlation_pvalues(r, n)
+            np.fill_diagonal(p, 0.0)
+            self._pvalues[method] = p
+        return self._frame(self._pvalues[method])
+
+    @property
+    def pearson(self) -> pd.DataFrame:
+        return self.matrix("pearson")
+
+    @property
+    def spearman(self) -> pd.DataFrame:
+        return self.matrix("spearman")
+
+    def pair(self, a: str, b: str, method: str = "pearson") -> Tuple[float, float]:
+        """``(r, p)`` for one pair, read from the precomputed matrices."""
+        i, j = self.columns.index(a), self.columns.index(b)
+        r = float(self._matrix(method)[0][i, j])
+        return r, float(self.pvalues(method).iat[i, j])
+
+    def pairs(self, threshold: float = 0.0, method: str = "pearson", inclusive: bool = False) -> pd.DataFrame:
+        """Upper-triangle pairs with ``|r|`` above ``threshold`` (``>=`` when ``inclusive``).
+
+        Rows come in matrix order (row-major over the upper triangle), with
+        columns ``a``, ``b``, ``r`` and ``p``.
+        """
+        r = self._matrix(method)[0]
+        p = self.pvalues(method).to_numpy()
+        iu, ju = np.triu_indices(len(self.columns), k=1)
+        vals = r[iu, ju]
+        keep = np.abs(vals) >= threshold if inclusive else np.abs(vals) > threshold
+        names = np.asarray(self.columns, dtype=object)
+        return pd.DataFrame({
+            "a": names[iu[keep]],
+            "b": names[ju[keep]],
+            "r": vals[keep],
+            "p": p[iu[keep], ju[keep]],
+        })
+
+
+def correlate(df: pd.DataFrame, columns: Sequence[str] | None = None, spearman: bool = True) -> CorrelationResult:
+    """Pearson (and Spearman) matrices for ``columns`` (default: every numeric column)."""
+    frame = df[list(columns)] if columns is not None else df.select_dtypes(include="number")
+    values = frame.to_numpy(dtype=float)
+    pearson, pearson_n = _pairwise_pearson(values)
+    rho = rho_n = None
+    if spearman:
+        rho, rho_n = _pairwise_spearman(frame)
+    return CorrelationResult(frame.columns, pearson, pearson_n, rho, rho_n)
+
+
+def iter_correlated_pairs(
+    df: pd.DataFrame,
+    columns: Sequence[str] | None = None,
+    threshold: float = 0.5,
+    block_size: int = 512,
+    method: str = "pearson",
+    inclusive: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """Thresholded pairs for wide tables, one column block pair at a time.
+
+    Only a ``block_size`` x ``block_size`` tile of the matrix exists at once,
+    so tables with tens of thousands of columns can be screened. Rows with any
+    missing value in ``columns`` are dropped up front (listwise deletion).
+    """
+    frame = df[list(columns)] if columns is not None else df.select_dtypes(include="number")
+    frame = frame.dropna()
+    values = _ranks(frame) if method == "spearman" else frame.to_numpy(dtype=float)
+    n = len(values)
+    std = values.std(axis=0, ddof=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (values - values.mean(axis=0)) / std
+    names = np.asarray(frame.columns, dtype=object)
+    k = z.shape[1]
+    for a0 in range(0, k, block_size):
+        za = z[:, a0:a0 + block_size]
+        for b0 in range(a0, k, block_size):
+            r = np.clip(za.T @ z[:, b0:b0 + block_size] / (n - 1), -1.0, 1.0)
+            ia, jb = np.nonzero(np.abs(r) >= threshold if inclusive else np.abs(r) > threshold)
+            upper = (a0 + ia) < (b0 + jb)
+            ia, jb = ia[upper], jb[upper]
+            if len(ia) == 0:
+                continue
+            vals = r[ia, jb]
+            yield pd.DataFrame({
+                "a": names[a0 + ia],
+                "b": names[b0 + jb],
+                "r": vals,
+                "p": correlation_pvalues(vals, np.full(len(vals), n)),
+            })
+
+
+def correlated_pairs(df: pd.DataFrame, columns: Sequence[str] | None = None, threshold: float = 0.5, **kwargs) -> pd.DataFrame:
+    """All blocks from ``iter_correlated_pairs`` concatenated."""
+    blocks: List[pd.DataFrame] = list(iter_correlated_pairs(df, columns, threshold, **kwargs))
+    if not blocks:
+        return pd.DataFrame(columns=["a", "b", "r", "p"])
+    return pd.concat(blocks, ignore_index=True)
@@ -0,0 +1,133 @@
+"""Correlation networks kept current as data arrives in batches.
+
+A ``CorrelationNetwork`` keeps a ``CoMomentAccumulator`` over its columns
+and the thresholded graph of the correlations so far. ``update`` folds one
+batch into the co-moments and rereads the ``k x k`` matrix from them. It
+then compares which pairs pass the threshold before and after. Only the
+pairs that crossed are added to or dropped from the graph. Once a layout
+exists, only the endpoints of those pairs move, from where they were. A
+batch therefore costs O(rows * k^2), plus O(k^2 + edges) for the diff,
+however much data came before. ``save`` and ``load`` keep the whole state in
+one ``.npz``, so the next batch can arrive in a later run.
+"""
+
+import os
+from typing import Dict, Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .correlation import CorrelationResult
+from .graph import EdgeGraph
+from .graphio import _replacing, _storable
+from .layout import force_layout, refine_layout
+from .streaming import CoMomentAccumulator
+
+
+class EdgeChanges:
+    """Pairs that crossed the threshold in one update, as ``a``/``b``/``r`` frames."""
+
+    def __init__(self, added: pd.DataFrame, removed: pd.DataFrame):
+        self.added = added
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        return bool(len(self.added) or len(self.removed))
+
+    def frame(self) -> pd.DataFrame:
+        """Both kinds in one frame, with a ``change`` column of ``"added"``/``"removed"``."""
+        return pd.concat([self.added.assign(change="added"), self.removed.assign(change="removed")],
+                         ignore_index=True)
+
+
+class CorrelationNetwork:
+    """Pairs of ``columns`` with ``|r|`` at or above ``threshold`` (above, unless ``inclusive``).
+
+    ``graph`` is the network as ``matrix_edges`` would build it from the
+    current matrix: the same nodes, edges, ``|r|`` weights and ``sign``
+    attribute.
+    """
+
+    def __init__(self, columns: Sequence[str], threshold: float, inclusive: bool = True):
+        self.moments = CoMomentAccumulator(columns)
+        self.threshold = threshold
+        self.inclusive = inclusive
+        self._r = np.full((len(self.moments.columns),) * 2, np.nan)
+        self.graph = self._graph(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+        self.pos: Dict[Hashable, np.ndarray] | None = None
+        self.layout_seed = 0
+
+    @property
+    def columns(self):
+        return self.moments.columns
+
+    def correlation(self) -> CorrelationResult:
+        return self.moments.correlation()
+
+    def _passing(self, r: np.ndarray) -> np.ndarray:
+        strength = np.abs(r)
+        with np.errstate(invalid="ignore"):
+            mask = strength >= self.threshold if self.inclusive else strength > self.threshold
+        return np.triu(mask, k=1)
+
+    def _graph(self, src: np.ndarray, dst: np.ndarray) -> EdgeGraph:
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        values = self._r[src, dst]
+        return EdgeGraph(self.columns, src, dst, np.abs(values),
+                         edge_attrs={"sign": np.where(values >= 0, "pos", "neg")})
+
+    def _pairs(self, mask: np.ndarray) -> pd.DataFrame:
+        a, b = np.nonzero(mask)
+        names = np.asarray(self.columns, dtype=object)
+        return pd.DataFrame({"a": names[a], "b": names[b], "r": self._r[a, b]})
+
+    def update(self, batch: pd.DataFrame) -> EdgeChanges:
+        """Fold ``batch`` in; apply and return the edges that crossed the threshold."""
+        before = np.zeros(self._r.shape, dtype=bool)
+        before[self.graph.src, self.graph.dst] = True
+        self.moments.update(batch)
+        self._r = self.moments.pearson()
+        after = self._passing(self._r)
+        added, removed = after & ~before, before & ~after
+        # Kept edges stay, dropped ones go and crossed pairs are appended
+        keep = ~removed[self.graph.src, self.graph.dst]
+        add_src, add_dst = np.nonzero(added)
+        self.graph = self._graph(np.r_[self.graph.src[keep], add_src], np.r_[self.graph.dst[keep], add_dst])
+        changes = EdgeChanges(self._pairs(added), self._pairs(removed))
+        if self.pos is not None and changes:
+            moved = changes.frame()[["a", "b"]].to_numpy().ravel().tolist()
+            self.pos = refine_layout(self.graph, self.pos, moved, weight="weight", seed=self.layout_seed)
+        return changes
+
+    def layout(self, seed: int = 0) -> Dict[Hashable, np.ndarray]:
+        """Node positions, from ``force_layout`` on first call and kept current by ``update`` after."""
+        if self.pos is None:
+            self.layout_seed = seed
+            self.pos = force_layout(self.graph, seed=seed, weight="weight")
+        return self.pos
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Store the co-moments, the edges and any layout in one ``.npz``."""
+        m = self.moments
+        arrays = dict(columns=_storable(np.asarray(self.columns, dtype=object)), count=m.count, mean=m.mean,
+                      m2=m.m2, comoment=m.comoment, threshold=self.threshold, inclusive=self.inclusive,
+                      src=self.graph.src, dst=self.graph.dst)
+        if self.pos is not None:
+            arrays["pos"] = np.array([self.pos[c] for c in self.columns])
+            arrays["layout_seed"] = self.layout_seed
+        with _replacing(path) as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "CorrelationNetwork":
+        with np.load(path, allow_pickle=False) as data:
+            network = cls(data["columns"].tolist(), float(data["threshold"]), bool(data["inclusive"]))
+            m = network.moments
+            m.count, m.mean, m.m2, m.comoment = data["count"], data["mean"], data["m2"], data["comoment"]
+            network._r = m.pearson()
+            network.graph = network._graph(data["src"], data["dst"])
+            if "pos" in data.files:
+                network.pos = dict(zip(network.columns, data["pos"]))
+                network.layout_seed = int(data["layout_seed"])
+        return network
@@ -0,0 +1,159 @@
+"""Pre-aggregated cube of additive measures over the main reporting dimensions.
+
+One group-by at the finest grain (every observed Year x State x Crop_Type x
+Season x Climate_Zone cell) stores, per measure, the non-missing count, the
+sum and the sum of squares. Any roll-up to a subset of those dimensions is a
+sum of cells, and means, variances and standard deviations follow from the
+summed counts, sums and sums of squares, so reports never go back to the rows.
+The cells are persisted next to the cached base frame, keyed by the CSV
+content hash and the cube definition.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .cache import _read_frame, _write_frame, cache_dir, load_cached, source_key, FRAME_SUFFIX
+
+
+CUBE_VERSION = 1
+
+DIMENSIONS: List[str] = ["Year", "State", "Crop_Type", "Season", "Climate_Zone"]
+
+MEASURES: List[str] = [
+    "Area_Hectares",
+    "Yield_Tonnes",
+    "Yield_per_Hectare",
+    "Fertilizer_Usage_kg",
+    "Precipitation_mm",
+    "Temperature_Celsius",
+    "Total_Revenue",
+]
+
+STATISTICS = ("count", "sum", "mean", "var", "std")
+
+
+def _column(measure: str, part: str) -> str:
+    return f"{measure}:{part}"
+
+
+class Cube:
+    """Cells holding ``count`` (rows) and per-measure ``count``/``sum``/``sumsq``."""
+
+    def __init__(self, cells: pd.DataFrame, dimensions: Sequence[str], measures: Sequence[str]):
+        self.cells = cells
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+
+    @property
+    def rows(self) -> int:
+        """Number of source rows the cube summarises."""
+        return int(self.cells["count"].sum())
+
+    def nunique(self, dimension: str) -> int:
+        """Number of distinct non-missing labels of ``dimension``."""
+        return int(self.cells[dimension].nunique())
+
+    def slice(self, **criteria) -> "Cube":
+        """Cells whose dimensions match ``criteria`` (a label or a list of labels each)."""
+        keep = np.ones(len(self.cells), dtype=bool)
+        for dimension, labels in criteria.items():
+            if dimension not in self.dimensions:
+                raise KeyError(f"Not a cube dimension: {dimension}")
+            if not isinstance(labels, (list, tuple, set, pd.Index, np.ndarray)):
+                labels = [labels]
+            keep &= self.cells[dimension].isin(labels).to_numpy()
+        return Cube(self.cells[keep], self.dimensions, self.measures)
+
+    def _rollup(self, by: Sequence[str], measures: Sequence[str]) -> pd.DataFrame:
+        unknown = [d for d in by if d not in self.dimensions] + [m for m in measures if m not in self.measures]
+        if unknown:
+            raise KeyError(f"Not in the cube: {unknown}")
+        parts = ["count"] + [_column(m, p) for m in measures for p in ("count", "sum", "sumsq")]
+        if not by:
+            return self.cells[parts].agg(["sum"]).reset_index(drop=True)
+        return self.cells.groupby(list(by), observed=True)[parts].sum()
+
+    @staticmethod
+    def _statistic(totals: pd.DataFrame, measure: str, stat: str) -> pd.Series:
+        n = totals[_column(measure, "count")]
+        s = totals[_column(measure, "sum")]
+        if stat == "count":
+            return n
+        if stat == "sum":
+            return s
+        if stat == "mean":
+            return s / n
+        if stat in ("var", "std"):
+            with np.errstate(invalid="ignore", divide="ignore"):
+                var = (totals[_column(measure, "sumsq")] - s.astype(float) ** 2 / n) / (n - 1)
+            var = var.clip(lower=0).where(n > 1)
+            return np.sqrt(var) if stat == "std" else var
+        raise ValueError(f"Unknown cube statistic: {stat!r} (expected one of {STATISTICS})")
+
+    def agg(self, by: str | Sequence[str], spec: Dict[str, str | Sequence[str]]) -> pd.DataFrame:
+        """Roll up to ``by`` and compute ``spec`` as ``groupby(by).agg(spec)`` would.
+
+        ``spec`` maps measures to one statistic or a list of them, from
+        ``STATISTICS``; list values give ``(measure, statistic)`` columns.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        totals = self._rollup(by, list(spec))
+        nested = any(not isinstance(stats, str) for stats in spec.values())
+        columns = {}
+        for measure, stats in spec.items():
+            for stat in ([stats] if isinstance(stats, str) else stats):
+                key = (measure, stat) if nested else measure
+                columns[key] = self._statistic(totals, measure, stat)
+        return pd.DataFrame(columns, index=totals.index)
+
+    def sum(self, by: str | Sequence[str], measure: str) -> pd.Series:
+        return self.agg(by, {measure: "sum"})[measure]
+
+    def mean(self, by: str | Sequence[str], measure: str) -> pd.Series:
+        return self.agg(by, {measure: "mean"})[measure]
+
+    def count(self, by: str | Sequence[str]) -> pd.Series:
+        """Source rows per group."""
+        by = [by] if isinstance(by, str) else list(by)
+        return self._rollup(by, [])["count"]
+
+
+def build_cube(df: pd.DataFrame, dimensions: Sequence[str] = DIMENSIONS,
+               measures: Sequence[str] = MEASURES) -> Cube:
+    """Aggregate ``df`` to one cell per observed combination of ``dimensions``."""
+    values = df[list(measures)]
+    parts = {"count": pd.Series(1, index=df.index, dtype="int64")}
+    for m in measures:
+        parts[_column(m, "count")] = values[m].notna().astype("int64")
+        # Integer sums in int64 so coarse roll-ups of narrow columns cannot overflow
+        parts[_column(m, "sum")] = values[m].astype("int64" if pd.api.types.is_integer_dtype(values[m]) else float)
+        parts[_column(m, "sumsq")] = values[m].astype(float) ** 2
+    frame = pd.DataFrame(parts).join(df[list(dimensions)])
+    # Missing labels form their own cells so no row is lost to coarser roll-ups
+    cells = frame.groupby(list(dimensions), observed=True, dropna=False).sum().reset_index()
+    return Cube(cells, dimensions, measures)
+
+
+def _fingerprint(dimensions: Sequence[str], measures: Sequence[str]) -> str:
+    spec = {"version": CUBE_VERSION, "dimensions": list(dimensions), "measures": list(measures)}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+def cube_path(key: str, dimensions: Sequence[str], measures: Sequence[str]):
+    return cache_dir() / f"crop_yield-{key[:20]}.cube-{_fingerprint(dimensions, measures)[:12]}{FRAME_SUFFIX}"
+
+
+def load_cube(path: str | os.PathLike, dimensions: Sequence[str] = DIMENSIONS,
+              measures: Sequence[str] = MEASURES) -> Cube:
+    """The cube of the CSV at ``path``, built and persisted on first use."""
+    target = cube_path(source_key(path), dimensions, measures)
+    if not target.exists():
+        cube = build_cube(load_cached(path, list(dimensions) + list(measures)), dimensions, measures)
+        _write_frame(cube.cells, target)
+    columns = list(dimensions) + ["count"] + [_column(m, p) for m in measures for p in ("count", "sum", "sumsq")]
+    return Cube(_read_frame(target, columns), dimensions, measures)
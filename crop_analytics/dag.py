@@ -0,0 +1,146 @@
+"""Run analysis steps as a dependency graph on a process pool.
+
+The data frame is loaded once in the parent and handed to each worker a
+single time through the pool initializer (inherited without copying where
+the platform forks). Each node is a top-level function called as
+``func(df, *dependency_results)``; its return value is passed on to the
+nodes that depend on it, and whatever it prints is captured and replayed in
+completion order so concurrent output never interleaves.
+"""
+
+import contextlib
+import io
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Sequence
+
+import pandas as pd
+
+from . import figcache
+
+
+_WORKER_FRAME: pd.DataFrame | None = None
+
+
+class Node:
+    """One step of the graph: ``func`` runs after every node named in ``deps``."""
+
+    def __init__(self, name: str, func: Callable, deps: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+
+
+class NodeResult:
+    def __init__(self, name: str, value: Any = None, output: str = "", seconds: float = 0.0,
+                 error: str | None = None, pid: int | None = None, figures: Counter | None = None):
+        self.name = name
+        self.value = value
+        self.output = output
+        self.seconds = seconds
+        self.error = error
+        self.pid = pid
+        # Figure cache hits and misses of this node
+        self.figures = figures or Counter()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _init_worker(frame: pd.DataFrame) -> None:
+    global _WORKER_FRAME
+    _WORKER_FRAME = frame
+    # Workers only write image files
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _run_node(name: str, func: Callable, dep_values: List[Any]) -> NodeResult:
+    buffer = io.StringIO()
+    figures_before = Counter(figcache.STATS)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            value = func(_WORKER_FRAME, *dep_values)
+        error = None
+    except Exception as e:
+        value, error = None, f"{type(e).__name__}: {e}"
+    return NodeResult(name, value, buffer.getvalue(), time.perf_counter() - start, error, os.getpid(),
+                      figcache.STATS - figures_before)
+
+
+def _check_graph(nodes: Sequence[Node]) -> None:
+    names = [n.name for n in nodes]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate node names in graph")
+    known = set(names)
+    for node in nodes:
+        missing = [d for d in node.deps if d not in known]
+        if missing:
+            raise ValueError(f"Node {node.name!r} depends on unknown nodes {missing}")
+    # Kahn's algorithm: every node must become ready eventually
+    remaining = {n.name: set(n.deps) for n in nodes}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle among {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_dag(
+    nodes: Sequence[Node],
+    df: pd.DataFrame,
+    max_workers: int | None = None,
+    on_complete: Callable[[NodeResult], None] | None = None,
+) -> Dict[str, NodeResult]:
+    """Run ``nodes`` concurrently in dependency order.
+
+    A node whose dependency failed is skipped and reported with an error.
+    ``on_complete`` is called in the parent as each node finishes.
+    """
+    _check_graph(nodes)
+    by_name = {n.name: n for n in nodes}
+    results: Dict[str, NodeResult] = {}
+    pending = {n.name for n in nodes}
+    running = {}
+
+    def finish(result: NodeResult) -> None:
+        results[result.name] = result
+        if on_complete:
+            on_complete(result)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(df,)) as pool:
+        while pending or running:
+            for name in sorted(pending):
+                node = by_name[name]
+                if not all(d in results for d in node.deps):
+                    continue
+                pending.discard(name)
+                failed = [d for d in node.deps if not results[d].ok]
+                if failed:
+                    finish(NodeResult(name, error=f"skipped, dependency failed: {', '.join(failed)}"))
+                    continue
+                future = pool.submit(_run_node, name, node.func, [results[d].value for d in node.deps])
+                running[future] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                finish(future.result())
+    return results
+
+
+def timing_report(results: Dict[str, NodeResult]) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {"node": r.name, "seconds": round(r.seconds, 3), "pid": r.pid, "status": "ok" if r.ok else r.error}
+            for r in results.values()
+        ]
+    ).set_index("node")
@@ -0,0 +1,16 @@
+"""Integer group codes for categorical columns."""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def group_codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Return ``(codes, labels)`` for the observed values of ``values``.
+
+    Labels follow the column's sort order (category order for categoricals),
+    which is also the order ``groupby`` uses. Missing values get code -1.
+    """
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes.astype(np.intp, copy=False), pd.Index(uniques, name=values.name)
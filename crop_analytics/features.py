@@ -0,0 +1,121 @@
+"""Registry of derived columns, computed lazily and cached next to the base data.
+
+Each derived column declares the source columns it reads and the parameters
+(bin edges, labels) that shape it. The first request for a column against a
+given CSV computes it from just those inputs and writes it beside the cached
+base frame; later requests read it back. The file name carries the CSV
+content hash and a fingerprint of the definition, its function's source
+included, so editing the data, a bin edge or the function picks up a fresh
+entry instead of a stale one.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from typing import Callable, Dict, Sequence
+
+import pandas as pd
+
+from .cache import _read_frame, _write_frame, cache_dir, load_cached, source_key, FRAME_SUFFIX
+
+
+FEATURE_VERSION = 1
+
+
+def _source(func: Callable) -> str:
+    """The source of ``func``, or its bytecode and constants when the source is unavailable."""
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, "__code__", None)
+        if code is None:
+            return repr(func)
+        return hashlib.sha256(code.co_code + repr(code.co_consts).encode()).hexdigest()
+
+
+class DerivedColumn:
+    """A column computed as ``func(inputs_frame, **params)``."""
+
+    def __init__(self, name: str, inputs: Sequence[str], func: Callable[..., pd.Series], params: Dict | None = None):
+        self.name = name
+        self.inputs = list(inputs)
+        self.func = func
+        self.params = dict(params or {})
+
+    def fingerprint(self) -> str:
+        spec = {
+            "version": FEATURE_VERSION,
+            "name": self.name,
+            "inputs": self.inputs,
+            "func": f"{self.func.__module__}.{self.func.__qualname__}",
+            "source": _source(self.func),
+            "params": self.params,
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+
+    def compute(self, frame: pd.DataFrame) -> pd.Series:
+        return self.func(frame[self.inputs], **self.params).rename(self.name)
+
+
+REGISTRY: Dict[str, DerivedColumn] = {}
+
+
+def register(name: str, inputs: Sequence[str], func: Callable[..., pd.Series], **params) -> DerivedColumn:
+    """Add (or replace) the definition of ``name``."""
+    REGISTRY[name] = DerivedColumn(name, inputs, func, params)
+    return REGISTRY[name]
+
+
+def _cut(frame: pd.DataFrame, bins, labels) -> pd.Series:
+    return pd.cut(frame.iloc[:, 0], bins=bins, labels=labels)
+
+
+def _ratio(frame: pd.DataFrame) -> pd.Series:
+    return frame.iloc[:, 0] / frame.iloc[:, 1]
+
+
+def register_cut(name: str, source: str, bins: Sequence[float], labels: Sequence[str]) -> DerivedColumn:
+    """Register ``pd.cut(source, bins, labels)`` as ``name``."""
+    return register(name, [source], _cut, bins=list(bins), labels=list(labels))
+
+
+register_cut("Yield_Category", "Yield_per_Hectare", [0, 3, 5, 8], ["Low", "Medium", "High"])
+register_cut("Revenue_Category", "Total_Revenue", [0, 50000000, 150000000, 500000000], ["Low", "Medium", "High"])
+register_cut("Area_Category", "Area_Hectares", [0, 100000, 200000, 400000], ["Small", "Medium", "Large"])
+register("Yield_per_Hectare_calc", ["Yield_Tonnes", "Area_Hectares"], _ratio)
+
+
+def feature_path(key: str, column: DerivedColumn):
+    return cache_dir() / f"crop_yield-{key[:20]}.{column.name}-{column.fingerprint()[:12]}{FRAME_SUFFIX}"
+
+
+def load_feature(path: str | os.PathLike, name: str) -> pd.Series:
+    """``name`` for the CSV at ``path``, computed and persisted on first use."""
+    column = REGISTRY[name]
+    target = feature_path(source_key(path), column)
+    if not target.exists():
+        values = column.compute(load_cached(path, column.inputs))
+        _write_frame(values.to_frame(), target)
+    return _read_frame(target, [name])[name]
+
+
+def add_derived(df: pd.DataFrame, names: Sequence[str], path: str | os.PathLike | None = None) -> pd.DataFrame:
+    """A copy of ``df`` with the derived columns ``names`` appended.
+
+    With ``path`` the columns come from the feature cache for that CSV (``df``
+    must then hold its rows in file order, as ``load_crop_data`` returns them);
+    without it they are computed from ``df`` itself.
+    """
+    unknown = [n for n in names if n not in REGISTRY]
+    if unknown:
+        raise KeyError(f"Unknown derived columns: {unknown}")
+    derived = {}
+    for name in names:
+        if path is not None:
+            values = load_feature(path, name)
+            values.index = df.index
+        else:
+            values = REGISTRY[name].compute(df)
+        derived[name] = values
+    return df.assign(**derived)
@@ -0,0 +1,197 @@
+"""Content-addressed cache for saved figures.
+
+``cached_savefig`` stands in for ``plt.savefig``. It hashes what the image
+depends on: the data passed as ``inputs``, the ``savefig`` arguments, the
+source of the calling script and of this package, the matplotlib and
+seaborn versions, and the rcParams in effect (which carry any style, theme or
+palette set with ``plt.style.use`` or ``sns.set_theme``). If an image with
+that hash was rendered before, it is copied to the target path and
+rasterisation is skipped; otherwise the figure is saved and a copy is kept
+under the hash. Set ``FIGURE_CACHE=0`` to always render.
+
+The stored images are kept under ``FIGURE_CACHE_MB`` megabytes (default
+512). Past that, the least recently used ones are removed after each store.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Sequence
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from .cache import cache_dir
+
+try:
+    import seaborn
+    SEABORN_VERSION = seaborn.__version__
+except ImportError:
+    SEABORN_VERSION = None
+
+
+FIGCACHE_VERSION = 2
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+# rcParams that choose where or how figures are shown, not how they look
+_DISPLAY_PARAMS = ("backend", "backend_fallback", "interactive", "savefig.directory", "toolbar", "webagg.")
+
+# Hits and misses in this process
+STATS: Counter = Counter()
+
+
+def enabled() -> bool:
+    return os.getenv("FIGURE_CACHE", "1") != "0"
+
+
+def max_bytes() -> int:
+    return int(float(os.getenv("FIGURE_CACHE_MB", "512")) * (1 << 20))
+
+
+def _update(h, obj: Any) -> None:
+    """Feed a stable encoding of ``obj`` into the hash ``h``."""
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"frame")
+        _update(h, [str(c) for c in obj.columns])
+        _update(h, [str(t) for t in obj.dtypes])
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        _update(h, obj.to_frame(name=str(obj.name)))
+    elif isinstance(obj, pd.Index):
+        _update(h, obj.to_frame(index=False, name=[str(n) for n in obj.names]))
+    elif isinstance(obj, np.ndarray):
+        h.update(f"array{obj.dtype}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes() if obj.dtype != object else repr(obj.tolist()).encode())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _update(h, item)
+    elif isinstance(obj, dict):
+        h.update(f"dict{len(obj)}".encode())
+        for key in sorted(obj, key=repr):
+            _update(h, key)
+            _update(h, obj[key])
+    elif isinstance(obj, (str, bytes, int, float, bool, type(None), np.generic)):
+        h.update(f"{type(obj).__name__}:{obj!r}".encode())
+    elif hasattr(obj, "__dict__"):
+        # Result objects (correlations, fits, tables) hash by their state
+        h.update(f"{type(obj).__module__}.{type(obj).__qualname__}".encode())
+        _update(h, vars(obj))
+    else:
+        h.update(repr(obj).encode())
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path: str, mtime_ns: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _code_digest(script: str) -> str:
+    """The calling script and every module of this package."""
+    files = sorted(PACKAGE_DIR.glob("*.py"))
+    if os.path.exists(script):
+        files.append(Path(script))
+    h = hashlib.sha256()
+    for f in files:
+        h.update(_file_digest(str(f), f.stat().st_mtime_ns).encode())
+    return h.hexdigest()
+
+
+def _style_digest() -> str:
+    """The rcParams that affect rendering, as set by styles, themes and palettes."""
+    h = hashlib.sha256()
+    for key, value in sorted(matplotlib.rcParams.items()):
+        if not key.startswith(_DISPLAY_PARAMS):
+            h.update(f"{key}={value!r}\n".encode())
+    return h.hexdigest()
+
+
+def figure_key(inputs: Sequence[Any], savefig_kwargs: dict, script: str, suffix: str) -> str:
+    h = hashlib.sha256()
+    _update(h, [FIGCACHE_VERSION, matplotlib.__version__, SEABORN_VERSION, suffix, _code_digest(script),
+                _style_digest()])
+    _update(h, list(inputs))
+    _update(h, savefig_kwargs)
+    return h.hexdigest()
+
+
+def figure_path(key: str, suffix: str) -> Path:
+    return cache_dir() / "figures" / f"{key[:32]}{suffix}"
+
+
+def _copy(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _evict(limit: int) -> None:
+    """Remove the least recently used stored images until they total at most ``limit`` bytes."""
+    entries = []
+    for f in (cache_dir() / "figures").glob("*"):
+        # Copies still being written belong to other processes
+        if f.suffix == ".tmp":
+            continue
+        try:
+            stat = f.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, f))
+    total = sum(size for _, size, _ in entries)
+    for _, size, f in sorted(entries, key=lambda e: e[0]):
+        if total <= limit:
+            return
+        f.unlink(missing_ok=True)
+        total -= size
+
+
+def cached_savefig(path: str | os.PathLike, inputs: Sequence[Any] = (), fig=None, **kwargs) -> bool:
+    """Save ``fig`` (default: the current figure) to ``path`` unless an identical image is cached.
+
+    ``inputs`` must cover everything the figure was drawn from that the
+    calling script's source does not already fix. Returns True on a cache hit.
+    """
+    path = Path(path)
+    if not enabled():
+        (fig or plt.gcf()).savefig(path, **kwargs)
+        return False
+    script = sys._getframe(1).f_code.co_filename
+    key = figure_key(inputs, kwargs, script, path.suffix)
+    stored = figure_path(key, path.suffix)
+    try:
+        _copy(stored, path)
+        # A hit counts as a use, so eviction keeps images that are still wanted
+        os.utime(stored)
+    except FileNotFoundError:
+        # Never stored, or evicted by another process meanwhile
+        pass
+    else:
+        STATS["hits"] += 1
+        return True
+    (fig or plt.gcf()).savefig(path, **kwargs)
+    _copy(path, stored)
+    _evict(max_bytes())
+    STATS["misses"] += 1
+    return False
+
+
+def report(stats: Counter | None = None) -> str:
+    """One-line hit/miss summary of ``stats`` (default: this process)."""
+    stats = STATS if stats is None else stats
+    hits, misses = stats["hits"], stats["misses"]
+    total = hits + misses
+    rate = f" ({hits / total:.0%} reused)" if total else ""
+    return f"Figure cache: {hits} hits, {misses} misses{rate}"
@@ -0,0 +1,167 @@
+"""Graphs held as edge arrays, built straight from frames and matrices.
+
+An ``EdgeGraph`` is a node index plus parallel ``src``/``dst``/``weight``
+arrays (and optional per-edge and per-node attribute arrays). Builders go
+from grouped frames (``bipartite_edges``, via integer codes) and square
+matrices (``matrix_edges``, via an upper-triangle mask) to those arrays
+without touching Python objects per edge. Analytics use the arrays or the
+symmetric CSR form; a networkx graph is only materialised, once, by
+``to_networkx`` when a drawing or an algorithm needs one. ``edge_arrays``
+gives the directed edge arrays of either kind of graph, which is what the
+centrality and layout modules consume.
+"""
+
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .encoding import group_codes
+
+
+class EdgeGraph:
+    """Undirected graph on ``nodes`` with edges ``(nodes[src[e]], nodes[dst[e]])``."""
+
+    def __init__(self, nodes: Sequence[Hashable], src: np.ndarray, dst: np.ndarray,
+                 weight: np.ndarray | None = None, edge_attrs: Dict[str, np.ndarray] | None = None,
+                 node_attrs: Dict[str, np.ndarray] | None = None):
+        self.nodes = pd.Index(nodes)
+        self.src = np.asarray(src, dtype=np.intp)
+        self.dst = np.asarray(dst, dtype=np.intp)
+        self.weight = np.ones(len(self.src)) if weight is None else np.asarray(weight, dtype=float)
+        self.edge_attrs = dict(edge_attrs or {})
+        self.node_attrs = dict(node_attrs or {})
+        self._csr = None
+        self._nx = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.src)
+
+    def is_directed(self) -> bool:
+        return False
+
+    def edge_list(self) -> List[Tuple[Hashable, Hashable]]:
+        """Edges as label pairs, in edge-array order (for ``draw_networkx_edges(edgelist=...)``)."""
+        labels = self.nodes.to_numpy()
+        return list(zip(labels[self.src].tolist(), labels[self.dst].tolist()))
+
+    def nodes_where(self, attr: str, value) -> List[Hashable]:
+        """Labels of the nodes whose ``attr`` equals ``value``."""
+        return self.nodes[np.asarray(self.node_attrs[attr]) == value].tolist()
+
+    def csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(indptr, indices, weights)`` of the symmetric adjacency, built once."""
+        if self._csr is None:
+            n = len(self.nodes)
+            loop = self.src == self.dst
+            src = np.r_[self.src, self.dst[~loop]]
+            dst = np.r_[self.dst, self.src[~loop]]
+            w = np.r_[self.weight, self.weight[~loop]]
+            order = np.lexsort((dst, src))
+            indptr = np.r_[0, np.cumsum(np.bincount(src, minlength=n))]
+            self._csr = (indptr, dst[order], w[order])
+        return self._csr
+
+    def degree(self) -> np.ndarray:
+        """Number of neighbours of every node."""
+        indptr = self.csr()[0]
+        return np.diff(indptr)
+
+    def degree_centrality(self) -> Dict[Hashable, float]:
+        """As ``nx.degree_centrality``: degree over ``n - 1``."""
+        n = len(self.nodes)
+        scale = 1.0 / (n - 1) if n > 1 else 1.0
+        return dict(zip(self.nodes.tolist(), (self.degree() * scale).tolist()))
+
+    def to_networkx(self, weight: str = "weight"):
+        """The same graph as an ``nx.Graph``, materialised on first use and then reused."""
+        if self._nx is None:
+            import networkx as nx
+
+            graph = nx.Graph()
+            labels = self.nodes.tolist()
+            if self.node_attrs:
+                columns = {k: np.asarray(v).tolist() for k, v in self.node_attrs.items()}
+                graph.add_nodes_from((label, {k: v[i] for k, v in columns.items()}) for i, label in enumerate(labels))
+            else:
+                graph.add_nodes_from(labels)
+            edges = zip(*(self.nodes.to_numpy()[a].tolist() for a in (self.src, self.dst)))
+            columns = {weight: self.weight.tolist(), **{k: np.asarray(v).tolist() for k, v in self.edge_attrs.items()}}
+            graph.add_edges_from((u, v, {k: c[e] for k, c in columns.items()}) for e, (u, v) in enumerate(edges))
+            self._nx = graph
+        return self._nx
+
+
+def bipartite_edges(frame: pd.DataFrame, left: str, right: str, weight: str | None = None,
+                    kinds: Tuple[str, str] | None = None) -> EdgeGraph:
+    """Links between the labels of ``left`` and of ``right``, one per observed pair.
+
+    Rows of the same pair are merged with their ``weight`` summed. Nodes are
+    the sorted ``left`` labels followed by the sorted ``right`` labels, with
+    the ``bipartite`` node attribute (0 or 1) networkx uses and, with
+    ``kinds``, a ``kind`` attribute naming each side. A label present on both
+    sides becomes one node in ``to_networkx``.
+    """
+    left_codes, left_labels = group_codes(frame[left])
+    right_codes, right_labels = group_codes(frame[right])
+    keep = (left_codes >= 0) & (right_codes >= 0)
+    n_left, n_right = len(left_labels), len(right_labels)
+    values = np.ones(len(frame)) if weight is None else frame[weight].to_numpy(dtype=float)
+    pairs, inverse = np.unique(left_codes[keep] * n_right + right_codes[keep], return_inverse=True)
+    side = np.r_[np.zeros(n_left, dtype=np.intp), np.ones(n_right, dtype=np.intp)]
+    node_attrs = {"bipartite": side}
+    if kinds is not None:
+        node_attrs["kind"] = np.asarray(kinds, dtype=object)[side]
+    return EdgeGraph(
+        left_labels.append(right_labels),
+        pairs // n_right,
+        n_left + pairs % n_right,
+        np.bincount(inverse, values[keep], len(pairs)),
+        node_attrs=node_attrs,
+    )
+
+
+def matrix_edges(matrix: pd.DataFrame, threshold: float, inclusive: bool = True,
+                 absolute: bool = True) -> EdgeGraph:
+    """Pairs of a square labelled matrix whose value passes ``threshold``, from its upper triangle.
+
+    With ``absolute`` the test and the weight use ``|value|`` and a ``sign``
+    edge attribute (``"pos"``/``"neg"``) keeps the direction, as for a
+    correlation network.
+    """
+    values = matrix.to_numpy(dtype=float)
+    mask = np.triu(np.ones(values.shape, dtype=bool), k=1)
+    strength = np.abs(values) if absolute else values
+    mask &= strength >= threshold if inclusive else strength > threshold
+    src, dst = np.nonzero(mask)
+    attrs = {"sign": np.where(values[src, dst] >= 0, "pos", "neg")} if absolute else {}
+    return EdgeGraph(matrix.index, src, dst, strength[src, dst], edge_attrs=attrs)
+
+
+def edge_arrays(graph, weight: str | None = "weight"):
+    """Nodes and directed ``(src, dst, weight)`` arrays of an ``EdgeGraph`` or networkx graph.
+
+    Undirected edges appear in both directions.
+    """
+    if isinstance(graph, EdgeGraph):
+        nodes = graph.nodes.tolist()
+        src, dst = graph.src, graph.dst
+        w = graph.weight if weight is not None else np.ones(len(src))
+    else:
+        nodes = list(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        if weight is None:
+            edges = [(u, v, 1.0) for u, v in graph.edges()]
+        else:
+            edges = list(graph.edges(data=weight, default=1))
+        src = np.fromiter((index[u] for u, _, _ in edges), dtype=np.intp, count=len(edges))
+        dst = np.fromiter((index[v] for _, v, _ in edges), dtype=np.intp, count=len(edges))
+        w = np.fromiter((d for _, _, d in edges), dtype=float, count=len(edges))
+    if not graph.is_directed():
+        mirror = src != dst
+        src, dst, w = np.r_[src, dst[mirror]], np.r_[dst, src[mirror]], np.r_[w, w[mirror]]
+    return nodes, src, dst, w
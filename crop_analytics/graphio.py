@@ -0,0 +1,214 @@
+"""Streaming export and binary storage of ``EdgeGraph`` networks.
+
+``write_gexf`` and ``write_graphml`` write the XML straight from the edge
+arrays. The header and the nodes go out first, then the edges in chunks of
+``EXPORT_CHUNK``. Only one chunk of formatted lines exists at a time, so
+memory does not grow with the edge count the way it does when
+``nx.write_gexf`` builds the element tree. A path ending in ``.gz`` (or
+``compress=True``) gzips the stream, with a zero timestamp so equal graphs
+give equal files.
+
+``save_edges`` stores the node index, the edge arrays and every attribute
+column in one NumPy ``.npz``. ``load_edges`` turns that file back into an
+``EdgeGraph`` without parsing anything.
+
+Every writer fills a temporary file beside the target and renames it over
+the target once complete.
+"""
+
+import datetime
+import gzip
+import io
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, TextIO, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from .graph import EdgeGraph
+
+
+# Edges formatted and written per chunk
+EXPORT_CHUNK = 1 << 16
+
+# gzip's own default; level 9 costs twice the time for a few percent
+GZIP_LEVEL = 6
+
+# XML attribute types by NumPy dtype kind; anything else is a string
+_XML_TYPES = {"b": "boolean", "i": "long", "u": "long", "f": "double"}
+
+_GEXF_HEADER = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    '<gexf xmlns="http://www.gexf.net/1.2draft" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xsi:schemaLocation="http://www.gexf.net/1.2draft http://www.gexf.net/1.2draft/gexf.xsd" version="1.2">\n'
+)
+_GRAPHML_HEADER = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+    'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+)
+
+
+@contextmanager
+def _replacing(path: str | os.PathLike) -> Iterator[BinaryIO]:
+    """Binary file beside ``path`` that replaces it once written in full."""
+    target = Path(path)
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def _open_text(path: str | os.PathLike, compress: bool | None) -> Iterator[TextIO]:
+    if compress is None:
+        compress = Path(path).suffix == ".gz"
+    with _replacing(path) as raw:
+        stream = raw
+        if compress:
+            stream = gzip.GzipFile(filename="", fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL, mtime=0)
+        with io.TextIOWrapper(stream, encoding="utf-8", newline="\n") as f:
+            yield f
+
+
+def _xml_type(values: np.ndarray) -> str:
+    return _XML_TYPES.get(np.asarray(values).dtype.kind, "string")
+
+
+def _quote(text: str) -> str:
+    return escape(text, {'"': "&quot;"})
+
+
+def _text(values: np.ndarray) -> List[str]:
+    """Values as escaped XML attribute text."""
+    values = np.asarray(values)
+    if values.dtype.kind == "b":
+        return np.where(values, "true", "false").tolist()
+    if values.dtype.kind in "iuf":
+        return [str(v) for v in values.tolist()]
+    return [_quote(str(v)) for v in values.tolist()]
+
+
+def _node_ids(graph: EdgeGraph) -> Tuple[np.ndarray, bool]:
+    """XML ids of the nodes: their labels, or their positions when labels repeat."""
+    if graph.nodes.is_unique:
+        return np.asarray(_text(graph.nodes.to_numpy()), dtype=object), True
+    return np.asarray([str(i) for i in range(len(graph.nodes))], dtype=object), False
+
+
+def _chunks(n: int) -> Iterator[slice]:
+    for start in range(0, n, EXPORT_CHUNK):
+        yield slice(start, min(start + EXPORT_CHUNK, n))
+
+
+def write_gexf(graph: EdgeGraph, path: str | os.PathLike, compress: bool | None = None) -> None:
+    """Write ``graph`` as GEXF 1.2, with weights and node and edge attributes, for Gephi."""
+    ids, _ = _node_ids(graph)
+    labels = _text(graph.nodes.to_numpy())
+    with _open_text(path, compress) as f:
+        f.write(_GEXF_HEADER)
+        f.write(f'  <meta lastmodifieddate="{datetime.date.today().isoformat()}">\n'
+                "    <creator>crop_analytics</creator>\n  </meta>\n")
+        f.write('  <graph defaultedgetype="undirected" mode="static" name="">\n')
+        for kind, attrs in (("node", graph.node_attrs), ("edge", graph.edge_attrs)):
+            if attrs:
+                f.write(f'    <attributes class="{kind}" mode="static">\n')
+                for i, (name, values) in enumerate(attrs.items()):
+                    f.write(f'      <attribute id="{i}" title="{_quote(name)}" '
+                            f'type="{_xml_type(values)}" />\n')
+                f.write("    </attributes>\n")
+        f.write("    <nodes>\n")
+        f.write(_gexf_elements("node", "id label", graph.node_attrs, slice(0, len(ids)), [ids.tolist(), labels]))
+        f.write("    </nodes>\n    <edges>\n")
+        for s in _chunks(graph.n_edges):
+            columns = [ids[graph.src[s]].tolist(), ids[graph.dst[s]].tolist(),
+                       [str(e) for e in range(s.start, s.stop)], _text(graph.weight[s])]
+            f.write(_gexf_elements("edge", "source target id weight", graph.edge_attrs, s, columns))
+        f.write("    </edges>\n  </graph>\n</gexf>\n")
+
+
+def _gexf_elements(tag: str, fields: str, attrs: Dict[str, np.ndarray], s: slice, columns: List[List[str]]) -> str:
+    """``<node>``/``<edge>`` elements of the rows in ``s``, from their field columns and ``attrs``."""
+    head = f"      <{tag} " + " ".join(f'{field}="{{}}"' for field in fields.split())
+    if attrs:
+        values = "".join(f'          <attvalue for="{i}" value="{{}}" />\n' for i in range(len(attrs)))
+        template = head + ">\n        <attvalues>\n" + values + f"        </attvalues>\n      </{tag}>\n"
+    else:
+        template = head + " />\n"
+    rows = columns + [_text(np.asarray(values)[s]) for values in attrs.values()]
+    return "".join(template.format(*row) for row in zip(*rows))
+
+
+def write_graphml(graph: EdgeGraph, path: str | os.PathLike, compress: bool | None = None) -> None:
+    """Write ``graph`` as GraphML, with weights and node and edge attributes as ``<data>`` keys."""
+    ids, labelled = _node_ids(graph)
+    node_attrs = dict(graph.node_attrs)
+    if not labelled:
+        node_attrs = {"label": graph.nodes.to_numpy(), **node_attrs}
+    edge_attrs = {"weight": graph.weight, **graph.edge_attrs}
+    keys = [("node", name, values) for name, values in node_attrs.items()]
+    keys += [("edge", name, values) for name, values in edge_attrs.items()]
+    with _open_text(path, compress) as f:
+        f.write(_GRAPHML_HEADER)
+        for i, (kind, name, values) in enumerate(keys):
+            f.write(f'  <key id="d{i}" for="{kind}" attr.name="{_quote(name)}" '
+                    f'attr.type="{_xml_type(values)}" />\n')
+        f.write('  <graph edgedefault="undirected">\n')
+        f.write(_graphml_elements("node", "id", node_attrs, 0, slice(0, len(ids)), [ids.tolist()]))
+        for s in _chunks(graph.n_edges):
+            columns = [ids[graph.src[s]].tolist(), ids[graph.dst[s]].tolist()]
+            f.write(_graphml_elements("edge", "source target", edge_attrs, len(node_attrs), s, columns))
+        f.write("  </graph>\n</graphml>\n")
+
+
+def _graphml_elements(tag: str, fields: str, attrs: Dict[str, np.ndarray], first_key: int, s: slice,
+                      columns: List[List[str]]) -> str:
+    """``<node>``/``<edge>`` elements of the rows in ``s``, with ``attrs`` as keys from ``d{first_key}``."""
+    head = f"    <{tag} " + " ".join(f'{field}="{{}}"' for field in fields.split())
+    if attrs:
+        data = "".join(f'      <data key="d{first_key + i}">{{}}</data>\n' for i in range(len(attrs)))
+        template = head + ">\n" + data + f"    </{tag}>\n"
+    else:
+        template = head + " />\n"
+    rows = columns + [_text(np.asarray(values)[s]) for values in attrs.values()]
+    return "".join(template.format(*row) for row in zip(*rows))
+
+
+def _storable(values) -> np.ndarray:
+    """``values`` as an array ``np.load`` reads without pickling; object columns become strings."""
+    values = np.asarray(values)
+    return values.astype(str) if values.dtype.kind == "O" else values
+
+
+def save_edges(graph: EdgeGraph, path: str | os.PathLike, compress: bool = False) -> None:
+    """Store ``graph`` as a ``.npz`` of its node index, edge arrays and attribute columns.
+
+    Node labels and attribute values of object dtype are stored as strings.
+    """
+    arrays = {"nodes": _storable(graph.nodes.to_numpy()), "src": graph.src, "dst": graph.dst,
+              "weight": graph.weight}
+    arrays.update({f"node.{name}": _storable(values) for name, values in graph.node_attrs.items()})
+    arrays.update({f"edge.{name}": _storable(values) for name, values in graph.edge_attrs.items()})
+    with _replacing(path) as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+
+
+def load_edges(path: str | os.PathLike) -> EdgeGraph:
+    """The ``EdgeGraph`` stored by ``save_edges``."""
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    return EdgeGraph(
+        arrays.pop("nodes"),
+        arrays.pop("src"),
+        arrays.pop("dst"),
+        arrays.pop("weight"),
+        edge_attrs={k[len("edge."):]: v for k, v in arrays.items() if k.startswith("edge.")},
+        node_attrs={k[len("node."):]: v for k, v in arrays.items() if k.startswith("node.")},
+    )
@@ -0,0 +1,144 @@
+"""One-way ANOVA and Kruskal–Wallis for every categorical x continuous pair.
+
+Rows are sorted once per categorical column, and per-group count, sum,
+sum of squares and rank sum for all continuous columns come from one
+segmented ``np.add.reduceat`` over that order. Both tests then follow in
+closed form for the whole grid and match ``scipy.stats.f_oneway`` and
+``scipy.stats.kruskal`` (including the tie correction).
+"""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from .encoding import group_codes
+
+
+TEST_COLUMNS = ["groups", "n", "f", "f_p", "eta_squared", "h", "h_p"]
+
+
+class GroupMoments:
+    """Per-group sufficient statistics of ``columns`` split by ``by``.
+
+    Arrays are shaped ``(groups, columns)``. Values are centred on each
+    column's overall mean before summing so the sums of squares keep their
+    precision, and ranks are average ranks within the rows that have a group.
+    """
+
+    def __init__(self, by: str, columns: Sequence[str], labels: pd.Index, offset: np.ndarray, count: np.ndarray,
+                 total: np.ndarray, sumsq: np.ndarray, rank_sum: np.ndarray, tie_correction: np.ndarray):
+        self.by = by
+        self.columns = list(columns)
+        self.labels = labels
+        self.offset = offset
+        self.count = count
+        self.sum = total
+        self.sumsq = sumsq
+        self.rank_sum = rank_sum
+        self.tie_correction = tie_correction
+
+    def anova(self) -> pd.DataFrame:
+        """F statistic, p-value and eta squared for every column."""
+        from scipy import special
+
+        n_g, s, ss = self.count, self.sum, self.sumsq
+        n = n_g.sum(axis=0)
+        k = (n_g > 0).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            between = (np.where(n_g > 0, s ** 2 / n_g, 0.0)).sum(axis=0) - s.sum(axis=0) ** 2 / n
+            within = ss.sum(axis=0) - (np.where(n_g > 0, s ** 2 / n_g, 0.0)).sum(axis=0)
+            f = (between / (k - 1)) / (within / (n - k))
+            p = special.fdtrc(k - 1, n - k, f)
+            eta = between / (between + within)
+        return pd.DataFrame({"groups": k, "n": n.astype(int), "f": f, "f_p": p, "eta_squared": eta},
+                            index=pd.Index(self.columns, name="column"))
+
+    def kruskal(self) -> pd.DataFrame:
+        """Tie-corrected Kruskal–Wallis H and p-value for every column."""
+        from scipy import special
+
+        n_g, r = self.count, self.rank_sum
+        n = n_g.sum(axis=0)
+        k = (n_g > 0).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            h = 12.0 / (n * (n + 1)) * np.where(n_g > 0, r ** 2 / n_g, 0.0).sum(axis=0) - 3 * (n + 1)
+            h = h / self.tie_correction
+            p = special.chdtrc(k - 1, h)
+        return pd.DataFrame({"h": h, "h_p": p}, index=pd.Index(self.columns, name="column"))
+
+    def summary(self) -> pd.DataFrame:
+        """Per-group count and mean of every column."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self.sum / self.count + self.offset
+        frame = pd.concat(
+            {"count": pd.DataFrame(self.count, index=self.labels, columns=self.columns),
+             "mean": pd.DataFrame(means, index=self.labels, columns=self.columns)},
+            axis=1,
+        )
+        return frame.swaplevel(axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+
+
+def _segment_sums(values: np.ndarray, order: np.ndarray, starts: np.ndarray,
+                  n_groups: int, present: np.ndarray) -> np.ndarray:
+    out = np.zeros((n_groups, values.shape[1]))
+    if len(order):
+        out[present] = np.add.reduceat(values[order], starts, axis=0)
+    return out
+
+
+def group_moments(df: pd.DataFrame, by: str, columns: Sequence[str]) -> GroupMoments:
+    """Group statistics of ``columns`` by ``by`` from one sort of the group codes.
+
+    Rows with a missing group are dropped; a column with missing values is
+    summarised over its own complete rows.
+    """
+    codes, labels = group_codes(df[by])
+    valid = codes >= 0
+    codes = codes[valid]
+    values = df.loc[valid, list(columns)].to_numpy(dtype=float)
+    n_groups = len(labels)
+
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(order) else np.array([], int)
+    present = sorted_codes[starts]
+
+    mask = ~np.isnan(values)
+    offset = np.nanmean(values, axis=0) if len(values) else np.zeros(values.shape[1])
+    centred = np.where(mask, values - offset, 0.0)
+    ranks = pd.DataFrame(values).rank(method="average").to_numpy()
+    ranks = np.where(mask, ranks, 0.0)
+
+    count = _segment_sums(mask.astype(float), order, starts, n_groups, present)
+    total = _segment_sums(centred, order, starts, n_groups, present)
+    sumsq = _segment_sums(centred ** 2, order, starts, n_groups, present)
+    rank_sum = _segment_sums(ranks, order, starts, n_groups, present)
+
+    tie_correction = np.ones(values.shape[1])
+    for j in range(values.shape[1]):
+        ties = np.unique(values[mask[:, j], j], return_counts=True)[1].astype(float)
+        n = ties.sum()
+        if n > 1:
+            tie_correction[j] = 1.0 - ((ties ** 3 - ties).sum() / (n ** 3 - n))
+
+    return GroupMoments(by, columns, labels, offset, count, total, sumsq, rank_sum, tie_correction)
+
+
+def group_tests(df: pd.DataFrame, categorical: Sequence[str] | None = None,
+                continuous: Sequence[str] | None = None) -> pd.DataFrame:
+    """ANOVA and Kruskal–Wallis for every ``categorical`` x ``continuous`` pair.
+
+    Defaults to every ``category`` column against every numeric column. The
+    result is indexed by ``(by, column)``.
+    """
+    if categorical is None:
+        categorical = df.select_dtypes(include="category").columns
+    if continuous is None:
+        continuous = df.select_dtypes(include="number").columns
+    frames = {}
+    for by in categorical:
+        moments = group_moments(df, by, continuous)
+        frames[by] = moments.anova().join(moments.kruskal())
+    result = pd.concat(frames, names=["by", "column"])
+    return result[TEST_COLUMNS]
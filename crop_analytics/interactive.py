@@ -0,0 +1,174 @@
+"""Interactive Plotly exports whose HTML size does not grow with the row count.
+
+Scatters and lines are drawn with WebGL (``Scattergl``) traces and reduced on
+the Python side before serialisation: a scatter with more than ``max_points``
+points becomes the occupied cells of a 2D grid (marker size grows with rows per
+cell), a line is decimated with Largest-Triangle-Three-Buckets, and a large
+scatterplot matrix becomes one ``bins x bins`` heatmap per panel. Every point
+trace therefore carries at most ``max_points`` points.
+"""
+
+import os
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .splom import splom_histogram
+
+try:
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    HAS_PLOTLY = True
+except Exception:
+    HAS_PLOTLY = False
+
+
+DEFAULT_MAX_POINTS = 10_000
+SPLOM_BINS = 32
+
+
+def _require_plotly() -> None:
+    if not HAS_PLOTLY:
+        raise ImportError("plotly is required for interactive exports")
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    ``x`` must be sorted. The first and last points are always kept; every
+    bucket in between keeps the point spanning the largest triangle with the
+    previously kept point and the mean of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def bin_points(x: np.ndarray, y: np.ndarray, bins: int, x_range=None, y_range=None):
+    """Centres and row counts of the occupied cells of a ``bins x bins`` grid."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    ranges = []
+    for values, given in ((x, x_range), (y, y_range)):
+        lo, hi = given if given is not None else (values.min(), values.max())
+        ranges.append((lo, hi if hi > lo else lo + 1.0))
+    (x0, x1), (y0, y1) = ranges
+    ix = np.clip(((x - x0) / (x1 - x0) * bins).astype(np.intp), 0, bins - 1)
+    iy = np.clip(((y - y0) / (y1 - y0) * bins).astype(np.intp), 0, bins - 1)
+    counts = np.bincount(ix * bins + iy, minlength=bins * bins)
+    cells = np.flatnonzero(counts)
+    cx = x0 + (cells // bins + 0.5) * (x1 - x0) / bins
+    cy = y0 + (cells % bins + 0.5) * (y1 - y0) / bins
+    return cx, cy, counts[cells]
+
+
+def scatter_traces(df: pd.DataFrame, x: str, y: str, by: str | None = None,
+                   max_points: int = DEFAULT_MAX_POINTS, **marker) -> List:
+    """One ``Scattergl`` per class of ``by``, binned on a shared grid when too large."""
+    _require_plotly()
+    groups = [(None, df)] if by is None else list(df.groupby(by, observed=True))
+    binned = any(len(frame) > max_points for _, frame in groups)
+    x_range = (df[x].min(), df[x].max())
+    y_range = (df[y].min(), df[y].max())
+    # Grid side such that no class can exceed max_points occupied cells
+    bins = max(1, int(np.sqrt(max_points)))
+    traces = []
+    for label, frame in groups:
+        name = str(label) if label is not None else y
+        if not binned:
+            traces.append(go.Scattergl(x=frame[x].to_numpy(), y=frame[y].to_numpy(), mode="markers",
+                                       name=name, marker=dict(opacity=0.6, **marker)))
+            continue
+        cx, cy, counts = bin_points(frame[x], frame[y], bins, x_range, y_range)
+        traces.append(go.Scattergl(
+            x=cx, y=cy, mode="markers", name=name, customdata=counts,
+            hovertemplate="%{x}, %{y}<br>%{customdata} rows<extra>" + name + "</extra>",
+            marker=dict(size=4 + 8 * np.log1p(counts) / np.log1p(counts.max()), opacity=0.7, **marker),
+        ))
+    return traces
+
+
+def _positions(index: pd.Index) -> np.ndarray:
+    """Numeric x positions of a sorted index for LTTB.
+
+    Datetime, timedelta and period indexes use their int64 values (so gaps
+    in time stay gaps); any other non-numeric index is taken as evenly spaced.
+    """
+    if isinstance(index, (pd.DatetimeIndex, pd.TimedeltaIndex, pd.PeriodIndex)):
+        return index.asi8.astype(float)
+    if pd.api.types.is_numeric_dtype(index.dtype):
+        return index.to_numpy(dtype=float)
+    return np.arange(len(index), dtype=float)
+
+
+def line_traces(frame: pd.DataFrame, max_points: int = DEFAULT_MAX_POINTS, **line) -> List:
+    """One ``Scattergl`` line per column of ``frame`` against its index, LTTB-decimated."""
+    _require_plotly()
+    traces = []
+    for column in frame.columns:
+        series = frame[column].dropna().sort_index()
+        index = series.index
+        y = series.to_numpy(dtype=float)
+        keep = lttb(_positions(index), y, max_points)
+        x = index[keep]
+        if isinstance(x, pd.PeriodIndex):
+            x = x.to_timestamp()
+        traces.append(go.Scattergl(x=x.to_numpy(), y=y[keep], mode="lines+markers", name=str(column), line=line or None))
+    return traces
+
+
+def splom_figure(df: pd.DataFrame, columns: Sequence[str], max_points: int = DEFAULT_MAX_POINTS,
+                 bins: int = SPLOM_BINS, title: str | None = None):
+    """A scatterplot matrix: WebGL ``Splom`` for small frames, per-panel heatmaps otherwise."""
+    _require_plotly()
+    columns = list(columns)
+    k = len(columns)
+    if len(df) <= max_points:
+        fig = go.Figure(go.Splom(
+            dimensions=[dict(label=c.replace('_', ' '), values=df[c].to_numpy()) for c in columns],
+            marker=dict(size=4, opacity=0.6), showupperhalf=False, diagonal_visible=False,
+        ))
+    else:
+        hist = splom_histogram(df, columns, bins)
+        centres = [(e[:-1] + e[1:]) / 2 for e in hist.edges]
+        fig = make_subplots(k, k, horizontal_spacing=0.01, vertical_spacing=0.01)
+        for i in range(k):
+            for j in range(k):
+                if i == j:
+                    trace = go.Bar(x=centres[i], y=hist.diagonal[i], showlegend=False)
+                else:
+                    counts = hist.panel(i, j)
+                    z = np.where(counts > 0, np.log1p(counts).round(3), np.nan)
+                    trace = go.Heatmap(x=centres[j], y=centres[i], z=z, customdata=counts,
+                                       colorscale="Viridis", showscale=False,
+                                       hovertemplate="%{x}, %{y}<br>%{customdata} rows<extra></extra>")
+                fig.add_trace(trace, row=i + 1, col=j + 1)
+            fig.update_yaxes(title_text=columns[i].replace('_', ' '), row=i + 1, col=1)
+            fig.update_xaxes(title_text=columns[i].replace('_', ' '), row=k, col=i + 1)
+    fig.update_layout(title=title, width=220 * k, height=220 * k)
+    return fig
+
+
+def write_html(fig, path: str | os.PathLike) -> None:
+    """Write ``fig`` with plotly.js loaded from the CDN instead of inlined."""
+    fig.write_html(path, include_plotlyjs="cdn")
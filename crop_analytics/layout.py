@@ -0,0 +1,307 @@
+"""Force-directed layouts for large graphs.
+
+The force model is Fruchterman–Reingold, as in ``nx.spring_layout``. Edges
+pull with ``w * d^2 / k``, every pair of nodes pushes with ``k^2 / d``, and
+each step moves a node by the current temperature along its net force.
+Attraction is one ``bincount`` over the edge arrays. Repulsion is exact for
+up to ``EXACT_NODES`` nodes. Above that it is Barnes–Hut over a k-d tree.
+Each split halves a cell by rank, not by coordinate, so outliers that
+stretch the bounding box cannot crowd the nodes into a few cells, and no
+leaf holds more than ``LEAF_SIZE`` nodes. Every node walks the tree level
+by level, all nodes at once with array operations. A cell small against
+its distance acts through its centroid; an opened leaf acts node by node.
+The work per node grows with the tree depth, so one pass costs about
+O(n log n).
+
+Large graphs are first coarsened by repeated heavy-edge matching. The
+coarsest graph is laid out from seeded random positions, and each finer
+level starts from its parent's position. Layouts are cached under
+``cache_dir()/layouts``. The key is the node labels, the weighted edges and
+the parameters, so restyling a figure reuses its positions.
+``refine_layout`` handles a small change to a laid-out graph. It reruns the
+force model from the old positions and moves only the nodes the change
+touched.
+"""
+
+import hashlib
+import math
+import os
+import tempfile
+from collections import Counter
+from itertools import compress
+from typing import Dict, Hashable, Iterable, Sequence
+
+import numpy as np
+
+from .cache import cache_dir
+from .graph import edge_arrays
+
+
+LAYOUT_VERSION = 2
+
+# Up to this many nodes repulsion is computed for every pair
+EXACT_NODES = 1000
+# Most nodes per leaf of the Barnes–Hut tree
+LEAF_SIZE = 8
+# Cells with radius under THETA times their distance act through their centroid
+THETA = 0.5
+# Coarsening stops at this many nodes
+COARSEST_NODES = 100
+# Rough bound on the (node, cell) pairs one traversal chunk holds
+_MAX_CHUNK_CELLS = 1 << 21
+
+# Centroid terms ("cells") and exact pairs ("pairs") evaluated in this process
+STATS: Counter = Counter()
+
+_MIN_DISTANCE = 0.01
+
+
+def _graph_arrays(graph, weight: str | None):
+    """Nodes in a canonical order and the sorted edge arrays indexing them."""
+    nodes, src, dst, w = edge_arrays(graph, weight)
+    order = sorted(range(len(nodes)), key=lambda i: repr(nodes[i]))
+    rank = np.empty(len(nodes), dtype=np.intp)
+    rank[order] = np.arange(len(nodes))
+    src, dst = rank[src], rank[dst]
+    keep = src != dst
+    src, dst, w = src[keep], dst[keep], w[keep]
+    edges = np.lexsort((dst, src))
+    return [nodes[i] for i in order], src[edges], dst[edges], w[edges]
+
+
+def _pair_forces(pos: np.ndarray, i: np.ndarray, j: np.ndarray, k: float) -> np.ndarray:
+    delta = pos[i] - pos[j]
+    dist2 = np.maximum((delta ** 2).sum(axis=1), _MIN_DISTANCE ** 2)
+    return delta * (k * k / dist2)[:, None]
+
+
+def _accumulate(n: int, i: np.ndarray, forces: np.ndarray) -> np.ndarray:
+    return np.column_stack([np.bincount(i, forces[:, 0], n), np.bincount(i, forces[:, 1], n)])
+
+
+def _repulsion_exact(pos: np.ndarray, k: float) -> np.ndarray:
+    delta = pos[:, None, :] - pos[None, :, :]
+    dist2 = np.maximum((delta ** 2).sum(axis=2), _MIN_DISTANCE ** 2)
+    return np.einsum("ijk,ij->ik", delta, k * k / dist2)
+
+
+def _build_tree(pos: np.ndarray, leaf_size: int):
+    """Balanced k-d tree over ``pos``: the node order and, per level, segment bounds, masses, centroids, radii.
+
+    Every split halves a segment by rank along its wider side, so leaves
+    hold at most ``leaf_size`` nodes however the positions spread.
+    """
+    n = len(pos)
+    depth = min(max(0, math.ceil(math.log2(max(n / leaf_size, 1.0)))), int(math.log2(n)))
+    order = np.arange(n)
+    for level in range(depth):
+        bounds = (np.arange((1 << level) + 1) * n) >> level
+        sizes = np.diff(bounds)
+        p = pos[order]
+        spread = np.maximum.reduceat(p, bounds[:-1]) - np.minimum.reduceat(p, bounds[:-1])
+        axis = np.repeat((spread[:, 1] > spread[:, 0]).astype(np.intp), sizes)
+        order = order[np.lexsort((p[np.arange(n), axis], np.repeat(np.arange(1 << level), sizes)))]
+    p = pos[order]
+    levels = []
+    for level in range(depth + 1):
+        bounds = (np.arange((1 << level) + 1) * n) >> level
+        mass = np.diff(bounds).astype(float)
+        centroid = np.add.reduceat(p, bounds[:-1]) / mass[:, None]
+        offset = p - np.repeat(centroid, np.diff(bounds), axis=0)
+        radius = np.sqrt(np.maximum.reduceat((offset ** 2).sum(axis=1), bounds[:-1]))
+        levels.append((bounds, mass, centroid, radius))
+    return order, levels
+
+
+def _repulsion_tree(pos: np.ndarray, k: float, leaf_size: int, theta: float = THETA) -> np.ndarray:
+    """Barnes–Hut repulsion over the tree of ``_build_tree``.
+
+    A cell acts through its centroid when its radius is under ``theta``
+    times its distance, or when it lies within ``_MIN_DISTANCE`` of the
+    node, where the clamped force is linear and the centroid is exact.
+    Otherwise it is opened; an opened leaf acts node by node.
+    """
+    n = len(pos)
+    order, levels = _build_tree(pos, leaf_size)
+    disp = np.zeros_like(pos)
+    rows = max(1, _MAX_CHUNK_CELLS // (64 * leaf_size))
+    for start in range(0, n, rows):
+        i = np.arange(start, min(start + rows, n))
+        cell = np.zeros(len(i), dtype=np.intp)
+        for level, (bounds, mass, centroid, radius) in enumerate(levels):
+            delta = pos[i] - centroid[cell]
+            dist2 = (delta ** 2).sum(axis=1)
+            dist, r = np.sqrt(dist2), radius[cell]
+            far = (r < theta * dist) | (dist + r < _MIN_DISTANCE)
+            f = mass[cell[far]] * k * k / np.maximum(dist2[far], _MIN_DISTANCE ** 2)
+            disp += _accumulate(n, i[far], delta[far] * f[:, None])
+            STATS["cells"] += int(far.sum())
+            i, cell = i[~far], cell[~far]
+            if level + 1 < len(levels):
+                i, cell = np.repeat(i, 2), (2 * np.repeat(cell, 2) + np.tile([0, 1], len(cell)))
+        # Opened leaves act node by node
+        c = bounds[cell + 1] - bounds[cell]
+        ii = np.repeat(i, c)
+        jj = order[np.repeat(bounds[cell], c) + np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c)]
+        keep = ii != jj
+        disp += _accumulate(n, ii[keep], _pair_forces(pos, ii[keep], jj[keep], k))
+        STATS["pairs"] += int(keep.sum())
+    return disp
+
+
+def _fruchterman_reingold(pos: np.ndarray, src: np.ndarray, dst: np.ndarray, w: np.ndarray,
+                          iterations: int, temperature: float, leaf_size: int,
+                          threshold: float = 1e-4, fixed: np.ndarray | None = None) -> np.ndarray:
+    n = len(pos)
+    k = math.sqrt(1.0 / n)
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if n <= EXACT_NODES:
+            disp = _repulsion_exact(pos, k)
+        else:
+            disp = _repulsion_tree(pos, k, leaf_size)
+        delta = pos[src] - pos[dst]
+        dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), _MIN_DISTANCE)
+        disp -= _accumulate(n, src, delta * (w * dist / k)[:, None])
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), _MIN_DISTANCE)
+        step = disp * (temperature / length)[:, None]
+        if fixed is not None:
+            step[fixed] = 0.0
+        pos = pos + step
+        temperature -= cooling
+        if np.linalg.norm(step) / n < threshold:
+            break
+    return pos
+
+
+def _coarsen(n: int, src: np.ndarray, dst: np.ndarray, w: np.ndarray, rng: np.random.Generator,
+             rounds: int = 4):
+    """Merge mutually heaviest neighbours; node -> coarse node map and the coarse edges."""
+    # A random order among equally heavy edges, the same in both directions,
+    # so uniform weights do not leave every node pointing the same way
+    _, pair = np.unique(np.minimum(src, dst) * n + np.maximum(src, dst), return_inverse=True)
+    tiebreak = rng.random(int(pair.max()) + 1 if len(pair) else 0)[pair]
+    match = np.full(n, -1, dtype=np.intp)
+    for _ in range(rounds):
+        free = match < 0
+        e = free[src] & free[dst]
+        if not e.any():
+            break
+        s, d = src[e], dst[e]
+        # Each free node's heaviest free neighbour
+        order = np.lexsort((-tiebreak[e], -w[e], s))
+        s, d = s[order], d[order]
+        first = np.r_[True, s[1:] != s[:-1]]
+        best = np.full(n, -1, dtype=np.intp)
+        best[s[first]] = d[first]
+        mutual = (best >= 0) & (best[np.maximum(best, 0)] == np.arange(n))
+        match[mutual] = best[mutual]
+    root = np.where(match >= 0, np.minimum(np.arange(n), match), np.arange(n))
+    _, groups = np.unique(root, return_inverse=True)
+    n_coarse = int(groups.max()) + 1 if n else 0
+    gs, gd = groups[src], groups[dst]
+    keep = gs != gd
+    codes, inverse = np.unique(gs[keep] * n_coarse + gd[keep], return_inverse=True)
+    return groups, n_coarse, codes // n_coarse, codes % n_coarse, np.bincount(inverse, w[keep])
+
+
+def _multilevel(n: int, src: np.ndarray, dst: np.ndarray, w: np.ndarray, seed: int,
+                iterations: int, leaf_size: int, coarsest: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    levels = [(n, src, dst, w, None)]
+    while levels[-1][0] > coarsest:
+        size, s, d, ww, _ = levels[-1]
+        groups, n_coarse, cs, cd, cw = _coarsen(size, s, d, ww, rng)
+        if n_coarse > 0.9 * size:
+            break
+        levels.append((n_coarse, cs, cd, cw, groups))
+    size, s, d, ww, groups = levels[-1]
+    pos = _fruchterman_reingold(rng.random((size, 2)), s, d, ww, iterations, 0.1, leaf_size)
+    for finer in reversed(levels[:-1]):
+        # Children start at their parent and may move about one parent spacing
+        spacing = math.sqrt(1.0 / size)
+        size, s, d, ww, child_groups = finer
+        pos = pos[groups] + rng.normal(scale=0.1 * math.sqrt(1.0 / size), size=(size, 2))
+        pos = _fruchterman_reingold(pos, s, d, ww, iterations, spacing, leaf_size)
+        groups = child_groups
+    return pos
+
+
+def _rescale(pos: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Centre on the origin and scale the largest coordinate to ``scale``, as networkx does."""
+    pos = pos - pos.mean(axis=0)
+    lim = np.abs(pos).max()
+    return pos * (scale / lim) if lim > 0 else pos
+
+
+def layout_key(nodes, src: np.ndarray, dst: np.ndarray, w: np.ndarray, params: dict) -> str:
+    h = hashlib.sha256()
+    h.update(repr((LAYOUT_VERSION, sorted(params.items()), [repr(v) for v in nodes])).encode())
+    for array in (src, dst, w):
+        h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()
+
+
+def layout_path(key: str):
+    return cache_dir() / "layouts" / f"{key[:32]}.npy"
+
+
+def _save(pos: np.ndarray, target) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, pos)
+    os.replace(tmp, target)
+
+
+def force_layout(graph, weight: str | None = "weight", seed: int = 0, iterations: int = 50,
+                 scale: float = 1.0, leaf_size: int = LEAF_SIZE, coarsest: int = COARSEST_NODES,
+                 cache: bool = True) -> Dict[Hashable, np.ndarray]:
+    """Node positions of ``graph``, a drop-in for ``nx.spring_layout(graph, seed=..., weight=...)``.
+
+    Positions depend only on the node labels, the weighted edges and the
+    arguments, never on insertion order.
+    """
+    nodes, src, dst, w = _graph_arrays(graph, weight)
+    n = len(nodes)
+    if n <= 1:
+        return {node: np.zeros(2) for node in nodes}
+    params = dict(seed=seed, iterations=iterations, scale=scale, leaf_size=leaf_size, coarsest=coarsest)
+    target = layout_path(layout_key(nodes, src, dst, w, params)) if cache else None
+    if target is not None and target.exists():
+        pos = np.load(target)
+    else:
+        pos = _rescale(_multilevel(n, src, dst, w, seed, iterations, leaf_size, coarsest), scale)
+        if target is not None:
+            _save(pos, target)
+    return dict(zip(nodes, pos))
+
+
+def refine_layout(graph, pos: Dict[Hashable, Sequence[float]], moved: Iterable[Hashable],
+                  weight: str | None = "weight", seed: int = 0, iterations: int = 50,
+                  scale: float = 1.0, leaf_size: int = LEAF_SIZE) -> Dict[Hashable, np.ndarray]:
+    """Positions after a local change to ``graph``: only ``moved`` nodes settle, from ``pos``.
+
+    Nodes missing from ``pos`` start at the mean of their placed neighbours
+    and move too. Every other node keeps its position exactly. ``pos`` is
+    taken to come from ``force_layout`` with the same ``scale``.
+    """
+    nodes, src, dst, w = _graph_arrays(graph, weight)
+    n = len(nodes)
+    moved = set(moved)
+    placed = np.array([node in pos for node in nodes], dtype=bool)
+    free = ~placed | np.array([node in moved for node in nodes], dtype=bool)
+    if n <= 1 or not free.any():
+        return {node: np.asarray(pos[node], dtype=float) if node in pos else np.zeros(2) for node in nodes}
+    # Back to the unit box the force model works in
+    start = np.zeros((n, 2))
+    start[placed] = [np.asarray(pos[node], dtype=float) / (2.0 * scale) for node in compress(nodes, placed)]
+    # New nodes start at the mean of their placed neighbours, or anywhere in the box
+    rng = np.random.default_rng(seed)
+    lo, hi = (start[placed].min(axis=0), start[placed].max(axis=0)) if placed.any() else (0.0, 1.0)
+    known = placed[src]
+    count = np.bincount(dst[known], minlength=n)[:, None]
+    mean = _accumulate(n, dst[known], start[src[known]]) / np.maximum(count, 1)
+    start[~placed] = np.where(count > 0, mean, rng.uniform(lo, hi, size=(n, 2)))[~placed]
+    result = _fruchterman_reingold(start, src, dst, w, iterations, 0.1, leaf_size, fixed=~free)
+    return dict(zip(nodes, result * (2.0 * scale)))
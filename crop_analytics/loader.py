@@ -0,0 +1,165 @@
+"""Schema-typed loader for agriculture_crop_yield.csv."""
+
+import os
+from typing import Dict, Iterator, List, Sequence
+
+import pandas as pd
+
+
+DEFAULT_CSV = "agriculture_crop_yield.csv"
+
+CATEGORICAL_COLUMNS: List[str] = [
+    "State",
+    "Crop_Type",
+    "Season",
+    "Climate_Zone",
+    "Soil_Type",
+    "Irrigation_Type",
+    "Pest_Infestation_Level",
+    "Disease_Incidence",
+]
+
+INTEGER_COLUMNS: List[str] = [
+    "Year",
+    "Area_Hectares",
+    "Yield_Tonnes",
+    "Fertilizer_Usage_kg",
+    "Precipitation_mm",
+    "Market_Price_per_Tonne",
+    "Total_Revenue",
+]
+
+FLOAT_COLUMNS: List[str] = [
+    "Yield_per_Hectare",
+    "Temperature_Celsius",
+    "Storage_Loss_Percentage",
+]
+
+DATE_COLUMNS: List[str] = ["Harvest_Date"]
+
+# The nine measures every task treats as continuous (Year is numeric but not a measure)
+CONTINUOUS_COLUMNS: List[str] = [
+    "Area_Hectares",
+    "Yield_Tonnes",
+    "Yield_per_Hectare",
+    "Fertilizer_Usage_kg",
+    "Precipitation_mm",
+    "Temperature_Celsius",
+    "Storage_Loss_Percentage",
+    "Market_Price_per_Tonne",
+    "Total_Revenue",
+]
+
+# Column order as it appears in the CSV
+COLUMNS: List[str] = [
+    "Year",
+    "State",
+    "Crop_Type",
+    "Area_Hectares",
+    "Yield_Tonnes",
+    "Yield_per_Hectare",
+    "Season",
+    "Climate_Zone",
+    "Soil_Type",
+    "Irrigation_Type",
+    "Fertilizer_Usage_kg",
+    "Precipitation_mm",
+    "Temperature_Celsius",
+    "Pest_Infestation_Level",
+    "Disease_Incidence",
+    "Harvest_Date",
+    "Storage_Loss_Percentage",
+    "Market_Price_per_Tonne",
+    "Total_Revenue",
+]
+
+# dtypes handed to read_csv; integers are parsed wide and downcast afterwards
+SCHEMA: Dict[str, str] = {
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    **{col: "int64" for col in INTEGER_COLUMNS},
+    **{col: "float64" for col in FLOAT_COLUMNS},
+}
+
+
+def _select_columns(columns: Sequence[str] | None) -> List[str]:
+    if columns is None:
+        return list(COLUMNS)
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise KeyError(f"Unknown columns requested: {unknown}")
+    # Keep file order so repeated loads produce identical frames
+    wanted = set(columns)
+    return [c for c in COLUMNS if c in wanted]
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast an already-parsed frame to the declared schema."""
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+        elif col in INTEGER_COLUMNS:
+            # Narrowest integer that holds the observed range, so never lossy
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif col in DATE_COLUMNS and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def _read_csv_kwargs(path: str, columns: Sequence[str] | None) -> Dict:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dataset not found at: {path}")
+    usecols = _select_columns(columns)
+    return {
+        "usecols": usecols,
+        "dtype": {col: SCHEMA[col] for col in usecols if col in SCHEMA},
+        "parse_dates": [col for col in DATE_COLUMNS if col in usecols],
+    }
+
+
+def read_crop_csv(path: str = DEFAULT_CSV, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """Parse the CSV with the declared schema, reading only ``columns``."""
+    df = pd.read_csv(path, **_read_csv_kwargs(path, columns))
+    return apply_schema(df)
+
+
+def iter_crop_chunks(
+    path: str = DEFAULT_CSV,
+    columns: Sequence[str] | None = None,
+    chunksize: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Yield schema-typed chunks of at most ``chunksize`` rows.
+
+    Each chunk has its own category set, so compare categoricals by label
+    rather than by code across chunks.
+    """
+    with pd.read_csv(path, chunksize=chunksize, **_read_csv_kwargs(path, columns)) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+def load_crop_data(
+    path: str = DEFAULT_CSV,
+    columns: Sequence[str] | None = None,
+    cache: bool = True,
+    derived: Sequence[str] = (),
+) -> pd.DataFrame:
+    """Load the crop yield dataset with typed columns.
+
+    Categoricals come back as ``category``, integer measures are downcast to the
+    narrowest safe width and Harvest_Date is parsed as datetime64. Pass
+    ``columns`` to read only what the caller needs. With ``cache`` (the default)
+    the parsed frame is served from the columnar cache in ``cache.py``.
+    ``derived`` appends registered derived columns (see ``features.py``), which
+    are cached alongside the base frame.
+    """
+    if cache:
+        from .cache import load_cached
+
+        df = load_cached(path, columns)
+    else:
+        df = read_crop_csv(path, columns)
+    if derived:
+        from .features import add_derived
+
+        df = add_derived(df, derived, path if cache else None)
+    return df
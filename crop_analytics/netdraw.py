@@ -0,0 +1,168 @@
+"""Network drawing with one artist per layer.
+
+Edges become a single ``LineCollection`` whose width and colour arrays come
+straight from the edge arrays. Nodes become one ``scatter`` per marker.
+Labels are plain text, but above ``max_labels`` nodes only the
+highest-priority nodes are labelled, skipping any label whose box would
+overlap one already placed. Above ``RASTER_EDGES`` edges, or on request, the
+edges are instead accumulated into a density image at the axes' pixel
+resolution and drawn with one ``imshow``. The artists and defaults mirror
+``nx.draw_networkx_*``, so small graphs look as they did with networkx.
+"""
+
+from typing import Dict, Hashable, Sequence
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+
+from .graph import EdgeGraph
+
+
+# Edge count above which edges are rasterised by default
+RASTER_EDGES = 200_000
+# Node count above which labels are culled
+LABEL_LIMIT = 50
+# Upper bound on the points one rasterisation chunk samples
+_MAX_RASTER_SAMPLES = 1 << 22
+# Samples per rasterised edge; longer edges spread the same ink over them
+_EDGE_SAMPLES = 64
+
+
+def positions(graph: EdgeGraph, pos: Dict[Hashable, Sequence[float]]) -> np.ndarray:
+    """``pos`` as an ``(n, 2)`` array in ``graph.nodes`` order."""
+    return np.asarray([pos[node] for node in graph.nodes.tolist()], dtype=float).reshape(-1, 2)
+
+
+def _hide_ticks(ax) -> None:
+    ax.tick_params(axis="both", which="both", bottom=False, left=False, labelbottom=False, labelleft=False)
+
+
+def _fit_view(ax, segments: np.ndarray) -> None:
+    """Pad the data limits by 5% of the edge extent, as networkx does."""
+    lo = segments.reshape(-1, 2).min(axis=0)
+    hi = segments.reshape(-1, 2).max(axis=0)
+    pad = 0.05 * (hi - lo)
+    ax.update_datalim([lo - pad, hi + pad])
+    ax.autoscale_view()
+
+
+def _edge_image(ax, segments: np.ndarray, width: np.ndarray, colors: np.ndarray, alpha: float | None):
+    """Alpha-weighted RGBA density of the segments over their padded extent."""
+    lo = segments.reshape(-1, 2).min(axis=0)
+    hi = segments.reshape(-1, 2).max(axis=0)
+    pad = 0.05 * (hi - lo)
+    lo, hi = lo - pad, hi + pad
+    span = np.where(hi > lo, hi - lo, 1.0)
+    box = ax.get_window_extent()
+    shape = np.array([max(int(box.width), 1), max(int(box.height), 1)])
+    cells = shape[0] * shape[1]
+    density = np.zeros(cells)
+    rgb = np.zeros((3, cells))
+    start_px = (segments[:, 0] - lo) / span * shape
+    end_px = (segments[:, 1] - lo) / span * shape
+    length = np.hypot(*(end_px - start_px).T)
+    samples = np.clip(np.ceil(length).astype(np.intp), 1, _EDGE_SAMPLES)
+    # Ink per sample: the edge's pixel length times its width, spread evenly
+    ink = width * np.maximum(length, 1.0) / samples
+    uniform = bool((colors == colors[:1]).all())
+    # Chunks of edges whose samples fit the budget
+    total = np.cumsum(samples)
+    starts = np.unique(np.searchsorted(total, np.arange(0, total[-1], _MAX_RASTER_SAMPLES), side="right"))
+    for a, b in zip(starts, np.r_[starts[1:], len(samples)]):
+        count = samples[a:b]
+        edge = np.repeat(np.arange(a, b), count)
+        t = (np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count) + 0.5) / np.repeat(count, count)
+        point = start_px[edge] + (end_px[edge] - start_px[edge]) * t[:, None]
+        ix = np.clip(point[:, 0].astype(np.intp), 0, shape[0] - 1)
+        iy = np.clip(point[:, 1].astype(np.intp), 0, shape[1] - 1)
+        flat = iy * shape[0] + ix
+        mass = ink[edge]
+        density += np.bincount(flat, mass, cells)
+        if not uniform:
+            for c in range(3):
+                rgb[c] += np.bincount(flat, mass * colors[edge, c], cells)
+    image = np.zeros((shape[1], shape[0], 4))
+    covered = density > 0
+    for c in range(3):
+        if uniform:
+            image[..., c] = colors[0, c]
+        else:
+            image[..., c].flat[covered] = rgb[c, covered] / density[covered]
+    level = np.log1p(density)
+    image[..., 3].flat[:] = (1.0 if alpha is None else alpha) * level / max(level.max(), 1e-12)
+    return image, (lo[0], hi[0], lo[1], hi[1])
+
+
+def draw_edges(ax, xy: np.ndarray, src: np.ndarray, dst: np.ndarray, width=1.0, color="k",
+               alpha: float | None = None, style: str = "solid", raster: bool | None = None,
+               label: str | None = None):
+    """Draw edges ``(xy[src], xy[dst])`` as one ``LineCollection``, or as one density image.
+
+    ``width`` and ``color`` are scalars or per-edge arrays. ``raster=None``
+    rasterises when there are more than ``RASTER_EDGES`` edges.
+    """
+    if len(src) == 0:
+        return None
+    segments = np.stack([xy[src], xy[dst]], axis=1)
+    if raster is None:
+        raster = len(src) > RASTER_EDGES
+    if raster:
+        widths = np.broadcast_to(np.asarray(width, dtype=float), len(src))
+        colors = to_rgba_array(color)
+        colors = np.broadcast_to(colors, (len(src), 4)) if len(colors) == 1 else colors
+        image, extent = _edge_image(ax, segments, widths, colors, alpha)
+        artist = ax.imshow(image, origin="lower", extent=extent, aspect="auto",
+                           interpolation="nearest", zorder=1, label=label)
+    else:
+        artist = LineCollection(segments, colors=color, linewidths=width, antialiaseds=(1,),
+                                linestyle=style, alpha=alpha, zorder=1, label=label)
+        ax.add_collection(artist)
+    _fit_view(ax, segments)
+    _hide_ticks(ax)
+    return artist
+
+
+def draw_nodes(ax, xy: np.ndarray, size=300, color="#1f77b4", marker: str = "o", cmap=None,
+               vmin=None, vmax=None, alpha: float | None = None, linewidths=None, edgecolors=None,
+               label: str | None = None):
+    """Draw all nodes as one scatter collection above the edges."""
+    nodes = ax.scatter(xy[:, 0], xy[:, 1], s=size, c=color, marker=marker, cmap=cmap, vmin=vmin, vmax=vmax,
+                       alpha=alpha, linewidths=linewidths, edgecolors=edgecolors, label=label)
+    nodes.set_zorder(2)
+    _hide_ticks(ax)
+    return nodes
+
+
+def draw_labels(ax, xy: np.ndarray, labels: Sequence, priority: np.ndarray | None = None,
+                max_labels: int = LABEL_LIMIT, font_size=12, font_color="k", **text_kwargs):
+    """Label nodes; past ``max_labels`` nodes, only the top ones by ``priority`` that do not collide.
+
+    Collisions are judged on the label boxes at the current figure layout.
+    """
+    labels = [str(label) for label in labels]
+    style = dict(size=font_size, color=font_color, family="sans-serif", weight="normal",
+                 horizontalalignment="center", verticalalignment="center",
+                 transform=ax.transData, clip_on=True)
+    style.update(text_kwargs)
+    if len(labels) <= max_labels:
+        texts = [ax.text(x, y, label, **style) for (x, y), label in zip(xy.tolist(), labels)]
+        _hide_ticks(ax)
+        return texts
+    order = np.arange(len(labels)) if priority is None else np.argsort(-np.asarray(priority), kind="stable")
+    renderer = ax.figure.canvas.get_renderer()
+    placed = np.empty((0, 4))
+    texts = []
+    # Candidates past a few times the budget are unlikely to find room
+    for i in order[:4 * max_labels].tolist():
+        text = ax.text(xy[i, 0], xy[i, 1], labels[i], **style)
+        box = text.get_window_extent(renderer)
+        if np.any((placed[:, 0] < box.x1) & (placed[:, 2] > box.x0) & (placed[:, 1] < box.y1) & (placed[:, 3] > box.y0)):
+            text.remove()
+            continue
+        placed = np.vstack([placed, [box.x0, box.y0, box.x1, box.y1]])
+        texts.append(text)
+        if len(texts) == max_labels:
+            break
+    _hide_ticks(ax)
+    return texts
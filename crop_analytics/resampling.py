@@ -0,0 +1,223 @@
+"""Permutation p-values and bootstrap confidence intervals for the TASK 3 tests.
+
+Resamples are drawn as batched index matrices (one row per resample), so
+every statistic is evaluated for a whole batch with vectorised NumPy: group
+sums and contingency tables come from one ``bincount`` over
+``resample * groups + code``. Batches are spread over a process pool. Each
+batch has its own child of one ``SeedSequence``, so results depend only on
+``seed`` and not on how many workers ran them.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .encoding import group_codes
+
+
+DEFAULT_RESAMPLES = 10_000
+
+# Upper bound on the index-matrix cells one batch holds (8 bytes each)
+_MAX_BATCH_CELLS = 1 << 22
+
+
+class ResampleResult:
+    """Observed statistic, permutation p-value and bootstrap interval.
+
+    ``ci`` is the percentile interval of ``ci_statistic`` (an effect size such
+    as r, eta squared or Cramér's V), or ``None`` when no bootstrap was run.
+    """
+
+    def __init__(self, statistic: float, p_value: float, n_resamples: int,
+                 ci_statistic: str | None = None, estimate: float | None = None,
+                 ci: Tuple[float, float] | None = None, confidence: float = 0.95):
+        self.statistic = statistic
+        self.p_value = p_value
+        self.n_resamples = n_resamples
+        self.ci_statistic = ci_statistic
+        self.estimate = estimate
+        self.ci = ci
+        self.confidence = confidence
+
+
+def _rowwise(values: np.ndarray, idx: np.ndarray, resample: bool) -> np.ndarray:
+    return values[idx] if resample else np.broadcast_to(values, idx.shape)
+
+
+def _group_sums(codes: np.ndarray, values: np.ndarray, k: int):
+    """Per-resample group counts, sums and sums of squares, each ``(B, k)``."""
+    b = codes.shape[0]
+    flat = (np.arange(b)[:, None] * k + codes).ravel()
+    shape = (b, k)
+    n_g = np.bincount(flat, minlength=b * k).reshape(shape)
+    s = np.bincount(flat, values.ravel(), minlength=b * k).reshape(shape)
+    ss = np.bincount(flat, (values ** 2).ravel(), minlength=b * k).reshape(shape)
+    return n_g, s, ss
+
+
+def _pearson(data, idx: np.ndarray, permute: bool, measure: str) -> np.ndarray:
+    x, y = data
+    xs = _rowwise(x, idx, not permute)
+    ys = y[idx]
+    xc = xs - xs.mean(axis=1, keepdims=True)
+    yc = ys - ys.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (xc * yc).sum(axis=1) / np.sqrt((xc ** 2).sum(axis=1) * (yc ** 2).sum(axis=1))
+
+
+def _anova(data, idx: np.ndarray, permute: bool, measure: str) -> np.ndarray:
+    codes, values, k = data
+    n_g, s, ss = _group_sums(codes[idx], _rowwise(values, idx, not permute), k)
+    n = n_g.sum(axis=1)
+    groups = (n_g > 0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        explained = np.where(n_g > 0, s ** 2 / n_g, 0.0).sum(axis=1)
+        between = explained - s.sum(axis=1) ** 2 / n
+        within = ss.sum(axis=1) - explained
+        if measure == "eta_squared":
+            return between / (between + within)
+        return (between / (groups - 1)) / (within / (n - groups))
+
+
+def _kruskal(data, idx: np.ndarray, permute: bool, measure: str) -> np.ndarray:
+    # Permutation only: the ranks and their tie correction stay fixed
+    codes, ranks, k, tie_correction = data
+    n_g, r, _ = _group_sums(codes[idx], np.broadcast_to(ranks, idx.shape), k)
+    n = n_g.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        h = 12.0 / (n * (n + 1)) * np.where(n_g > 0, r ** 2 / n_g, 0.0).sum(axis=1) - 3 * (n + 1)
+    return h / tie_correction
+
+
+def _chi_square(data, idx: np.ndarray, permute: bool, measure: str) -> np.ndarray:
+    a, b, ka, kb = data
+    a_codes = _rowwise(a, idx, not permute)
+    batch = idx.shape[0]
+    flat = (np.arange(batch)[:, None] * (ka * kb) + a_codes * kb + b[idx]).ravel()
+    observed = np.bincount(flat, minlength=batch * ka * kb).reshape(batch, ka, kb).astype(float)
+    rows, cols = observed.sum(axis=2), observed.sum(axis=1)
+    n = rows.sum(axis=1)
+    expected = rows[:, :, None] * cols[:, None, :] / n[:, None, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        chi2 = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0).sum(axis=(1, 2))
+        if measure == "cramers_v":
+            k = np.minimum((rows > 0).sum(axis=1), (cols > 0).sum(axis=1)) - 1
+            return np.sqrt(chi2 / (n * k))
+    return chi2
+
+
+_STATISTICS: Dict[str, Callable] = {
+    "pearson": _pearson,
+    "anova": _anova,
+    "kruskal": _kruskal,
+    "chi_square": _chi_square,
+}
+
+
+def _run_batch(name: str, data, permute: bool, measure: str, n: int, size: int,
+               seed: np.random.SeedSequence) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if permute:
+        idx = rng.random((size, n)).argsort(axis=1)
+    else:
+        idx = rng.integers(0, n, size=(size, n))
+    return _STATISTICS[name](data, idx, permute, measure)
+
+
+def _resample(name: str, data, n: int, permute: bool, measure: str, n_resamples: int,
+              seed: int, max_workers: int | None, batch_size: int) -> np.ndarray:
+    size = max(1, min(batch_size, _MAX_BATCH_CELLS // max(n, 1)))
+    sizes = [size] * (n_resamples // size)
+    if n_resamples % size:
+        sizes.append(n_resamples % size)
+    # Distinct child streams for permutation and bootstrap draws of one seed
+    seeds = np.random.SeedSequence([seed, int(permute)]).spawn(len(sizes))
+    jobs = [(name, data, permute, measure, n, s, sd) for s, sd in zip(sizes, seeds)]
+    if max_workers == 1 or len(jobs) == 1:
+        results = [_run_batch(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_run_batch, *zip(*jobs)))
+    return np.concatenate(results)
+
+
+def _test(name: str, data, n: int, measure: str, ci_measure: str | None, two_sided: bool,
+          n_resamples: int, confidence: float, seed: int, max_workers: int | None,
+          batch_size: int) -> ResampleResult:
+    identity = np.arange(n)[None, :]
+    observed = float(_STATISTICS[name](data, identity, False, measure)[0])
+    null = _resample(name, data, n, True, measure, n_resamples, seed, max_workers, batch_size)
+    if two_sided:
+        null, observed_extreme = np.abs(null), abs(observed)
+    else:
+        observed_extreme = observed
+    # Relative slack so resamples equal to the observed value count as extreme
+    extreme = null >= observed_extreme - 1e-12 * abs(observed)
+    p_value = (1 + int(np.count_nonzero(extreme))) / (n_resamples + 1)
+    if ci_measure is None:
+        return ResampleResult(observed, p_value, n_resamples)
+    estimate = float(_STATISTICS[name](data, identity, False, ci_measure)[0])
+    boot = _resample(name, data, n, False, ci_measure, n_resamples, seed, max_workers, batch_size)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.nanpercentile(boot, [tail, 100 - tail])
+    return ResampleResult(observed, p_value, n_resamples, ci_measure, estimate, (float(low), float(high)), confidence)
+
+
+def _codes(values: pd.Series) -> Tuple[np.ndarray, int]:
+    codes, labels = group_codes(values)
+    return codes, len(labels)
+
+
+def pearson_test(x: pd.Series, y: pd.Series, n_resamples: int = DEFAULT_RESAMPLES, confidence: float = 0.95,
+                 seed: int = 0, max_workers: int | None = None, batch_size: int = 256) -> ResampleResult:
+    """Two-sided permutation p-value for Pearson r and a bootstrap interval for r."""
+    frame = pd.DataFrame({"x": x, "y": y}).dropna()
+    data = (frame["x"].to_numpy(dtype=float), frame["y"].to_numpy(dtype=float))
+    return _test("pearson", data, len(frame), "r", "r", True,
+                 n_resamples, confidence, seed, max_workers, batch_size)
+
+
+def anova_test(groups: pd.Series, values: pd.Series, n_resamples: int = DEFAULT_RESAMPLES, confidence: float = 0.95,
+               seed: int = 0, max_workers: int | None = None, batch_size: int = 256) -> ResampleResult:
+    """Permutation p-value for the one-way ANOVA F and a bootstrap interval for eta squared."""
+    frame = pd.DataFrame({"g": groups, "v": values}).dropna()
+    codes, k = _codes(frame["g"])
+    v = frame["v"].to_numpy(dtype=float)
+    data = (codes, v - v.mean(), k)
+    return _test("anova", data, len(frame), "f", "eta_squared", False,
+                 n_resamples, confidence, seed, max_workers, batch_size)
+
+
+def kruskal_test(groups: pd.Series, values: pd.Series, n_resamples: int = DEFAULT_RESAMPLES,
+                 seed: int = 0, max_workers: int | None = None, batch_size: int = 256) -> ResampleResult:
+    """Permutation p-value for the tie-corrected Kruskal–Wallis H."""
+    frame = pd.DataFrame({"g": groups, "v": values}).dropna()
+    codes, k = _codes(frame["g"])
+    ranks = frame["v"].rank(method="average").to_numpy()
+    ties = frame["v"].value_counts().to_numpy(dtype=float)
+    n = float(len(frame))
+    tie_correction = 1.0 - (ties ** 3 - ties).sum() / (n ** 3 - n) if n > 1 else 1.0
+    data = (codes, ranks, k, tie_correction)
+    return _test("kruskal", data, len(frame), "h", None, False,
+                 n_resamples, 0.95, seed, max_workers, batch_size)
+
+
+def chi_square_test(a: pd.Series, b: pd.Series, n_resamples: int = DEFAULT_RESAMPLES, confidence: float = 0.95,
+                    seed: int = 0, max_workers: int | None = None, batch_size: int = 256) -> ResampleResult:
+    """Permutation p-value for the chi-square statistic and a bootstrap interval for Cramér's V."""
+    frame = pd.DataFrame({"a": a, "b": b}).dropna()
+    a_codes, ka = _codes(frame["a"])
+    b_codes, kb = _codes(frame["b"])
+    data = (a_codes, b_codes, ka, kb)
+    return _test("chi_square", data, len(frame), "chi2", "cramers_v", False,
+                 n_resamples, confidence, seed, max_workers, batch_size)
+
+
+def format_result(result: ResampleResult) -> str:
+    """One-line summary used by the analysis scripts."""
+    text = f"permutation p = {result.p_value:.4f} ({result.n_resamples} resamples)"
+    if result.ci is not None:
+        text += f", {result.confidence:.0%} bootstrap CI for {result.ci_statistic} = [{result.ci[0]:.3f}, {result.ci[1]:.3f}]"
+    return text
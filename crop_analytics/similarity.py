@@ -0,0 +1,176 @@
+"""Cosine-similarity graphs between the rows of a matrix.
+
+Rows are L2-normalised once, so every similarity is a dot product. The exact
+backend computes them as blocks of rows against the whole matrix, sized so a
+block never holds more than ``block_cells`` values, and keeps either the
+pairs at or above a threshold or each row's ``k`` nearest neighbours. The
+``"lsh"`` backend is approximate and meant for tens of thousands of rows.
+Each hash table sorts the rows by random-hyperplane signature, which puts
+rows with similar directions next to each other, and only rows within
+``window`` positions of each other are scored, with vectorised row-wise dot
+products. Edges come back as ``(source, target, weight)`` arrays with
+``source < target``, sorted, so a graph built from them matches one built by
+a nested ``i < j`` loop edge for edge.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from .graph import EdgeGraph
+
+
+DEFAULT_BLOCK_CELLS = 1 << 22
+LSH_BITS = 24
+LSH_WINDOW = 32
+
+
+def normalize_rows(values) -> np.ndarray:
+    """Rows scaled to unit L2 norm; all-zero rows stay zero (similarity 0 to everything)."""
+    values = np.asarray(values, dtype=float)
+    norms = np.linalg.norm(values, axis=1, keepdims=True)
+    return np.divide(values, norms, out=np.zeros_like(values), where=norms > 0)
+
+
+def _select(rows: np.ndarray, sims: np.ndarray, threshold: float | None, k: int | None):
+    """Pairs kept from a block of similarities, ``rows`` being the block's row ids."""
+    n = sims.shape[1]
+    if k is None:
+        i, j = np.nonzero(sims >= threshold)
+    else:
+        k = min(k, n - 1)
+        if k <= 0:
+            return np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0)
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        i = np.repeat(np.arange(len(rows)), k)
+        j = top.ravel()
+        if threshold is not None:
+            keep = sims[i, j] >= threshold
+            i, j = i[keep], j[keep]
+    return rows[i], j, sims[i, j]
+
+
+def _canonical(src: np.ndarray, dst: np.ndarray, weight: np.ndarray, n: int):
+    """Orient pairs as ``src < dst``, drop self-pairs and duplicates, sort."""
+    lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+    keep = lo != hi
+    codes, first = np.unique(lo[keep] * n + hi[keep], return_index=True)
+    return codes // n, codes % n, weight[keep][first]
+
+
+def _exact_pairs(x: np.ndarray, threshold: float | None, k: int | None, block_cells: int):
+    n = len(x)
+    rows_per_block = max(1, block_cells // max(n, 1))
+    parts = []
+    for start in range(0, n, rows_per_block):
+        rows = np.arange(start, min(start + rows_per_block, n))
+        sims = x[rows] @ x.T
+        # Exclude self-pairs (and, for thresholds, pairs already seen from the other side)
+        if k is None:
+            sims[np.arange(len(rows))[:, None] >= (np.arange(n)[None, :] - start)] = -np.inf
+        else:
+            sims[np.arange(len(rows)), rows] = -np.inf
+        parts.append(_select(rows, sims, threshold, k))
+    return parts
+
+
+def _merge_best(neighbours: np.ndarray, sims: np.ndarray, k: int):
+    """Per row, the ``k`` most similar distinct neighbours among the columns."""
+    # Grouped by neighbour, most similar first, so only worse copies are dropped
+    order = np.lexsort((-sims, neighbours), axis=1)
+    neighbours = np.take_along_axis(neighbours, order, axis=1)
+    sims = np.take_along_axis(sims, order, axis=1)
+    duplicate = np.zeros(neighbours.shape, dtype=bool)
+    duplicate[:, 1:] = neighbours[:, 1:] == neighbours[:, :-1]
+    sims = np.where(duplicate, -np.inf, sims)
+    top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(neighbours, top, axis=1), np.take_along_axis(sims, top, axis=1)
+
+
+def _lsh_pairs(x: np.ndarray, threshold: float | None, k: int | None, window: int,
+               recall: float, seed: int):
+    n, d = x.shape
+    window = max(1, min(window, n - 1))
+    # Rows ``window`` apart in hash order share about this many leading bits
+    prefix = int(np.clip(np.ceil(np.log2(max(n, 2) / window)) + 1, 1, LSH_BITS))
+    # A pair at the threshold (or at cosine 0.8 for pure kNN) shares that
+    # prefix in one table with probability p; use enough tables to reach ``recall``
+    angle = np.arccos(np.clip(threshold if threshold is not None else 0.8, -1.0, 1.0))
+    p = (1.0 - angle / np.pi) ** prefix
+    tables = int(np.clip(np.ceil(np.log1p(-recall) / np.log1p(-min(p, 1 - 1e-12))), 1, 64))
+    rng = np.random.default_rng(seed)
+    weights = 1 << np.arange(LSH_BITS - 1, -1, -1, dtype=np.int64)
+    parts = []
+    if k is not None:
+        k = min(k, n - 1)
+        best = np.full((n, k), -1, dtype=np.intp)
+        best_sims = np.full((n, k), -np.inf)
+    for _ in range(tables):
+        codes = (x @ rng.standard_normal((d, LSH_BITS)) > 0) @ weights
+        order = np.argsort(codes, kind="stable")
+        xs = x[order]
+        if k is None:
+            # Every pair within ``window`` positions of each other in hash order
+            for offset in range(1, window + 1):
+                sims = np.einsum("ij,ij->i", xs[:-offset], xs[offset:])
+                keep = sims >= threshold
+                parts.append((order[:-offset][keep], order[offset:][keep], sims[keep]))
+            continue
+        # Each row's best among the ``window`` rows on either side of it,
+        # merged into its running k best over the tables so far
+        offsets = np.r_[-window:0, 1:window + 1]
+        sims = np.full((n, len(offsets)), -np.inf)
+        for c, offset in enumerate(offsets):
+            lo, hi = max(0, -offset), n - max(0, offset)
+            sims[lo:hi, c] = np.einsum("ij,ij->i", xs[lo:hi], xs[lo + offset:hi + offset])
+        neighbours = np.empty((n, len(offsets)), dtype=np.intp)
+        neighbours[order] = order[np.clip(np.arange(n)[:, None] + offsets, 0, n - 1)]
+        found = np.empty_like(sims)
+        found[order] = sims
+        best, best_sims = _merge_best(np.c_[best, neighbours], np.c_[best_sims, found], k)
+    if k is not None:
+        keep = np.isfinite(best_sims)
+        if threshold is not None:
+            keep &= best_sims >= threshold
+        rows = np.broadcast_to(np.arange(n)[:, None], best.shape)
+        parts.append((rows[keep], best[keep], best_sims[keep]))
+    return parts
+
+
+def similarity_edges(values, threshold: float | None = None, k: int | None = None, backend: str = "exact",
+                     block_cells: int = DEFAULT_BLOCK_CELLS, window: int = LSH_WINDOW,
+                     recall: float = 0.95, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cosine-similarity edges between the rows of ``values``.
+
+    With ``threshold`` alone every pair with similarity >= threshold is kept.
+    With ``k`` each row keeps its ``k`` most similar rows (only those at or
+    above ``threshold`` if both are given), and the union is returned.
+    ``backend="lsh"`` trades exactness for speed, aiming to find each
+    qualifying pair with probability about ``recall``.
+    """
+    if threshold is None and k is None:
+        raise ValueError("Pass a similarity threshold, k, or both")
+    x = normalize_rows(values)
+    if backend == "exact":
+        parts = _exact_pairs(x, threshold, k, block_cells)
+    elif backend == "lsh":
+        parts = _lsh_pairs(x, threshold, k, window, recall, seed)
+    else:
+        raise ValueError(f"Unknown similarity backend: {backend!r}")
+    if not parts:
+        return np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0)
+    src, dst, weight = (np.concatenate(p) for p in zip(*parts))
+    return _canonical(src, dst, weight, len(x))
+
+
+def similarity_edge_graph(frame: pd.DataFrame, threshold: float | None = None, k: int | None = None,
+                          **kwargs) -> EdgeGraph:
+    """An ``EdgeGraph`` on ``frame.index`` weighted by the cosine similarity of its rows."""
+    src, dst, weight = similarity_edges(frame.to_numpy(dtype=float), threshold, k, **kwargs)
+    return EdgeGraph(frame.index, src, dst, weight)
+
+
+def similarity_graph(frame: pd.DataFrame, threshold: float | None = None, k: int | None = None, **kwargs):
+    """The same graph as a networkx graph."""
+    return similarity_edge_graph(frame, threshold, k, **kwargs).to_networkx()
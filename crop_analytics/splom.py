@@ -0,0 +1,133 @@
+"""Scatterplot matrices whose cost does not grow with the number of rows.
+
+Every column is binned once against shared edges; each off-diagonal panel is
+then a ``bincount`` of two columns' bin codes, accumulated over row chunks in a
+single pass, and drawn as one image artist. Diagonals are 1D histograms drawn
+as one ``stairs`` artist. The figure, and the saved file, are the same size for
+a hundred rows or a hundred million. Small frames can still be drawn as
+ordinary point scatters with ``mode="scatter"`` (or ``"auto"``).
+"""
+
+from typing import Sequence, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_BINS = 64
+# Below this many rows "auto" draws individual points
+SCATTER_MAX_ROWS = 5_000
+
+
+class SplomHistogram:
+    """Shared bin edges per column and the 1D/2D counts of every column pair."""
+
+    def __init__(self, columns: Sequence[str], ranges: Sequence[Tuple[float, float]], bins: int = DEFAULT_BINS):
+        self.columns = list(columns)
+        self.bins = bins
+        self.edges = []
+        for lo, hi in ranges:
+            if not hi > lo:
+                lo, hi = lo - 0.5, hi + 0.5
+            self.edges.append(np.linspace(lo, hi, bins + 1))
+        k = len(self.columns)
+        self.diagonal = np.zeros((k, bins), dtype=np.int64)
+        # Upper triangle only; panel (j, i) is the transpose of (i, j)
+        self.pairs = {(i, j): np.zeros((bins, bins), dtype=np.int64) for i in range(k) for j in range(i + 1, k)}
+
+    def _codes(self, values: np.ndarray) -> np.ndarray:
+        lo = np.array([e[0] for e in self.edges])
+        width = np.array([e[1] - e[0] for e in self.edges])
+        with np.errstate(invalid="ignore"):
+            codes = np.floor((values - lo) / width)
+        codes = np.where(np.isnan(codes) | (values < lo) | (values > lo + width * self.bins), -1, codes)
+        # The right edge belongs to the last bin, as in np.histogram
+        return np.minimum(codes, self.bins - 1).astype(np.intp)
+
+    def update(self, block: pd.DataFrame) -> None:
+        codes = self._codes(block[self.columns].to_numpy(dtype=float))
+        valid = codes >= 0
+        b = self.bins
+        for i in range(len(self.columns)):
+            self.diagonal[i] += np.bincount(codes[valid[:, i], i], minlength=b)
+        for (i, j), counts in self.pairs.items():
+            both = valid[:, i] & valid[:, j]
+            counts += np.bincount(codes[both, i] * b + codes[both, j], minlength=b * b).reshape(b, b)
+
+    def panel(self, i: int, j: int) -> np.ndarray:
+        """Counts with rows binned on column ``i`` and columns on column ``j``."""
+        return self.pairs[(i, j)] if i < j else self.pairs[(j, i)].T
+
+
+def splom_histogram(df: pd.DataFrame, columns: Sequence[str], bins: int = DEFAULT_BINS,
+                    chunksize: int = 1_000_000) -> SplomHistogram:
+    """Histograms of every pair of ``columns``, edges spanning each column's range."""
+    values = df[list(columns)]
+    ranges = list(zip(values.min().to_numpy(dtype=float), values.max().to_numpy(dtype=float)))
+    hist = SplomHistogram(columns, ranges, bins)
+    for start in range(0, len(df), chunksize):
+        hist.update(values.iloc[start:start + chunksize])
+    return hist
+
+
+def _label(name: str) -> str:
+    return name.replace('_', ' ')
+
+
+def plot_splom(
+    df: pd.DataFrame,
+    columns: Sequence[str],
+    mode: str = "auto",
+    bins: int = DEFAULT_BINS,
+    correlations: pd.DataFrame | None = None,
+    cmap: str = "viridis",
+    figsize: Tuple[float, float] | None = None,
+    scatter_kws: dict | None = None,
+):
+    """Draw a ``len(columns)``-square scatterplot matrix and return the figure.
+
+    Panel ``(i, j)`` plots column ``j`` on x against column ``i`` on y. In
+    ``"density"`` mode each off-diagonal panel is a log-scaled 2D histogram
+    image; ``"scatter"`` draws points; ``"auto"`` picks scatter for frames of
+    at most ``SCATTER_MAX_ROWS`` rows. ``correlations`` (a square frame such as
+    ``CorrelationResult.pearson``) adds a coefficient to every panel.
+    """
+    if mode == "auto":
+        mode = "scatter" if len(df) <= SCATTER_MAX_ROWS else "density"
+    if mode not in ("scatter", "density"):
+        raise ValueError(f"Unknown SPLOM mode: {mode!r}")
+    columns = list(columns)
+    k = len(columns)
+    hist = splom_histogram(df, columns, bins)
+    fig, axes = plt.subplots(k, k, figsize=figsize or (2.2 * k, 2.2 * k), squeeze=False)
+    scatter_kws = {"alpha": 0.6, "s": 10, **(scatter_kws or {})}
+
+    for i in range(k):
+        for j in range(k):
+            ax = axes[i, j]
+            if i == j:
+                ax.stairs(hist.diagonal[i], hist.edges[i], fill=True, alpha=0.7)
+                ax.set_xlim(hist.edges[i][0], hist.edges[i][-1])
+                # Counts share no scale with the row variable
+                ax.set_yticks([])
+            elif mode == "density":
+                counts = hist.panel(i, j).astype(float)
+                image = np.ma.masked_equal(np.log1p(counts), 0.0)
+                ax.imshow(image, origin="lower", aspect="auto", cmap=cmap, interpolation="nearest",
+                          extent=(hist.edges[j][0], hist.edges[j][-1], hist.edges[i][0], hist.edges[i][-1]))
+            else:
+                ax.scatter(df[columns[j]], df[columns[i]], **scatter_kws)
+            if correlations is not None and i != j:
+                ax.text(0.05, 0.95, f'ρ = {correlations.loc[columns[i], columns[j]]:.2f}', transform=ax.transAxes,
+                        va='top', fontsize=8, bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
+            ax.tick_params(axis='both', which='major', labelsize=7)
+            if i == k - 1:
+                ax.set_xlabel(_label(columns[j]), fontsize=9)
+            else:
+                ax.set_xticklabels([])
+            if j == 0:
+                ax.set_ylabel(_label(columns[i]), fontsize=9)
+            elif i != j:
+                ax.set_yticklabels([])
+    return fig
@@ -0,0 +1,347 @@
+"""Constant-memory summary statistics over a chunked CSV read.
+
+Every accumulator here is mergeable: two accumulators built from disjoint
+chunks combine into the accumulator of their union, so a file can be summarised
+chunk by chunk (or in parallel) without ever holding it in memory.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .correlation import CorrelationResult
+from .loader import DEFAULT_CSV, iter_crop_chunks
+
+
+DESCRIBE_INDEX = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+class MomentAccumulator:
+    """Per-column count, mean, M2, min and max with Welford/Chan merges."""
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        width = len(self.columns)
+        self.count = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+
+    def _combine(self, n_b, mean_b, m2_b, min_b, max_b) -> None:
+        n_a = self.count
+        n = n_a + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean_b - self.mean
+            self.mean = np.where(n > 0, self.mean + delta * n_b / n, 0.0)
+            self.m2 = np.where(n > 0, self.m2 + m2_b + delta**2 * n_a * n_b / n, 0.0)
+        self.count = n
+        self.min = np.fmin(self.min, min_b)
+        self.max = np.fmax(self.max, max_b)
+
+    def update(self, block: pd.DataFrame) -> None:
+        values = block[self.columns].to_numpy(dtype=float)
+        n_b = (~np.isnan(values)).sum(axis=0).astype(float)
+        with np.errstate(invalid="ignore"):
+            mean_b = np.where(n_b > 0, np.nansum(values, axis=0) / np.maximum(n_b, 1), 0.0)
+            m2_b = np.nansum((values - mean_b) ** 2, axis=0)
+        min_b = np.nanmin(values, axis=0, initial=np.inf)
+        max_b = np.nanmax(values, axis=0, initial=-np.inf)
+        self._combine(n_b, mean_b, m2_b, min_b, max_b)
+
+    def merge(self, other: "MomentAccumulator") -> None:
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    @property
+    def std(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+
+class CoMomentAccumulator:
+    """Pairwise count, means, M2 and co-moment matrices with Chan merges.
+
+    Entry ``[i, j]`` covers the rows where columns ``i`` and ``j`` are both
+    present, so the correlations are pairwise-complete like
+    ``DataFrame.corr``. An update costs O(rows * columns^2), whatever was
+    accumulated before.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        shape = (len(self.columns),) * 2
+        self.count = np.zeros(shape)
+        # mean[i, j] and m2[i, j] are column i's over the rows shared with column j
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.comoment = np.zeros(shape)
+
+    def _combine(self, n_b, mean_b, m2_b, comoment_b) -> None:
+        n_a = self.count
+        n = n_a + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            share = np.where(n > 0, n_b / n, 0.0)
+        delta = mean_b - self.mean
+        # The other column's delta for pair (i, j) is delta[j, i]
+        self.comoment = self.comoment + comoment_b + delta * delta.T * n_a * share
+        self.m2 = self.m2 + m2_b + delta ** 2 * n_a * share
+        self.mean = self.mean + delta * share
+        self.count = n
+
+    def update(self, block: pd.DataFrame) -> None:
+        values = block[self.columns].to_numpy(dtype=float)
+        mask = ~np.isnan(values)
+        m = mask.astype(float)
+        # Centre on the block's column means so the sums below do not cancel
+        present = m.sum(axis=0)
+        centre = np.where(present > 0, np.nansum(values, axis=0) / np.maximum(present, 1), 0.0)
+        centred = np.where(mask, values - centre, 0.0)
+        n_b = m.T @ m
+        sx = centred.T @ m
+        with np.errstate(invalid="ignore", divide="ignore"):
+            offset = np.where(n_b > 0, sx / n_b, 0.0)
+        m2_b = (centred ** 2).T @ m - sx * offset
+        comoment_b = centred.T @ centred - sx * offset.T
+        self._combine(n_b, centre[:, None] + offset, m2_b, comoment_b)
+
+    def merge(self, other: "CoMomentAccumulator") -> None:
+        self._combine(other.count, other.mean, other.m2, other.comoment)
+
+    def pearson(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        r = np.clip(r, -1.0, 1.0)
+        np.fill_diagonal(r, np.where(np.diag(self.m2) > 0, 1.0, np.nan))
+        return r
+
+    def correlation(self) -> CorrelationResult:
+        """The Pearson matrix and pair counts so far, as ``correlate(..., spearman=False)`` gives."""
+        return CorrelationResult(self.columns, self.pearson(), self.count.copy())
+
+
+class QuantileSketch:
+    """Mergeable KLL quantile sketch.
+
+    Holds at most a few multiples of ``k`` values regardless of stream length.
+    Quantiles are exact (linear interpolation, as in ``describe``) until the
+    first compaction; afterwards the normalised rank error stays below roughly
+    3.3/k with high probability, i.e. about 1.65% at the default k=200.
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compact(self, level: int) -> None:
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        items = np.sort(self.levels[level])
+        # An odd leftover stays behind so every promoted pair is complete
+        keep = items[:1] if len(items) % 2 else items[:0]
+        items = items[len(keep):]
+        promoted = items[self._rng.integers(2)::2]
+        self.levels[level] = keep
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def _compress(self) -> None:
+        while True:
+            full = [h for h, items in enumerate(self.levels) if len(items) > self._capacity(h)]
+            if not full:
+                return
+            self._compact(full[0])
+
+    def update(self, values: Iterable[float]) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self.levels) == 1
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        if self.is_exact:
+            return np.quantile(self.levels[0], qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0**h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cum = values[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cum, np.asarray(qs) * cum[-1], side="left")
+        return values[np.minimum(idx, len(values) - 1)]
+
+
+class CategoryCounter:
+    """Label counts for one column.
+
+    Exact by default. With ``capacity`` set it becomes a Misra-Gries
+    heavy-hitter summary: at most ``capacity`` labels are kept and each kept
+    count underestimates the truth by at most n / (capacity + 1).
+    """
+
+    def __init__(self, capacity: int | None = None):
+        self.capacity = capacity
+        self.counts: Counter = Counter()
+        self.n = 0
+
+    def update(self, values: pd.Series) -> None:
+        # Counting on the categorical codes avoids hashing every string
+        chunk_counts = values.value_counts(sort=False, dropna=True)
+        self.add_counts(chunk_counts[chunk_counts > 0].to_dict())
+
+    def add_counts(self, counts: Dict) -> None:
+        for label, c in counts.items():
+            self.counts[label] += int(c)
+            self.n += int(c)
+        if self.capacity is not None and len(self.counts) > self.capacity:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        # Batched Misra-Gries decrement: subtract the (capacity+1)-th largest count
+        floor = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = Counter({k: c - floor for k, c in self.counts.items() if c > floor})
+
+    def merge(self, other: "CategoryCounter") -> None:
+        n = self.n
+        self.add_counts(other.counts)
+        self.n = n + other.n
+
+    @property
+    def is_exact(self) -> bool:
+        return self.capacity is None
+
+    def value_counts(self, name: str | None = None) -> pd.Series:
+        series = pd.Series(dict(self.counts), name="count", dtype="int64")
+        # Ties fall back to label order, matching value_counts on a categorical
+        series = series.sort_index().sort_values(ascending=False, kind="stable")
+        series.index.name = name
+        return series
+
+
+class RowSample:
+    """Uniform sample of at most ``size`` rows, as the rows with the smallest random keys.
+
+    Rows keep their stream order, so a stream of at most ``size`` rows is
+    sampled as itself. Categorical columns come back as ``category`` with
+    the labels seen in the sample.
+    """
+
+    def __init__(self, size: int, seed: int | None = None):
+        self.size = size
+        self.n = 0
+        self.rows: pd.DataFrame | None = None
+        self.keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def _keep(self, rows: pd.DataFrame, keys: np.ndarray) -> None:
+        if len(keys) > self.size:
+            chosen = np.sort(np.argpartition(keys, self.size - 1)[:self.size])
+            rows, keys = rows.iloc[chosen], keys[chosen]
+        self.rows, self.keys = rows, keys
+
+    def _combine(self, rows: pd.DataFrame, keys: np.ndarray) -> None:
+        if self.rows is not None:
+            # Labels are compared as values; chunks carry their own category sets
+            rows = pd.concat([self.rows.astype(_labels(self.rows)), rows.astype(_labels(rows))])
+            keys = np.concatenate([self.keys, keys])
+        self._keep(rows, keys)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        keys = self._rng.random(len(chunk))
+        self._combine(chunk.set_axis(np.arange(self.n, self.n + len(chunk))), keys)
+        self.n += len(chunk)
+
+    def merge(self, other: "RowSample") -> None:
+        if other.rows is not None:
+            self._combine(other.rows.set_axis(other.rows.index + self.n), other.keys)
+        self.n += other.n
+
+    def frame(self) -> pd.DataFrame:
+        rows = self.rows if self.rows is not None else pd.DataFrame()
+        categorical = [col for col in rows.columns if rows[col].dtype == object or
+                       isinstance(rows[col].dtype, pd.CategoricalDtype)]
+        return rows.astype({col: "category" for col in categorical}).reset_index(drop=True)
+
+
+def _labels(rows: pd.DataFrame) -> Dict[str, type]:
+    return {col: object for col in rows.columns if isinstance(rows[col].dtype, pd.CategoricalDtype)}
+
+
+class SummaryAccumulator:
+    """Streaming equivalent of ``describe()`` plus per-column ``value_counts()``."""
+
+    def __init__(
+        self,
+        categorical_cols: Sequence[str],
+        continuous_cols: Sequence[str],
+        k: int = 200,
+        capacity: int | None = None,
+        seed: int | None = 0,
+    ):
+        self.categorical_cols = list(categorical_cols)
+        self.continuous_cols = list(continuous_cols)
+        self.moments = MomentAccumulator(self.continuous_cols)
+        self.sketches = {col: QuantileSketch(k, seed) for col in self.continuous_cols}
+        self.counters = {col: CategoryCounter(capacity) for col in self.categorical_cols}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.moments.update(chunk)
+        for col, sketch in self.sketches.items():
+            sketch.update(chunk[col].to_numpy(dtype=float))
+        for col, counter in self.counters.items():
+            counter.update(chunk[col])
+
+    def merge(self, other: "SummaryAccumulator") -> None:
+        self.moments.merge(other.moments)
+        for col in self.continuous_cols:
+            self.sketches[col].merge(other.sketches[col])
+        for col in self.categorical_cols:
+            self.counters[col].merge(other.counters[col])
+
+    def value_counts(self, col: str) -> pd.Series:
+        return self.counters[col].value_counts(col)
+
+    def nunique(self, col: str) -> int:
+        return len(self.counters[col].counts)
+
+    def describe(self) -> pd.DataFrame:
+        m = self.moments
+        quartiles = np.array([self.sketches[c].quantiles([0.25, 0.5, 0.75]) for c in self.continuous_cols]).T
+        rows = np.vstack([m.count, m.mean, m.std, m.min, quartiles, m.max])
+        rows[3][m.count == 0] = np.nan
+        rows[7][m.count == 0] = np.nan
+        return pd.DataFrame(rows, index=DESCRIBE_INDEX, columns=self.continuous_cols)
+
+
+def stream_summary(
+    categorical_cols: Sequence[str],
+    continuous_cols: Sequence[str],
+    path: str = DEFAULT_CSV,
+    chunksize: int = 100_000,
+    k: int = 200,
+    capacity: int | None = None,
+) -> SummaryAccumulator:
+    """Summarise ``path`` chunk by chunk in memory independent of its length."""
+    acc = SummaryAccumulator(categorical_cols, continuous_cols, k=k, capacity=capacity)
+    for chunk in iter_crop_chunks(path, list(categorical_cols) + list(continuous_cols), chunksize):
+        acc.update(chunk)
+    return acc
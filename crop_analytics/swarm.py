@@ -0,0 +1,114 @@
+"""Swarm and strip panels whose per-category cost is bounded.
+
+``sns.swarmplot`` places points one at a time against every point already
+placed in the category, so its cost grows roughly quadratically with the
+category size and it warns once points no longer fit. Categories up to
+``max_points`` rows are still drawn as an exact swarm; larger ones are either
+reduced by stratified subsampling (evenly spaced ranks, so every quantile is
+kept) or drawn as a binned dot-density column.
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from .encoding import group_codes
+
+
+DEFAULT_MAX_POINTS = 400
+
+
+def _sorted_groups(df: pd.DataFrame, x: str, y: str):
+    codes, labels = group_codes(df[x])
+    values = df[y].to_numpy(dtype=float)
+    order = np.lexsort((values, codes))
+    order = order[codes[order] >= 0]
+    counts = np.bincount(codes[order], minlength=len(labels))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return order, counts, starts, labels
+
+
+def cap_per_category(df: pd.DataFrame, x: str, y: str, max_points: int = DEFAULT_MAX_POINTS, seed: int = 0) -> pd.DataFrame:
+    """Keep at most ``max_points`` rows per ``x`` category, stratified on ``y``.
+
+    Rows are taken at evenly spaced ranks of ``y`` within each category (with
+    a random phase), so the kept sample tracks the category's quantiles.
+    """
+    order, counts, starts, _ = _sorted_groups(df, x, y)
+    if (counts <= max_points).all():
+        return df
+    rng = np.random.default_rng(seed)
+    keep: List[np.ndarray] = []
+    for start, n in zip(starts, counts):
+        if n <= max_points:
+            keep.append(order[start:start + n])
+        else:
+            ranks = ((np.arange(max_points) + rng.random()) * (n / max_points)).astype(np.intp)
+            keep.append(order[start + ranks])
+    return df.iloc[np.sort(np.concatenate(keep))]
+
+
+def _dot_density(ax, values: np.ndarray, center: float, edges: np.ndarray, max_points: int, width: float, **kwargs) -> None:
+    counts, _ = np.histogram(values, bins=edges)
+    dots = np.round(counts * (max_points / max(len(values), 1))).astype(np.intp)
+    widest = max(int(dots.max()), 1)
+    spacing = width / widest
+    rows = np.repeat(np.arange(len(dots)), dots)
+    slot = np.arange(len(rows)) - np.repeat(np.cumsum(dots) - dots, dots)
+    xs = center + (slot - (dots[rows] - 1) / 2.0) * spacing
+    ys = (edges[rows] + edges[rows + 1]) / 2.0
+    ax.scatter(xs, ys, **kwargs)
+
+
+def plot_swarm(
+    ax,
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    max_points: int = DEFAULT_MAX_POINTS,
+    fallback: str = "subsample",
+    bins: int = 40,
+    width: float = 0.8,
+    seed: int = 0,
+    **kwargs,
+) -> None:
+    """``sns.swarmplot`` with an automatic fallback for crowded categories.
+
+    ``fallback`` is ``"subsample"`` (stratified subsample, still swarmed) or
+    ``"dots"`` (binned dot-density column with about ``max_points`` dots).
+    """
+    if fallback not in ("subsample", "dots"):
+        raise ValueError(f"Unknown fallback: {fallback!r}")
+    order, counts, starts, labels = _sorted_groups(df, x, y)
+    big = counts > max_points
+    if fallback == "subsample" or not big.any():
+        sns.swarmplot(data=cap_per_category(df, x, y, max_points, seed), x=x, y=y, order=list(labels), ax=ax, **kwargs)
+        return
+    small_labels = set(labels[~big])
+    small = df[df[x].isin(small_labels)]
+    if len(small):
+        sns.swarmplot(data=small, x=x, y=y, order=list(labels), ax=ax, **kwargs)
+    values = df[y].to_numpy(dtype=float)
+    edges = np.histogram_bin_edges(values[~np.isnan(values)], bins=bins)
+    size = kwargs.get("size", 5)
+    style = {
+        "s": size ** 2,
+        "color": kwargs.get("color", "C0"),
+        "alpha": kwargs.get("alpha", 1.0),
+        "linewidths": 0,
+    }
+    for g in np.flatnonzero(big):
+        group_values = values[order[starts[g]:starts[g] + counts[g]]]
+        _dot_density(ax, group_values, g, edges, max_points, width, **style)
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+
+
+def plot_strip(ax, df: pd.DataFrame, x: str, y: str, max_points: int = DEFAULT_MAX_POINTS, seed: int = 0, **kwargs) -> None:
+    """``sns.stripplot`` on a stratified subsample of at most ``max_points`` per category."""
+    codes, labels = group_codes(df[x])
+    sns.stripplot(data=cap_per_category(df, x, y, max_points, seed), x=x, y=y, order=list(labels), ax=ax, **kwargs)
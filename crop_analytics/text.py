@@ -0,0 +1,189 @@
+"""Streaming tokenisation and word counts for the Task 7 text views.
+
+The Task 7 corpus is the text of every value of a few columns, column after
+column, plus a few loose strings. It is never assembled. Each column is
+taken through its codes (``group_codes``): every distinct value is cleaned
+and tokenised once, and rows only index those token lists. The generators
+below yield the cleaned text and the sentence tokens a chunk of rows at a
+time. The cleaned corpus has no sentence punctuation left, so it is a single
+sentence. ``iter_windows`` therefore carries the last few tokens across
+chunks to find the same word-tree windows. ``cloud_frequencies`` gives the
+counts ``WordCloud.process_text`` would compute from the cleaned corpus. It
+takes them from per-code counts (as ``value_counts``) and per-transition
+counts of adjacent codes. Memory follows the vocabulary, not the corpus.
+"""
+
+import re
+from collections import defaultdict
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .encoding import group_codes
+
+
+# Rows of a column handled per chunk
+CHUNK_ROWS = 65_536
+
+# The sentence tokens of the word tree
+_TOKEN = re.compile(r"[a-z0-9\-]+")
+
+
+def clean_text(text: str) -> str:
+    """Lowercase, punctuation (other than ``-``) to spaces, whitespace collapsed."""
+    text = text.lower()
+    text = re.sub(r"[^a-z0-9\s\-]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def corpus_parts(df: pd.DataFrame, columns: Sequence[str], extra: Iterable[str] = ()) -> List[pd.Series]:
+    """The corpus as a list of series: each of ``columns`` present in ``df``, then ``extra`` as one more."""
+    parts = [df[col] for col in columns if col in df.columns]
+    extra = [str(value) for value in extra]
+    if extra:
+        parts.append(pd.Series(extra, dtype=object))
+    return parts
+
+
+def _cells(values: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    """Codes of ``values`` and the cleaned text of each code (missing values read ``nan``, as ``astype(str)``)."""
+    codes, labels = group_codes(values)
+    texts = [clean_text(str(label)) for label in labels.tolist()] + [clean_text("nan")]
+    return np.where(codes < 0, len(texts) - 1, codes), texts
+
+
+def _chunks(n: int, chunk_rows: int) -> Iterator[slice]:
+    for start in range(0, n, chunk_rows):
+        yield slice(start, start + chunk_rows)
+
+
+def iter_clean_chunks(parts: Iterable[pd.Series], chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """Cleaned corpus text per chunk of rows; joined by spaces, the chunks are the whole cleaned corpus."""
+    for values in parts:
+        codes, texts = _cells(values)
+        lookup = np.asarray(texts, dtype=object)
+        for rows in _chunks(len(codes), chunk_rows):
+            chunk = " ".join(text for text in lookup[codes[rows]].tolist() if text)
+            if chunk:
+                yield chunk
+
+
+def iter_token_chunks(parts: Iterable[pd.Series], chunk_rows: int = CHUNK_ROWS) -> Iterator[List[str]]:
+    """The corpus sentence's tokens, per chunk of rows."""
+    for values in parts:
+        codes, texts = _cells(values)
+        tokens = [_TOKEN.findall(text) for text in texts]
+        for rows in _chunks(len(codes), chunk_rows):
+            chunk = list(chain.from_iterable(map(tokens.__getitem__, codes[rows].tolist())))
+            if chunk:
+                yield chunk
+
+
+def iter_windows(token_chunks: Iterable[List[str]], root: str, max_len: int = 6) -> Iterator[Tuple[str, ...]]:
+    """The ``max_len`` tokens from each ``root`` on, fewer at the end of the stream."""
+    tail: List[str] = []
+    for chunk in token_chunks:
+        buffer = tail + chunk
+        # Windows that start in the last max_len - 1 tokens may still grow
+        split = max(len(buffer) - (max_len - 1), 0)
+        for i in range(split):
+            if buffer[i] == root:
+                yield tuple(buffer[i:i + max_len])
+        tail = buffer[split:]
+    for i, token in enumerate(tail):
+        if token == root:
+            yield tuple(tail[i:i + max_len])
+
+
+def _fuse(counts: Dict[str, int], normalize_plurals: bool) -> Tuple[Dict[str, int], Dict[str, str]]:
+    """``wordcloud.tokenization.process_tokens`` over words given with their counts."""
+    cases: Dict[str, Dict[str, int]] = defaultdict(dict)
+    for word, count in counts.items():
+        case = cases[word.lower()]
+        case[word] = case.get(word, 0) + count
+    merged = {}
+    if normalize_plurals:
+        for key in list(cases):
+            if key.endswith("s") and not key.endswith("ss") and key[:-1] in cases:
+                singular = cases[key[:-1]]
+                for word, count in cases.pop(key).items():
+                    singular[word[:-1]] = singular.get(word[:-1], 0) + count
+                merged[key] = key[:-1]
+    fused, standard = {}, {}
+    for lower, case in cases.items():
+        first = max(case.items(), key=itemgetter(1))[0]
+        fused[first] = sum(case.values())
+        standard[lower] = first
+    for plural, singular in merged.items():
+        standard[plural] = standard[singular]
+    return fused, standard
+
+
+def _ordered(events: List[Tuple[tuple, str, int]]) -> Dict[str, int]:
+    """Counts summed per key, with keys in order of their first event."""
+    counts: Dict[str, int] = {}
+    for _, key, count in sorted(events, key=itemgetter(0)):
+        counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+def cloud_frequencies(parts: Iterable[pd.Series], wordcloud) -> Dict[str, int]:
+    """``wordcloud.process_text`` of the cleaned corpus, counted from the codes of ``parts``.
+
+    Words and collocations come out with the same counts and in the same
+    order, so ``generate_from_frequencies`` draws what ``generate`` would.
+    """
+    from wordcloud.tokenization import score
+
+    pattern = wordcloud.regexp or (r"\w[\w']*" if wordcloud.min_word_length <= 1 else r"\w[\w']+")
+    stopwords = {word.lower() for word in wordcloud.stopwords}
+    unigram_events, bigram_events = [], []
+    previous = None
+    for p, values in enumerate(parts):
+        codes, texts = _cells(values)
+        words = []
+        for text in texts:
+            found = [w[:-2] if w.lower().endswith("'s") else w for w in re.findall(pattern, text)]
+            if not wordcloud.include_numbers:
+                found = [w for w in found if not w.isdigit()]
+            words.append([w for w in found if len(w) >= wordcloud.min_word_length])
+        # Rows without words drop out, so pairs form across them as in the joined corpus
+        rows = np.flatnonzero(np.array([len(w) > 0 for w in words])[codes])
+        kept = codes[rows]
+        if not len(kept):
+            continue
+        counts = np.bincount(kept, minlength=len(words))
+        present, first = np.unique(kept, return_index=True)
+        for code, row in zip(present.tolist(), rows[first].tolist()):
+            label, n = words[code], int(counts[code])
+            unigram_events += [((p, row, j), word, n) for j, word in enumerate(label)]
+            bigram_events += [((p, row, 0, j), pair, n) for j, pair in enumerate(zip(label, label[1:]))]
+        if previous is not None:
+            bigram_events.append(((p, -1, 0, 0), (previous, words[kept[0]][0]), 1))
+        # Last word of one row with the first of the next
+        steps, at, n_steps = np.unique(kept[:-1] * len(words) + kept[1:], return_index=True, return_counts=True)
+        for step, row, n in zip(steps.tolist(), rows[at].tolist(), n_steps.tolist()):
+            a, b = divmod(step, len(words))
+            bigram_events.append(((p, row, 1, 0), (words[a][-1], words[b][0]), n))
+        previous = words[kept[-1]][-1]
+    unigrams = {w: n for w, n in _ordered(unigram_events).items() if w.lower() not in stopwords}
+    if not wordcloud.collocations:
+        return _fuse(unigrams, wordcloud.normalize_plurals)[0]
+    bigrams = {" ".join(pair): n for pair, n in _ordered([(k, pair, n) for k, pair, n in bigram_events]).items()
+               if not any(w.lower() in stopwords for w in pair)}
+    # As wordcloud.tokenization.unigrams_and_bigrams
+    n_words = sum(unigrams.values())
+    counts, standard = _fuse(unigrams, wordcloud.normalize_plurals)
+    counts_bigrams, _ = _fuse(bigrams, wordcloud.normalize_plurals)
+    original = counts.copy()
+    for bigram, count in counts_bigrams.items():
+        word1, word2 = (standard[w.lower()] for w in bigram.split(" "))
+        if score(count, original[word1], original[word2], n_words) > wordcloud.collocation_threshold:
+            counts[word1] -= count
+            counts[word2] -= count
+            counts[bigram] = count
+    return {word: count for word, count in counts.items() if count > 0}
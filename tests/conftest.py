@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from crop_analytics import load_crop_data  # noqa: E402
+
+SAMPLE_CSV = ROOT / "Task7" / "agriculture_crop_yield.csv"
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    # Keep every cache the package writes out of the working tree
+    monkeypatch.setenv("CROP_CACHE_DIR", str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def crop_csv():
+    return str(SAMPLE_CSV)
+
+
+@pytest.fixture
+def crop_df(crop_csv):
+    return load_crop_data(crop_csv, cache=False)
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from crop_analytics import cache
+from crop_analytics.loader import read_crop_csv
+
+
+@pytest.fixture
+def tiled_csv(crop_csv, tmp_path):
+    # Enough rows for many build chunks
+    path = tmp_path / "tiled.csv"
+    pd.concat([pd.read_csv(crop_csv)] * 20).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(params=["arrow", "pickle"])
+def backend(request, monkeypatch):
+    if request.param == "arrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(cache, "HAS_ARROW", False)
+        monkeypatch.setattr(cache, "FRAME_SUFFIX", ".cols")
+    return request.param
+
+
+def test_chunked_build_matches_full_parse(backend, tiled_csv):
+    expected = read_crop_csv(tiled_csv)
+    pd.testing.assert_frame_equal(cache.load_cached(tiled_csv, chunksize=97), expected)
+    # Served from the entry now, column by column
+    columns = ["Harvest_Date", "Season", "Yield_Tonnes"]
+    pd.testing.assert_frame_equal(cache.load_cached(tiled_csv, columns), expected[cache._select_columns(columns)])
+    assert cache.cache_path(cache.source_key(tiled_csv)).exists()
+
+
+def test_clear_cache_removes_entries(backend, crop_csv):
+    cache.load_cached(crop_csv)
+    assert cache.clear_cache() >= 1
+    assert not cache.cache_path(cache.source_key(crop_csv)).exists()
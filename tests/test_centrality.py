@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from crop_analytics.centrality import betweenness_centrality, eigenvector_centrality
+from crop_analytics.graph import bipartite_edges
+from crop_analytics.similarity import similarity_edge_graph
+
+nx = pytest.importorskip("networkx")
+
+
+@pytest.fixture
+def graphs(crop_df):
+    pairs = crop_df.groupby(["State", "Crop_Type"], observed=True)["Yield_Tonnes"].sum().reset_index()
+    matrix = pairs.pivot(index="State", columns="Crop_Type", values="Yield_Tonnes").fillna(0)
+    return {
+        "bipartite": bipartite_edges(pairs, "State", "Crop_Type", weight="Yield_Tonnes"),
+        "similarity": similarity_edge_graph(matrix, threshold=0.3),
+    }
+
+
+def _close(result, expected):
+    assert result.keys() == expected.keys()
+    np.testing.assert_allclose([result[n] for n in expected], list(expected.values()), atol=1e-10)
+
+
+@pytest.mark.parametrize("name", ["bipartite", "similarity"])
+@pytest.mark.parametrize("weight", ["weight", None])
+def test_exact_betweenness_matches_networkx(graphs, name, weight):
+    graph = graphs[name]
+    expected = nx.betweenness_centrality(graph.to_networkx(), weight=weight, normalized=True)
+    _close(betweenness_centrality(graph, weight=weight, max_workers=1), expected)
+
+
+def test_pivots_covering_every_node_are_exact(graphs):
+    graph = graphs["similarity"]
+    expected = nx.betweenness_centrality(graph.to_networkx(), weight="weight")
+    _close(betweenness_centrality(graph, k=len(graph), max_workers=1), expected)
+
+
+@pytest.mark.parametrize("name, weight", [("bipartite", None), ("similarity", "weight"), ("similarity", None)])
+def test_eigenvector_matches_networkx(graphs, name, weight):
+    graph = graphs[name]
+    expected = nx.eigenvector_centrality(graph.to_networkx(), weight=weight, max_iter=1000)
+    result = eigenvector_centrality(graph, weight=weight, max_iter=1000)
+    assert result.keys() == expected.keys()
+    np.testing.assert_allclose([result[n] for n in expected], list(expected.values()), atol=1e-5)
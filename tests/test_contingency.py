@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crop_analytics.contingency import ContingencyTables
+
+stats = pytest.importorskip("scipy.stats")
+
+PAIRS = [("Crop_Type", "Season"), ("State", "Soil_Type"), ("Irrigation_Type", "Climate_Zone")]
+
+
+@pytest.fixture
+def tables(crop_df):
+    return ContingencyTables(crop_df)
+
+
+def test_tables_match_crosstab(crop_df, tables):
+    for a, b in PAIRS:
+        expected = pd.crosstab(crop_df[a], crop_df[b])
+        result = tables.table(a, b).loc[expected.index, expected.columns]
+        np.testing.assert_array_equal(result, expected)
+
+
+def test_multi_column_rows_and_value_sums(crop_df, tables):
+    rows = ["Crop_Type", "Season"]
+    counts = crop_df.groupby(rows, observed=True)["Irrigation_Type"].value_counts().unstack(fill_value=0)
+    result = tables.table(rows, "Irrigation_Type").loc[counts.index, counts.columns]
+    np.testing.assert_array_equal(result, counts)
+    sums = crop_df.pivot_table("Yield_Tonnes", "Crop_Type", "Season", aggfunc="sum", fill_value=0, observed=True)
+    result = tables.table("Crop_Type", "Season", values="Yield_Tonnes").loc[sums.index, sums.columns]
+    np.testing.assert_array_equal(result, sums)
+
+
+def test_masked_table_drops_unseen_labels(crop_df, tables):
+    mask = crop_df["Year"] >= 2022
+    expected = pd.crosstab(crop_df.loc[mask, "Crop_Type"], crop_df.loc[mask, "Season"])
+    result = tables.table("Crop_Type", "Season", mask=mask)
+    assert sorted(result.index) == sorted(expected.index)
+    np.testing.assert_array_equal(result.loc[expected.index, expected.columns], expected)
+
+
+def _assert_matches_scipy(test, observed, correction=True):
+    chi2, p, dof, expected = stats.chi2_contingency(observed, correction=correction)
+    np.testing.assert_allclose([test.chi2, test.p], [chi2, p], rtol=1e-9)
+    assert test.dof == dof
+    np.testing.assert_allclose(test.expected, expected, rtol=1e-12)
+    v = stats.contingency.association(observed, method="cramer")
+    np.testing.assert_allclose(test.cramers_v, v, rtol=1e-9)
+
+
+def test_chi_square_matches_chi2_contingency(crop_df, tables):
+    for a, b in PAIRS:
+        observed = pd.crosstab(crop_df[a], crop_df[b]).to_numpy()
+        for correction in (True, False):
+            _assert_matches_scipy(tables.chi_square(a, b, correction), observed, correction)
+
+
+def test_yates_correction_on_two_by_two(crop_df):
+    df = pd.DataFrame({
+        "wet": pd.Categorical(crop_df["Precipitation_mm"] > crop_df["Precipitation_mm"].median()),
+        "hot": pd.Categorical(crop_df["Temperature_Celsius"] > crop_df["Temperature_Celsius"].median()),
+    })
+    tables = ContingencyTables(df)
+    observed = pd.crosstab(df["wet"], df["hot"]).to_numpy()
+    corrected, raw = tables.chi_square("wet", "hot"), tables.chi_square("wet", "hot", correction=False)
+    assert corrected.dof == 1 and corrected.chi2 < raw.chi2
+    _assert_matches_scipy(corrected, observed)
+
+
+def test_all_pairs_match_single_tests(tables):
+    pairs = tables.all_pairs()
+    columns = tables.columns
+    assert len(pairs) == len(columns) * (len(columns) - 1) // 2
+    assert pairs["cramers_v"].is_monotonic_decreasing
+    for a, b, n, chi2, dof, p, v in pairs.itertuples(index=False):
+        test = tables.chi_square(a, b)
+        assert (n, dof) == (test.n, test.dof)
+        np.testing.assert_allclose([chi2, p, v], [test.chi2, test.p, test.cramers_v], rtol=1e-9)
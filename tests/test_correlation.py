@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crop_analytics.correlation import correlate
+
+
+@pytest.fixture
+def gappy():
+    # Gaps in two columns, overlapping on some rows, so pairs differ in their complete rows
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(size=(200, 5)), columns=list("abcde"))
+    df["e"] = df["b"] + rng.normal(size=200)
+    df.loc[rng.random(200) < 0.25, "a"] = np.nan
+    df.loc[rng.random(200) < 0.1, "c"] = np.nan
+    return df
+
+
+def test_spearman_ranks_within_pair_rows(gappy):
+    result = correlate(gappy)
+    np.testing.assert_allclose(result.spearman, gappy.corr("spearman"), atol=1e-12)
+    present = gappy.notna().astype(float)
+    np.testing.assert_array_equal(result._matrix("spearman")[1], present.T @ present)
+
+
+def test_matrices_match_dataframe_corr(crop_df):
+    numeric = crop_df.select_dtypes(include="number")
+    result = correlate(crop_df)
+    np.testing.assert_allclose(result.pearson, numeric.corr(), atol=1e-12)
+    np.testing.assert_allclose(result.spearman, numeric.corr("spearman"), atol=1e-12)
+
+
+def test_pvalues_match_scipy(crop_df, gappy):
+    stats = pytest.importorskip("scipy.stats")
+    for df in (crop_df.select_dtypes(include="number"), gappy):
+        result = correlate(df)
+        for a, b in [(df.columns[0], df.columns[1]), (df.columns[2], df.columns[-1])]:
+            rows = df[[a, b]].dropna()
+            r, p = stats.pearsonr(rows[a], rows[b])
+            np.testing.assert_allclose(result.pair(a, b), (r, p), rtol=1e-9, atol=1e-12)
+            rho, p = stats.spearmanr(rows[a], rows[b])
+            np.testing.assert_allclose(result.pair(a, b, "spearman"), (rho, p), rtol=1e-9, atol=1e-12)
+
+
+def test_pairs_threshold(crop_df):
+    result = correlate(crop_df)
+    pairs = result.pairs(threshold=0.3)
+    matrix = result.pearson
+    assert len(pairs)
+    for a, b, r, _ in pairs.itertuples(index=False):
+        assert abs(r) > 0.3 and r == matrix.at[a, b]
+    expected = sum(abs(matrix.iat[i, j]) > 0.3 for i in range(len(matrix)) for j in range(i + 1, len(matrix)))
+    assert len(pairs) == expected
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from crop_analytics.corrnet import CorrelationNetwork
+from crop_analytics.graph import matrix_edges
+
+THRESHOLD = 0.3
+
+
+@pytest.fixture
+def numeric(crop_df):
+    return crop_df.select_dtypes(include=[np.number])
+
+
+def _batches(df, size=15):
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+def _edges(graph):
+    names = graph.nodes.to_numpy()
+    return {(names[s], names[d]): (w, sign) for s, d, w, sign
+            in zip(graph.src, graph.dst, graph.weight, graph.edge_attrs["sign"])}
+
+
+def _assert_same_graph(graph, expected):
+    assert list(graph.nodes) == list(expected.nodes)
+    result, wanted = _edges(graph), _edges(expected)
+    assert result.keys() == wanted.keys()
+    for pair, (weight, sign) in wanted.items():
+        assert result[pair][1] == sign
+        assert result[pair][0] == pytest.approx(weight, abs=1e-10)
+
+
+def test_batches_track_the_thresholded_matrix(numeric):
+    network = CorrelationNetwork(numeric.columns, THRESHOLD)
+    seen = set()
+    for i, batch in enumerate(_batches(numeric)):
+        changes = network.update(batch)
+        expected = matrix_edges(numeric.iloc[:(i + 1) * 15].corr(), THRESHOLD)
+        _assert_same_graph(network.graph, expected)
+        # The reported changes are exactly the difference from the last graph
+        current = set(_edges(expected))
+        assert set(zip(changes.added["a"], changes.added["b"])) == current - seen
+        assert set(zip(changes.removed["a"], changes.removed["b"])) == seen - current
+        seen = current
+    assert seen
+
+
+def test_exclusive_threshold(numeric):
+    network = CorrelationNetwork(numeric.columns, THRESHOLD, inclusive=False)
+    network.update(numeric)
+    _assert_same_graph(network.graph, matrix_edges(numeric.corr(), THRESHOLD, inclusive=False))
+
+
+def test_save_and_load_continue_the_stream(numeric, tmp_path):
+    batches = _batches(numeric)
+    network = CorrelationNetwork(numeric.columns, THRESHOLD)
+    network.update(batches[0])
+    network.layout(seed=3)
+    network.save(tmp_path / "network.npz")
+    loaded = CorrelationNetwork.load(tmp_path / "network.npz")
+    _assert_same_graph(loaded.graph, network.graph)
+    for node, xy in network.pos.items():
+        np.testing.assert_array_equal(loaded.pos[node], xy)
+    for batch in batches[1:]:
+        network.update(batch)
+        loaded.update(batch)
+    _assert_same_graph(loaded.graph, network.graph)
+    _assert_same_graph(loaded.graph, matrix_edges(numeric.corr(), THRESHOLD))
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crop_analytics.cube import DIMENSIONS, MEASURES, build_cube, load_cube
+
+ROLLUPS = [["Crop_Type"], ["Year"], ["State", "Season"], ["Year", "Crop_Type", "Climate_Zone"]]
+STATS = ["count", "sum", "mean", "var", "std"]
+
+
+def _assert_matches_groupby(cube, df, by):
+    spec = {m: STATS for m in MEASURES}
+    result = cube.agg(by, spec)
+    expected = df.groupby(by, observed=True).agg(spec)
+    pd.testing.assert_frame_equal(result.sort_index(), expected.sort_index(), check_dtype=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("by", ROLLUPS)
+def test_rollups_match_groupby(crop_df, by):
+    _assert_matches_groupby(build_cube(crop_df), crop_df, by)
+
+
+def test_missing_values_and_slices(crop_df):
+    df = crop_df.copy()
+    df["Yield_per_Hectare"] = df["Yield_per_Hectare"].where(np.arange(len(df)) % 4 != 0)
+    cube = build_cube(df)
+    _assert_matches_groupby(cube, df, ["Crop_Type"])
+    assert cube.rows == len(df)
+    counts = cube.count("Season")
+    pd.testing.assert_series_equal(counts.sort_index(), df.groupby("Season", observed=True).size().sort_index(),
+                                   check_names=False, check_dtype=False)
+    subset = df[df["Crop_Type"].isin(["Rice", "Wheat"])]
+    _assert_matches_groupby(cube.slice(Crop_Type=["Rice", "Wheat"]), subset, ["Year"])
+
+
+def test_persisted_cube_matches_built(crop_csv, crop_df):
+    built = build_cube(crop_df)
+    for _ in range(2):
+        loaded = load_cube(crop_csv)
+        assert loaded.dimensions == DIMENSIONS
+        for by in ROLLUPS:
+            pd.testing.assert_frame_equal(loaded.agg(by, {m: STATS for m in MEASURES}).sort_index(),
+                                          built.agg(by, {m: STATS for m in MEASURES}).sort_index(),
+                                          check_dtype=False, check_index_type=False, check_categorical=False,
+                                          rtol=1e-12)
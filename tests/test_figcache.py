@@ -0,0 +1,46 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import pytest  # noqa: E402
+
+from crop_analytics import figcache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _restore_style():
+    with matplotlib.rc_context():
+        yield
+    plt.close("all")
+
+
+def _draw(value):
+    plt.figure(figsize=(2, 2))
+    plt.plot([0, 1], [0, value])
+
+
+def test_rerun_hits_and_style_changes_miss(tmp_path):
+    _draw(1)
+    assert not figcache.cached_savefig(tmp_path / "a.png", inputs=(1,))
+    _draw(1)
+    assert figcache.cached_savefig(tmp_path / "a.png", inputs=(1,))
+    matplotlib.rcParams["lines.linewidth"] = 5
+    _draw(1)
+    assert not figcache.cached_savefig(tmp_path / "a.png", inputs=(1,))
+
+
+def test_store_is_bounded(tmp_path, monkeypatch):
+    _draw(0)
+    figcache.cached_savefig(tmp_path / "0.png", inputs=(0,))
+    size = (tmp_path / "0.png").stat().st_size
+    # Room for about two images
+    monkeypatch.setenv("FIGURE_CACHE_MB", str(2.5 * size / (1 << 20)))
+    for value in range(1, 5):
+        _draw(value)
+        figcache.cached_savefig(tmp_path / f"{value}.png", inputs=(value,))
+    stored = list((figcache.cache_dir() / "figures").glob("*.png"))
+    assert sum(f.stat().st_size for f in stored) <= figcache.max_bytes()
+    # The newest image survives eviction
+    _draw(4)
+    assert figcache.cached_savefig(tmp_path / "4.png", inputs=(4,))
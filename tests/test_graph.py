@@ -0,0 +1,27 @@
+import pytest
+
+from crop_analytics.graph import bipartite_edges
+
+
+def test_bipartite_edges_match_networkx_build(crop_df):
+    nx = pytest.importorskip("networkx")
+    # The hand-built graph the network script used to draw
+    expected = nx.Graph()
+    expected.add_nodes_from(sorted(crop_df["State"].unique()), bipartite=0, kind="state")
+    expected.add_nodes_from(sorted(crop_df["Crop_Type"].unique()), bipartite=1, kind="crop")
+    sums = crop_df.groupby(["State", "Crop_Type"], observed=True)["Yield_Tonnes"].sum()
+    for (state, crop), total in sums.items():
+        expected.add_edge(state, crop, weight=float(total))
+
+    graph = bipartite_edges(crop_df, "State", "Crop_Type", weight="Yield_Tonnes", kinds=("state", "crop"))
+    result = graph.to_networkx()
+    assert dict(result.nodes(data=True)) == dict(expected.nodes(data=True))
+    assert {frozenset(e[:2]): e[2] for e in result.edges(data=True)} == \
+        {frozenset(e[:2]): e[2] for e in expected.edges(data=True)}
+    assert graph.nodes_where("kind", "crop") == sorted(crop_df["Crop_Type"].unique())
+
+
+def test_bipartite_edges_without_kinds(crop_df):
+    graph = bipartite_edges(crop_df, "State", "Crop_Type")
+    assert set(graph.node_attrs) == {"bipartite"}
+    assert graph.weight.sum() == len(crop_df)
@@ -0,0 +1,81 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from crop_analytics import graphio
+from crop_analytics.graph import bipartite_edges, matrix_edges
+from crop_analytics.graphio import load_edges, save_edges, write_gexf, write_graphml
+
+nx = pytest.importorskip("networkx")
+
+
+@pytest.fixture
+def bipartite(crop_df):
+    return bipartite_edges(crop_df, "State", "Crop_Type", weight="Yield_Tonnes", kinds=("state", "crop"))
+
+
+@pytest.fixture
+def corr(crop_df):
+    return matrix_edges(crop_df.select_dtypes(include="number").corr(), 0.3)
+
+
+def _assert_same_graph(result, expected):
+    assert result.number_of_nodes() == expected.number_of_nodes()
+    assert result.number_of_edges() == expected.number_of_edges()
+    # read_gexf also reports each node label as an attribute
+    nodes = {str(n): {k: v for k, v in d.items() if k != "label"} for n, d in result.nodes(data=True)}
+    assert nodes == {str(n): d for n, d in expected.nodes(data=True)}
+    wanted = {frozenset(map(str, (u, v))): d for u, v, d in expected.edges(data=True)}
+    for u, v, data in result.edges(data=True):
+        attrs = wanted[frozenset(map(str, (u, v)))]
+        assert data.keys() >= attrs.keys()
+        for key, value in attrs.items():
+            if isinstance(value, float):
+                assert data[key] == pytest.approx(value, rel=1e-12)
+            else:
+                assert data[key] == value
+
+
+@pytest.mark.parametrize("name", ["bipartite", "corr"])
+@pytest.mark.parametrize("suffix", [".gexf", ".gexf.gz"])
+def test_gexf_round_trip(request, tmp_path, name, suffix):
+    graph = request.getfixturevalue(name)
+    path = tmp_path / f"graph{suffix}"
+    write_gexf(graph, path)
+    _assert_same_graph(nx.read_gexf(path), graph.to_networkx())
+
+
+@pytest.mark.parametrize("name", ["bipartite", "corr"])
+def test_graphml_round_trip(request, tmp_path, name):
+    graph = request.getfixturevalue(name)
+    path = tmp_path / "graph.graphml"
+    write_graphml(graph, path)
+    _assert_same_graph(nx.read_graphml(path), graph.to_networkx())
+
+
+def test_streamed_chunks_match_one_chunk(bipartite, tmp_path, monkeypatch):
+    write_gexf(bipartite, tmp_path / "whole.gexf.gz")
+    monkeypatch.setattr(graphio, "EXPORT_CHUNK", 7)
+    write_gexf(bipartite, tmp_path / "chunked.gexf.gz")
+    assert (tmp_path / "whole.gexf.gz").read_bytes() == (tmp_path / "chunked.gexf.gz").read_bytes()
+    assert gzip.decompress((tmp_path / "whole.gexf.gz").read_bytes()).startswith(b"<?xml")
+
+
+@pytest.mark.parametrize("name", ["bipartite", "corr"])
+@pytest.mark.parametrize("compress", [False, True])
+def test_npz_round_trip(request, tmp_path, name, compress):
+    graph = request.getfixturevalue(name)
+    path = tmp_path / "graph.npz"
+    save_edges(graph, path, compress=compress)
+    loaded = load_edges(path)
+    assert list(loaded.nodes) == [str(n) for n in graph.nodes]
+    np.testing.assert_array_equal(loaded.src, graph.src)
+    np.testing.assert_array_equal(loaded.dst, graph.dst)
+    np.testing.assert_array_equal(loaded.weight, graph.weight)
+    assert loaded.node_attrs.keys() == graph.node_attrs.keys()
+    assert loaded.edge_attrs.keys() == graph.edge_attrs.keys()
+    for attrs, wanted in ((loaded.node_attrs, graph.node_attrs), (loaded.edge_attrs, graph.edge_attrs)):
+        for key, values in wanted.items():
+            np.testing.assert_array_equal(attrs[key], np.asarray(values).astype(attrs[key].dtype))
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crop_analytics.groupstats import TEST_COLUMNS, group_moments, group_tests
+
+stats = pytest.importorskip("scipy.stats")
+
+CONTINUOUS = ["Yield_per_Hectare", "Temperature_Celsius", "Precipitation_mm", "Market_Price_per_Tonne"]
+
+
+def _samples(df, by, col):
+    rows = df[[by, col]].dropna()
+    return [group[col].to_numpy(dtype=float) for _, group in rows.groupby(by, observed=True)]
+
+
+def _assert_matches_scipy(df, by, result):
+    for col in CONTINUOUS:
+        samples = _samples(df, by, col)
+        f, f_p = stats.f_oneway(*samples)
+        h, h_p = stats.kruskal(*samples)
+        row = result.loc[(by, col)]
+        assert row["groups"] == len(samples) and row["n"] == sum(map(len, samples))
+        np.testing.assert_allclose([row["f"], row["f_p"], row["h"], row["h_p"]], [f, f_p, h, h_p], rtol=1e-9)
+
+
+def test_group_tests_match_f_oneway_and_kruskal(crop_df):
+    result = group_tests(crop_df, ["Crop_Type", "Season", "State"], CONTINUOUS)
+    assert list(result.columns) == TEST_COLUMNS
+    for by in ["Crop_Type", "Season", "State"]:
+        _assert_matches_scipy(crop_df, by, result)
+
+
+def test_missing_values_are_dropped_per_column(crop_df):
+    df = crop_df.copy()
+    df[CONTINUOUS] = df[CONTINUOUS].astype(float)
+    df.iloc[::6, df.columns.get_loc("Temperature_Celsius")] = np.nan
+    df.iloc[1::9, df.columns.get_loc("Crop_Type")] = np.nan
+    _assert_matches_scipy(df, "Crop_Type", group_tests(df, ["Crop_Type"], CONTINUOUS))
+
+
+def test_eta_squared_and_summary(crop_df):
+    moments = group_moments(crop_df, "Crop_Type", CONTINUOUS)
+    col = "Yield_per_Hectare"
+    values = crop_df[col]
+    means = crop_df.groupby("Crop_Type", observed=True)[col].agg(["count", "mean"])
+    between = (means["count"] * (means["mean"] - values.mean()) ** 2).sum()
+    total = ((values - values.mean()) ** 2).sum()
+    np.testing.assert_allclose(moments.anova().at[col, "eta_squared"], between / total, rtol=1e-9)
+    summary = moments.summary()[col].loc[means.index]
+    np.testing.assert_array_equal(summary["count"], means["count"])
+    np.testing.assert_allclose(summary["mean"], means["mean"], rtol=1e-12)
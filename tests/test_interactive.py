@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("plotly")
+
+from crop_analytics.interactive import lttb, line_traces  # noqa: E402
+
+N = 20_000
+
+
+@pytest.mark.parametrize("index", [
+    pd.RangeIndex(N),
+    pd.date_range("2000-01-01", periods=N, freq="h"),
+    pd.date_range("2000-01-01", periods=N, freq="h", tz="UTC"),
+    pd.period_range("2000-01", periods=N, freq="D"),
+    pd.Index([f"k{i:06d}" for i in range(N)]),
+])
+def test_line_traces_decimate_any_index(index):
+    frame = pd.DataFrame({"a": np.sin(np.arange(N) / 50.0)}, index=index)
+    trace = line_traces(frame, max_points=400)[0]
+    assert len(trace.x) == len(trace.y) == 400
+    assert trace.y[0] == frame["a"].iloc[0] and trace.y[-1] == frame["a"].iloc[-1]
+
+
+def test_datetime_gaps_weight_lttb_like_numbers():
+    # Uneven timestamps must be decimated on their real spacing, not their positions
+    hours = np.cumsum(np.random.default_rng(0).integers(1, 100, N))
+    y = np.sin(hours / 500.0)
+    frame = pd.DataFrame({"a": y}, index=pd.Timestamp("2000-01-01") + pd.to_timedelta(hours, "h"))
+    trace = line_traces(frame, max_points=300)[0]
+    expected = lttb(frame.index.asi8.astype(float), y, 300)
+    np.testing.assert_array_equal(trace.y, y[expected])
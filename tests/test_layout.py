@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+import pytest
+
+from crop_analytics import layout
+from crop_analytics.graph import EdgeGraph
+
+
+def _stretched(n, seed=0):
+    # A tight cluster with 2% of the nodes flung far out, which stretches the
+    # bounding box so a uniform grid would put nearly every node in one cell
+    rng = np.random.default_rng(seed)
+    pos = rng.normal(0.5, 0.05, (n, 2))
+    pos[:n // 50] = rng.random((n // 50, 2)) * 20
+    return pos
+
+
+def _work(pos):
+    layout.STATS.clear()
+    layout._repulsion_tree(pos, math.sqrt(1.0 / len(pos)), layout.LEAF_SIZE)
+    return (layout.STATS["pairs"] + layout.STATS["cells"]) / len(pos)
+
+
+@pytest.mark.parametrize("kind", ["uniform", "stretched", "coincident"])
+def test_tree_repulsion_matches_exact(kind):
+    n = 3000
+    rng = np.random.default_rng(1)
+    pos = {"uniform": rng.random((n, 2)), "stretched": _stretched(n),
+           "coincident": np.r_[np.full((n // 2, 2), 0.3), rng.random((n - n // 2, 2))]}[kind]
+    k = math.sqrt(1.0 / n)
+    exact = layout._repulsion_exact(pos, k)
+    approx = layout._repulsion_tree(pos, k, layout.LEAF_SIZE)
+    error = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+    assert np.median(error) < 0.03
+    assert np.percentile(error, 95) < 0.1
+
+
+def test_leaves_are_capped_however_positions_spread():
+    pos = np.r_[_stretched(5000), np.full((3000, 2), 0.5)]
+    _, levels = layout._build_tree(pos, layout.LEAF_SIZE)
+    bounds = levels[-1][0]
+    assert np.diff(bounds).max() <= layout.LEAF_SIZE
+
+
+def test_work_per_node_grows_logarithmically():
+    small, large = _work(_stretched(2000)), _work(_stretched(16000))
+    # Quadratic work would grow eightfold here
+    assert large < 2 * small
+    layout.STATS.clear()
+    layout._repulsion_tree(_stretched(16000), math.sqrt(1.0 / 16000), layout.LEAF_SIZE)
+    assert layout.STATS["pairs"] / 16000 < 20 * layout.LEAF_SIZE
+
+
+def test_large_layout_is_deterministic_and_scaled():
+    rng = np.random.default_rng(0)
+    n = 2 * layout.EXACT_NODES
+    src, dst = rng.integers(0, n - 40, 3 * n), rng.integers(0, n - 40, 3 * n)
+    graph = EdgeGraph([f"n{i}" for i in range(n)], src, dst, np.ones(len(src)))
+    first = layout.force_layout(graph, seed=3, iterations=10, cache=False)
+    second = layout.force_layout(graph, seed=3, iterations=10, cache=False)
+    assert first.keys() == set(graph.nodes)
+    xy = np.array([first[node] for node in graph.nodes])
+    assert np.isfinite(xy).all()
+    assert np.abs(xy).max() == pytest.approx(1.0)
+    np.testing.assert_array_equal(xy, np.array([second[node] for node in graph.nodes]))
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crop_analytics import load_crop_data
+from crop_analytics.regression import fit_pairs, stream_fits
+
+PAIRS = [("Area_Hectares", "Yield_Tonnes"), ("Temperature_Celsius", "Yield_per_Hectare"),
+         ("Fertilizer_Usage_kg", "Yield_per_Hectare")]
+
+
+@pytest.fixture
+def noisy_csv(crop_csv, tmp_path):
+    # Several sample groups lie exactly on a line, where the standard errors are only rounding noise
+    df = pd.read_csv(crop_csv)
+    rng = np.random.default_rng(0)
+    for col in {c for pair in PAIRS for c in pair}:
+        noise = rng.normal(0, df[col].std() / 10, len(df))
+        df[col] = df[col] + (noise.round().astype(int) if df[col].dtype.kind == "i" else noise)
+    path = tmp_path / "noisy.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def noisy_df(noisy_csv):
+    return load_crop_data(noisy_csv, cache=False)
+
+
+def _assert_matches_linregress(fit, x, y):
+    stats = pytest.importorskip("scipy.stats")
+    expected = stats.linregress(x, y)
+    assert fit["n"] == len(x)
+    np.testing.assert_allclose(
+        [fit["slope"], fit["intercept"], fit["r"], fit["slope_se"], fit["intercept_se"]],
+        [expected.slope, expected.intercept, expected.rvalue, expected.stderr, expected.intercept_stderr],
+        rtol=1e-9)
+    np.testing.assert_allclose([fit["slope"], fit["intercept"]], np.polyfit(x, y, 1), rtol=1e-9)
+    assert (fit["x_min"], fit["x_max"]) == (x.min(), x.max())
+
+
+def test_fits_match_linregress(crop_df):
+    acc = fit_pairs(crop_df, PAIRS)
+    for x_col, y_col in PAIRS:
+        x, y = crop_df[x_col].to_numpy(float), crop_df[y_col].to_numpy(float)
+        _assert_matches_linregress(acc.fit(x_col, y_col), x, y)
+
+
+def test_grouped_fits_match_per_group_linregress(noisy_df):
+    acc = fit_pairs(noisy_df, PAIRS, by="Crop_Type")
+    table = acc.fits()
+    for crop, rows in noisy_df.groupby("Crop_Type", observed=True):
+        if len(rows) < 3:
+            continue
+        x, y = rows["Area_Hectares"].to_numpy(float), rows["Yield_Tonnes"].to_numpy(float)
+        fit = acc.fit("Area_Hectares", "Yield_Tonnes", crop)
+        _assert_matches_linregress(fit, x, y)
+        pd.testing.assert_series_equal(fit, table.loc[fit.name].astype(object))
+
+
+def test_missing_values_drop_per_pair(crop_df):
+    df = crop_df.copy()
+    df["Area_Hectares"] = df["Area_Hectares"].astype(float)
+    df.iloc[::5, df.columns.get_loc("Area_Hectares")] = np.nan
+    acc = fit_pairs(df, PAIRS)
+    rows = df[["Area_Hectares", "Yield_Tonnes"]].dropna()
+    _assert_matches_linregress(acc.fit("Area_Hectares", "Yield_Tonnes"),
+                               rows["Area_Hectares"].to_numpy(float), rows["Yield_Tonnes"].to_numpy(float))
+    assert acc.fit("Temperature_Celsius", "Yield_per_Hectare")["n"] == len(df)
+
+
+def test_streamed_and_merged_fits_match_in_memory(noisy_csv, noisy_df):
+    expected = fit_pairs(noisy_df, PAIRS, by="Crop_Type").fits()
+    streamed = stream_fits(PAIRS, by="Crop_Type", path=noisy_csv, chunksize=13).fits()
+    left = fit_pairs(noisy_df.iloc[:40], PAIRS, by="Crop_Type")
+    left.merge(fit_pairs(noisy_df.iloc[40:], PAIRS, by="Crop_Type"))
+    for result in (streamed, left.fits()):
+        result = result.sort_values(["x", "y", "Crop_Type"], ignore_index=True)
+        pd.testing.assert_frame_equal(result, expected.sort_values(["x", "y", "Crop_Type"], ignore_index=True),
+                                      rtol=1e-9)
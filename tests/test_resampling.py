@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crop_analytics.resampling import anova_test, chi_square_test, kruskal_test, pearson_test
+
+stats = pytest.importorskip("scipy.stats")
+
+RESAMPLES = 4000
+# Monte Carlo slack: about four standard errors of a p-value near 0.5
+P_TOL = 0.035
+
+
+def _samples(df, by, col):
+    return [group.to_numpy(dtype=float) for _, group in df.groupby(by, observed=True)[col]]
+
+
+def test_pearson_matches_pearsonr_and_bootstrap(crop_df):
+    x, y = crop_df["Temperature_Celsius"], crop_df["Yield_per_Hectare"]
+    result = pearson_test(x, y, RESAMPLES, max_workers=1)
+    r, p = stats.pearsonr(x, y)
+    np.testing.assert_allclose(result.statistic, r, rtol=1e-12)
+    assert abs(result.p_value - p) < P_TOL
+
+    x, y = crop_df["Precipitation_mm"].astype(float), crop_df["Temperature_Celsius"]
+    result = pearson_test(x, y, RESAMPLES, max_workers=1)
+    # Strongly correlated: no permutation reaches the observed r
+    assert result.p_value == 1 / (RESAMPLES + 1)
+    expected = stats.bootstrap((x.to_numpy(), y.to_numpy()), lambda a, b: stats.pearsonr(a, b)[0], paired=True,
+                               vectorized=False, method="percentile", n_resamples=RESAMPLES, random_state=0)
+    np.testing.assert_allclose(result.ci, expected.confidence_interval, atol=0.03)
+    assert result.ci[0] < result.estimate < result.ci[1]
+
+
+def test_anova_and_kruskal_match_scipy(crop_df):
+    samples = _samples(crop_df, "Season", "Yield_per_Hectare")
+    anova = anova_test(crop_df["Season"], crop_df["Yield_per_Hectare"], RESAMPLES, max_workers=1)
+    f, p = stats.f_oneway(*samples)
+    np.testing.assert_allclose(anova.statistic, f, rtol=1e-9)
+    assert abs(anova.p_value - p) < P_TOL
+    assert anova.ci_statistic == "eta_squared" and anova.ci[0] <= anova.estimate <= anova.ci[1]
+
+    kruskal = kruskal_test(crop_df["Season"], crop_df["Yield_per_Hectare"], RESAMPLES, max_workers=1)
+    h, p = stats.kruskal(*samples)
+    np.testing.assert_allclose(kruskal.statistic, h, rtol=1e-9)
+    assert abs(kruskal.p_value - p) < P_TOL
+    assert kruskal.ci is None
+
+
+def test_chi_square_matches_chi2_contingency(crop_df):
+    # A weaker association than the sample's categorical pairs, so the p-value is not at its floor
+    a = pd.Series(pd.cut(crop_df["Temperature_Celsius"], 3, labels=False))
+    b = pd.Series(pd.cut(crop_df["Market_Price_per_Tonne"], 3, labels=False))
+    result = chi_square_test(a, b, RESAMPLES, max_workers=1)
+    chi2, p, _, _ = stats.chi2_contingency(pd.crosstab(a, b), correction=False)
+    np.testing.assert_allclose(result.statistic, chi2, rtol=1e-9)
+    assert abs(result.p_value - p) < P_TOL
+    v = stats.contingency.association(pd.crosstab(a, b).to_numpy(), method="cramer")
+    np.testing.assert_allclose(result.estimate, v, rtol=1e-9)
+
+
+def test_results_do_not_depend_on_worker_count(crop_df):
+    x, y = crop_df["Temperature_Celsius"], crop_df["Yield_per_Hectare"]
+    serial = pearson_test(x, y, 600, seed=3, max_workers=1, batch_size=100)
+    pooled = pearson_test(x, y, 600, seed=3, max_workers=2, batch_size=100)
+    assert (serial.p_value, serial.ci) == (pooled.p_value, pooled.ci)
+    other = pearson_test(x, y, 600, seed=4, max_workers=1, batch_size=100)
+    assert other.ci != serial.ci
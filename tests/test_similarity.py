@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from crop_analytics import CONTINUOUS_COLUMNS
+from crop_analytics.similarity import normalize_rows, similarity_edges
+
+
+@pytest.fixture
+def rows(crop_df):
+    # Standardised sample rows, tiled with jitter into noisy near-duplicates;
+    # about eight rows pass 0.9 with each, well inside the LSH window
+    values = crop_df[list(CONTINUOUS_COLUMNS)].to_numpy(dtype=float)
+    values = (values - values.mean(axis=0)) / values.std(axis=0)
+    rng = np.random.default_rng(0)
+    return np.concatenate([values + rng.normal(0, 0.5, values.shape) for _ in range(10)])
+
+
+def _pairs(src, dst):
+    return set(zip(src.tolist(), dst.tolist()))
+
+
+def test_exact_threshold_matches_brute_force(rows):
+    x = normalize_rows(rows[:500])
+    sims = x @ x.T
+    i, j = np.nonzero(np.triu(sims >= 0.9, k=1))
+    src, dst, weight = similarity_edges(rows[:500], threshold=0.9, block_cells=10_000)
+    assert _pairs(src, dst) == _pairs(i, j)
+    np.testing.assert_allclose(weight, sims[src, dst])
+
+
+def test_lsh_threshold_recall(rows):
+    exact = _pairs(*similarity_edges(rows, threshold=0.9)[:2])
+    src, dst, weight = similarity_edges(rows, threshold=0.9, backend="lsh", recall=0.95)
+    found = _pairs(src, dst)
+    # Approximate, but never invents a pair or a similarity
+    assert found <= exact
+    np.testing.assert_allclose(weight, np.einsum("ij,ij->i", *(normalize_rows(rows)[v] for v in (src, dst))))
+    assert len(found) / len(exact) >= 0.95
+
+
+def test_lsh_knn_recall(rows):
+    k = 5
+    exact = _pairs(*similarity_edges(rows, k=k)[:2])
+    found = _pairs(*similarity_edges(rows, k=k, backend="lsh")[:2])
+    assert len(found & exact) / len(exact) >= 0.95
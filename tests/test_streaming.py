@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from crop_analytics import CATEGORICAL_COLUMNS, CONTINUOUS_COLUMNS
+from crop_analytics.streaming import (CategoryCounter, CoMomentAccumulator, MomentAccumulator, QuantileSketch,
+                                      RowSample, stream_summary)
+
+
+def _chunks(df, size):
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+def test_moments_match_describe(crop_df):
+    cols = list(CONTINUOUS_COLUMNS)
+    acc = MomentAccumulator(cols)
+    for chunk in _chunks(crop_df, 13):
+        acc.update(chunk)
+    expected = crop_df[cols].describe()
+    np.testing.assert_allclose(acc.count, expected.loc["count"])
+    np.testing.assert_allclose(acc.mean, expected.loc["mean"], rtol=1e-10)
+    np.testing.assert_allclose(acc.std, expected.loc["std"], rtol=1e-10)
+    np.testing.assert_allclose(acc.min, expected.loc["min"])
+    np.testing.assert_allclose(acc.max, expected.loc["max"])
+
+
+def test_merged_moments_match_sequential(crop_df):
+    cols = list(CONTINUOUS_COLUMNS)
+    left, right, whole = MomentAccumulator(cols), MomentAccumulator(cols), MomentAccumulator(cols)
+    left.update(crop_df.iloc[:40])
+    right.update(crop_df.iloc[40:])
+    whole.update(crop_df)
+    left.merge(right)
+    np.testing.assert_allclose(left.mean, whole.mean, rtol=1e-10)
+    np.testing.assert_allclose(left.m2, whole.m2, rtol=1e-10)
+
+
+def test_comoments_match_corr(crop_df):
+    cols = list(CONTINUOUS_COLUMNS)
+    frame = crop_df[cols].copy()
+    # Missing values make the counts pairwise, as in DataFrame.corr
+    frame.iloc[::7, 0] = np.nan
+    frame.iloc[3::11, 2] = np.nan
+    acc = CoMomentAccumulator(cols)
+    for chunk in _chunks(frame, 17):
+        acc.update(chunk)
+    np.testing.assert_allclose(acc.pearson(), frame.corr().to_numpy(), atol=1e-10)
+    present = frame.notna().astype(float)
+    np.testing.assert_array_equal(acc.count, present.T @ present)
+
+
+def test_quantile_sketch_rank_error(crop_df):
+    # Tile the sample with jitter so the sketch compacts many times over
+    rng = np.random.default_rng(0)
+    base = crop_df["Yield_per_Hectare"].to_numpy(dtype=float)
+    values = np.concatenate([base + rng.normal(0, 0.05, len(base)) for _ in range(600)])
+    sketch = QuantileSketch(k=200, seed=0)
+    for start in range(0, len(values), 1000):
+        sketch.update(values[start:start + 1000])
+    assert not sketch.is_exact
+    qs = np.linspace(0.01, 0.99, 99)
+    ranks = np.searchsorted(np.sort(values), sketch.quantiles(qs), side="right") / len(values)
+    assert np.max(np.abs(ranks - qs)) <= 0.01
+
+
+def test_quantile_sketch_exact_before_compaction(crop_df):
+    values = crop_df["Temperature_Celsius"].to_numpy(dtype=float)
+    sketch = QuantileSketch(k=200)
+    sketch.update(values)
+    assert sketch.is_exact
+    np.testing.assert_allclose(sketch.quantiles([0.25, 0.5, 0.75]), np.quantile(values, [0.25, 0.5, 0.75]))
+
+
+def test_category_counter_matches_value_counts(crop_df):
+    for col in CATEGORICAL_COLUMNS:
+        counter = CategoryCounter()
+        for chunk in _chunks(crop_df, 10):
+            counter.update(chunk[col])
+        expected = crop_df[col].value_counts()
+        expected = expected[expected > 0]
+        pd.testing.assert_series_equal(counter.value_counts(col), expected, check_index_type=False,
+                                       check_categorical=False)
+
+
+def test_stream_summary_matches_describe(crop_csv, crop_df):
+    cols = list(CONTINUOUS_COLUMNS)
+    summary = stream_summary(["Crop_Type"], cols, crop_csv, chunksize=20)
+    # Few enough rows that the quartiles are still exact
+    pd.testing.assert_frame_equal(summary.describe(), crop_df[cols].describe(), rtol=1e-10)
+    assert summary.value_counts("Crop_Type").to_dict() == crop_df["Crop_Type"].value_counts().to_dict()
+
+
+def test_row_sample_keeps_small_streams_whole(crop_df):
+    sample = RowSample(len(crop_df))
+    for chunk in _chunks(crop_df, 13):
+        sample.update(chunk)
+    pd.testing.assert_frame_equal(sample.frame(), crop_df.reset_index(drop=True), check_categorical=False)
+
+
+def test_row_sample_is_uniform(crop_df):
+    # Every row should be drawn at rate size / n, whichever chunk it arrived in
+    frame = pd.DataFrame({"row": np.arange(len(crop_df))})
+    hits = np.zeros(len(frame))
+    for seed in range(400):
+        left, right = RowSample(20, seed=seed), RowSample(20, seed=seed + 1000)
+        for chunk in _chunks(frame.iloc[:50], 9):
+            left.update(chunk)
+        right.update(frame.iloc[50:])
+        left.merge(right)
+        rows = left.frame()["row"].to_numpy()
+        assert left.n == len(frame) and len(rows) == 20 and np.all(np.diff(rows) > 0)
+        hits[rows] += 1
+    np.testing.assert_allclose(hits / 400, 20 / len(frame), atol=0.1)
@@ -0,0 +1,40 @@
+import pytest
+
+from crop_analytics.text import (clean_text, cloud_frequencies, corpus_parts, iter_clean_chunks, iter_token_chunks,
+                                 iter_windows)
+
+wordcloud = pytest.importorskip("wordcloud")
+
+COLUMNS = ["State", "Crop_Type", "Year", "Season", "Climate_Zone", "Soil_Type", "Irrigation_Type",
+           "Pest_Infestation_Level", "Disease_Incidence"]
+
+
+@pytest.fixture
+def parts(crop_df):
+    return corpus_parts(crop_df, COLUMNS, ["Jane Doe", "name", "Some College", "college"])
+
+
+def _corpus(parts):
+    return " ".join(iter_clean_chunks(parts, chunk_rows=7))
+
+
+def test_clean_chunks_join_to_corpus(parts):
+    corpus = " ".join(" ".join(part.astype(str)) for part in parts)
+    assert _corpus(parts) == clean_text(corpus)
+
+
+@pytest.mark.parametrize("collocations", [True, False])
+@pytest.mark.parametrize("normalize_plurals", [True, False])
+def test_cloud_frequencies_match_process_text(parts, collocations, normalize_plurals):
+    wc = wordcloud.WordCloud(collocations=collocations, normalize_plurals=normalize_plurals)
+    expected = wc.process_text(_corpus(parts))
+    result = cloud_frequencies(parts, wc)
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_windows_span_chunks(parts):
+    tokens = [t for chunk in iter_token_chunks(parts) for t in chunk]
+    root = tokens[0]
+    expected = [tuple(tokens[i:i + 6]) for i, t in enumerate(tokens) if t == root]
+    assert list(iter_windows(iter_token_chunks(parts, chunk_rows=3), root, max_len=6)) == expected